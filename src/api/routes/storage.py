@@ -2,7 +2,8 @@ import json
 import os
 import re
 import tempfile
-from typing import Any, Dict, List
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List
 
 from flask import Blueprint, current_app, jsonify, request
 
@@ -12,7 +13,10 @@ from src.ingestion.parsers.archive_processor import (
     ArchiveValidationError,
     extract_zip_archive,
 )
-from src.ingestion.parsers.document_processor import process_uploaded_documents
+from src.ingestion.parsers.document_processor import (
+    iter_uploaded_documents,
+    process_uploaded_documents,
+)
 from src.ingestion.splitters.audit_issue_chunker import AuditIssueChunker
 from src.ingestion.splitters.audit_report_chunker import AuditReportChunker
 from src.ingestion.splitters.case_material_chunker import CaseMaterialChunker
@@ -106,6 +110,17 @@ def _resolve_upload_doc_type(scope: str, knowledge_labels: Dict[str, List[str]],
     return library_doc_type_map.get(library, "internal_regulation")
 
 
+def _attach_storage_file_ids(
+    documents: Iterable[Dict[str, Any]],
+    file_id_by_path: Dict[str, str],
+) -> Iterator[Dict[str, Any]]:
+    for doc in documents:
+        mapped_file_id = file_id_by_path.get(str(doc.get("file_path", "") or ""))
+        if mapped_file_id:
+            doc["storage_file_id"] = mapped_file_id
+        yield doc
+
+
 def _infer_catalog_level(semantic_boundary: str, header: str, section_path: List[str]) -> int:
     boundary = str(semantic_boundary or '').lower()
     normalized_header = str(header or '').strip()
@@ -312,7 +327,10 @@ def clear_vector_store():
         except ValueError as ve:
             if "没有可保存的向量库" in str(ve):
                 from src.indexing.vector.vector_store import VectorStore
-                rag_processor.vector_store = VectorStore(dimension=rag_processor.dimension or 1024)
+                rag_processor.vector_store = VectorStore(
+                    dimension=rag_processor.dimension or 1024,
+                    index_type=rag_processor.vector_index_type,
+                )
                 rag_processor.save_vector_store()
             else:
                 raise
@@ -588,7 +606,7 @@ def upload_and_store_documents():
                 "knowledge_labels": knowledge_labels,
             }
 
-            documents = process_uploaded_documents(
+            documents = iter_uploaded_documents(
                 temp_file_paths,
                 doc_type=doc_type,
                 title=title,
@@ -596,11 +614,9 @@ def upload_and_store_documents():
                 error_collector=parse_errors,
                 extra_metadata=extra_metadata,
             )
-            for doc in documents:
-                mapped_file_id = file_id_by_temp_path.get(str(doc.get("file_path", "") or ""))
-                if mapped_file_id:
-                    doc["storage_file_id"] = mapped_file_id
-            if not documents:
+            documents = _attach_storage_file_ids(documents, file_id_by_temp_path)
+            first_document = next(documents, None)
+            if first_document is None:
                 return jsonify({
                     "error": "上传文件解析后没有可入库文档",
                     "file_count": len(uploaded_files),
@@ -608,7 +624,7 @@ def upload_and_store_documents():
                 }), 400
 
             num_processed = rag_processor.process_documents(
-                documents,
+                chain((first_document,), documents),
                 save_after_processing=save_after_processing,
             )
         finally:
@@ -732,7 +748,7 @@ def upload_archive_and_store_documents():
                 )
                 file_id_by_path[extracted_path] = stored.file_id
 
-            documents = process_uploaded_documents(
+            documents = iter_uploaded_documents(
                 extraction.extracted_paths,
                 doc_type=doc_type,
                 title=title,
@@ -740,11 +756,9 @@ def upload_archive_and_store_documents():
                 error_collector=parse_errors,
                 extra_metadata=extra_metadata,
             )
-            for doc in documents:
-                mapped_file_id = file_id_by_path.get(str(doc.get("file_path", "") or ""))
-                if mapped_file_id:
-                    doc["storage_file_id"] = mapped_file_id
-            if not documents:
+            documents = _attach_storage_file_ids(documents, file_id_by_path)
+            first_document = next(documents, None)
+            if first_document is None:
                 return jsonify({
                     "error": "压缩包解析后没有可入库文档",
                     "archive_name": archive_name,
@@ -754,7 +768,7 @@ def upload_archive_and_store_documents():
                 }), 400
 
             num_processed = rag_processor.process_documents(
-                documents,
+                chain((first_document,), documents),
                 save_after_processing=save_after_processing,
             )
 
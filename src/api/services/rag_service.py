@@ -297,6 +297,7 @@ class RAGService:
                     intent_router_fixed_top_k=intent_router_fixed_top_k,
                     intent_router_fixed_doc_types=intent_router_fixed_doc_types,
                     intent_router_default_retrieval_plan=default_retrieval_plan,
+                    vector_index_type=RAGFactory.get_vector_index_type(effective_config),
                 )
                 self._processors[processor_key] = processor
                 self._logger.info(
@@ -28,6 +28,9 @@ class RAGFactory:
             ssl_verify=embed_config.get('ssl_verify', True),
             env=env,
             request_timeout=embed_config.get('request_timeout', 30.0),
+            max_concurrency=embed_config.get('max_concurrency', 4),
+            cache_dir=embed_config.get('cache_dir', './data/embedding_cache'),
+            batch_size=embed_config.get('batch_size', 10),
         )
 
     @staticmethod
@@ -90,9 +93,14 @@ class RAGFactory:
             return MeloTTSProvider(merged_cfg, logger=logger)
         raise ValueError(f"不支持的TTS provider: {provider_name}")
 
+    @staticmethod
+    def get_vector_index_type(config: Dict[str, Any]) -> str:
+        """读取向量索引类型（auto/flat/hnsw/sq8），默认auto"""
+        return config.get('embedding_model', {}).get('index_type', 'auto') or 'auto'
+
     @staticmethod
     def create_vector_store(config: Dict[str, Any]) -> VectorStore:
         """创建向量存储"""
         # 维度通常由Embedding模型决定，这里默认1024
         dimension = config.get('embedding_model', {}).get('dimension', 1024)
-        return VectorStore(dimension=dimension)
+        return VectorStore(dimension=dimension, index_type=RAGFactory.get_vector_index_type(config))
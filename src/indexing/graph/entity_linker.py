@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import src.indexing.graph.ontology as ontology
 
@@ -16,10 +16,34 @@ class EntityLinker:
         "央行": "中国人民银行",
     }
 
+    # 长别名优先，保证“国家发改委”先于“发改委”命中
+    _ALIAS_PATTERN = re.compile(
+        "|".join(re.escape(alias) for alias in sorted(DEPARTMENT_ALIAS, key=len, reverse=True))
+    )
+    _DEPT_PREFIX_PATTERN = re.compile(r"^(部门单位|部门)\s*[:：]")
+    _PAREN_PATTERN = re.compile(r"[（(].*?[）)]")
+    # \s 已覆盖全角空格 \u3000
+    _WHITESPACE_PATTERN = re.compile(r"\s+")
+    _CLAUSE_PATTERN = re.compile(r"第[一二三四五六七八九十百千万零0-9]+条")
+    _AMOUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(亿元|万元|元)")
+
+    def __init__(self):
+        # 同一(类型, 原始值)在语料中反复出现，每个不同取值只规范化一次
+        self._normalize_cache: Dict[Tuple[str, str], Optional[str]] = {}
+
     def normalize(self, entity_type: str, value: str) -> Optional[str]:
         if value is None:
             return None
 
+        key = (entity_type, value)
+        try:
+            return self._normalize_cache[key]
+        except KeyError:
+            pass
+        normalized = self._normalize_cache[key] = self._normalize_value(entity_type, value)
+        return normalized
+
+    def _normalize_value(self, entity_type: str, value: str) -> Optional[str]:
         text = self._normalize_whitespace(str(value))
         if not text:
             return None
@@ -42,37 +66,36 @@ class EntityLinker:
 
         return text or None
 
-    @staticmethod
-    def _normalize_whitespace(text: str) -> str:
-        text = text.replace("\u3000", " ")
-        text = re.sub(r"\s+", " ", text).strip()
+    @classmethod
+    def _normalize_whitespace(cls, text: str) -> str:
+        text = cls._WHITESPACE_PATTERN.sub(" ", text).strip()
         text = text.strip("，。；;:：,./\\|[]()（）")
         return text
 
     def _normalize_department(self, text: str) -> str:
-        text = re.sub(r"^(部门单位|部门)\s*[:：]", "", text).strip()
-        text = re.sub(r"[（(].*?[）)]", "", text).strip()
+        text = self._DEPT_PREFIX_PATTERN.sub("", text).strip()
+        text = self._PAREN_PATTERN.sub("", text).strip()
 
         if text in self.DEPARTMENT_ALIAS:
             return self.DEPARTMENT_ALIAS[text]
 
-        for alias, canonical in self.DEPARTMENT_ALIAS.items():
-            if alias in text:
-                return canonical
+        match = self._ALIAS_PATTERN.search(text)
+        if match:
+            return self.DEPARTMENT_ALIAS[match.group(0)]
 
         return text[:60]
 
-    @staticmethod
-    def _normalize_clause(text: str) -> str:
-        match = re.search(r"第[一二三四五六七八九十百千万零0-9]+条", text)
+    @classmethod
+    def _normalize_clause(cls, text: str) -> str:
+        match = cls._CLAUSE_PATTERN.search(text)
         if match:
             return match.group(0)
         return text[:40]
 
-    @staticmethod
-    def _normalize_amount(text: str) -> str:
+    @classmethod
+    def _normalize_amount(cls, text: str) -> str:
         text = text.replace(",", "")
-        match = re.search(r"(\d+(?:\.\d+)?)(亿元|万元|元)", text)
+        match = cls._AMOUNT_PATTERN.search(text)
         if match:
             return f"{match.group(1)}{match.group(2)}"
         return text[:40]
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import src.indexing.graph.ontology as ontology
 from src.indexing.graph.extractors.base_extractor import BaseExtractor, RelationRecord
@@ -9,6 +9,8 @@ class AuditIssueExtractor(BaseExtractor):
     DEPT_PATTERN = re.compile(r"(?:部门单位|部门)\s*[:：]\s*([^\n]{2,80})")
     ISSUE_PATTERN = re.compile(r"(?:问题摘要|问题描述)\s*[:：]\s*([^\n]{4,220})")
     ACTION_PATTERN = re.compile(r"(?:整改情况|整改措施|整改结果)\s*[:：]\s*([^\n]{4,240})")
+    # 仅在行首尝试匹配，整行包含关键词时返回整行
+    ISSUE_FALLBACK_PATTERN = re.compile(r"^[^\n]*?(?:问题|违规|整改)[^\n]*", re.MULTILINE)
 
     STATUS_RULES = {
         "已整改": "completed",
@@ -33,49 +35,49 @@ class AuditIssueExtractor(BaseExtractor):
         ("项目", "项目管理"),
     ]
 
-    def extract_entities(self, doc: Dict[str, Any]) -> Set[Tuple[str, str]]:
-        entities = self._basic_entities(doc)
-        text = str(doc.get("text", ""))
-        merged = self._merged_text(doc)
+    def extract(
+        self,
+        doc: Dict[str, Any],
+        text: Optional[str] = None,
+        merged: Optional[str] = None,
+    ) -> Tuple[Set[Tuple[str, str]], List[RelationRecord]]:
+        text, merged = self._doc_texts(doc, text, merged)
 
-        for dept in self.DEPT_PATTERN.findall(text[:5000]):
-            value = dept.strip()
-            if value:
-                entities.add((ontology.ENTITY_DEPARTMENT, value[:80]))
+        depts = [value for value in (dept.strip() for dept in self.DEPT_PATTERN.findall(text, 0, 5000)) if value]
+        issue = self._extract_issue(text)
+        action = self._extract_action(text)
+        status = self._extract_status(text)
+        clauses = self._extract_clauses(text)
+        years = self._extract_years(merged)
+        amounts = self._extract_amounts(merged)
+        keyword_hits = self._find_keywords(merged)
+        risks = self._extract_risk_types(merged, keyword_hits)
 
-        issue_text = self._extract_issue(text)
-        if issue_text:
-            entities.add((ontology.ENTITY_ISSUE, issue_text))
+        entities = self._basic_entities(doc, years=years, clauses=clauses, risks=risks)
 
-        action_text = self._extract_action(text)
-        if action_text:
-            entities.add((ontology.ENTITY_RECT_ACTION, action_text))
+        for value in depts:
+            entities.add((ontology.ENTITY_DEPARTMENT, value[:80]))
+
+        if issue:
+            entities.add((ontology.ENTITY_ISSUE, issue))
+
+        if action:
+            entities.add((ontology.ENTITY_RECT_ACTION, action))
 
-        status = self._extract_status(text)
         if status:
             entities.add((ontology.ENTITY_RECT_STATUS, status))
 
-        for amount in self._extract_amounts(merged):
+        for amount in amounts:
             entities.add((ontology.ENTITY_AMOUNT, amount))
 
-        for topic in self._extract_topics(merged):
+        for topic in self._extract_topics(merged, keyword_hits):
             entities.add((ontology.ENTITY_ISSUE_TOPIC, topic))
 
-        return entities
-
-    def extract_relations(self, doc: Dict[str, Any]) -> List[RelationRecord]:
-        text = str(doc.get("text", ""))
-        merged = self._merged_text(doc)
         relations: List[RelationRecord] = []
-
-        issue = self._extract_issue(text)
         if not issue:
-            return relations
+            return entities, relations
 
-        for dept in self.DEPT_PATTERN.findall(text[:5000]):
-            value = dept.strip()
-            if not value:
-                continue
+        for value in depts:
             relations.append(
                 RelationRecord(
                     source_type=ontology.ENTITY_ISSUE,
@@ -90,7 +92,6 @@ class AuditIssueExtractor(BaseExtractor):
                 )
             )
 
-        action = self._extract_action(text)
         if action:
             relations.append(
                 RelationRecord(
@@ -106,7 +107,6 @@ class AuditIssueExtractor(BaseExtractor):
                 )
             )
 
-            status = self._extract_status(text)
             if status:
                 relations.append(
                     RelationRecord(
@@ -122,7 +122,7 @@ class AuditIssueExtractor(BaseExtractor):
                     )
                 )
 
-        for clause in self._extract_clauses(text):
+        for clause in clauses:
             relations.append(
                 RelationRecord(
                     source_type=ontology.ENTITY_ISSUE,
@@ -137,7 +137,7 @@ class AuditIssueExtractor(BaseExtractor):
                 )
             )
 
-        for year in self._extract_years(merged):
+        for year in years:
             relations.append(
                 RelationRecord(
                     source_type=ontology.ENTITY_ISSUE,
@@ -152,7 +152,7 @@ class AuditIssueExtractor(BaseExtractor):
                 )
             )
 
-        for amount in self._extract_amounts(merged):
+        for amount in amounts:
             relations.append(
                 RelationRecord(
                     source_type=ontology.ENTITY_ISSUE,
@@ -167,7 +167,7 @@ class AuditIssueExtractor(BaseExtractor):
                 )
             )
 
-        for risk in self._extract_risk_types(merged):
+        for risk in risks:
             relations.append(
                 RelationRecord(
                     source_type=ontology.ENTITY_ISSUE,
@@ -182,16 +182,16 @@ class AuditIssueExtractor(BaseExtractor):
                 )
             )
 
-        return relations
+        return entities, relations
 
     def _extract_issue(self, text: str) -> str:
         match = self.ISSUE_PATTERN.search(text)
         if match:
             return match.group(1).strip()[:160]
         # fallback:取第一段代表问题描述
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        for line in lines:
-            if len(line) >= 12 and ("问题" in line or "违规" in line or "整改" in line):
+        for match in self.ISSUE_FALLBACK_PATTERN.finditer(text):
+            line = match.group(0).strip()
+            if len(line) >= 12:
                 return line[:160]
         return ""
 
@@ -202,16 +202,8 @@ class AuditIssueExtractor(BaseExtractor):
         return ""
 
     def _extract_status(self, text: str) -> str:
-        sample = text[:1500]
+        # 仅检查前1500字符，用find的end参数代替切片
         for key, val in self.STATUS_RULES.items():
-            if key in sample:
+            if text.find(key, 0, 1500) >= 0:
                 return val
         return ""
-
-    def _extract_topics(self, text: str) -> Set[str]:
-        topics = set()
-        lowered = text.lower()
-        for kw, topic in self.TOPIC_RULES:
-            if kw.lower() in lowered:
-                topics.add(topic)
-        return topics
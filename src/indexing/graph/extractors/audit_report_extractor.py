@@ -1,5 +1,4 @@
-import re
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import src.indexing.graph.ontology as ontology
 from src.indexing.graph.extractors.base_extractor import BaseExtractor, RelationRecord
@@ -18,34 +17,39 @@ class AuditReportExtractor(BaseExtractor):
         ("整改", "整改管理"),
     ]
 
-    SENTENCE_SPLIT = re.compile(r"[。；;!?\n]")
+    REQUIREMENT_SENTENCE_PATTERN = BaseExtractor._compile_marker_sentence_pattern(REQUIREMENT_MARKERS)
 
-    def extract_entities(self, doc: Dict[str, Any]) -> Set[Tuple[str, str]]:
-        entities = self._basic_entities(doc)
-        text = str(doc.get("text", ""))
-        merged = self._merged_text(doc)
+    def extract(
+        self,
+        doc: Dict[str, Any],
+        text: Optional[str] = None,
+        merged: Optional[str] = None,
+    ) -> Tuple[Set[Tuple[str, str]], List[RelationRecord]]:
+        text, merged = self._doc_texts(doc, text, merged)
 
-        for requirement in self._extract_requirements(text):
+        requirements = self._extract_requirements(text)
+        clauses = self._extract_clauses(text)
+        keyword_hits = self._find_keywords(merged)
+        topics = self._extract_topics(merged, keyword_hits)
+        years = self._extract_years(merged)
+
+        entities = self._basic_entities(
+            doc,
+            years=years,
+            clauses=clauses,
+            risks=self._extract_risk_types(merged, keyword_hits),
+        )
+        for requirement in requirements:
             entities.add((ontology.ENTITY_CONTROL_REQUIREMENT, requirement))
 
-        for topic in self._extract_topics(merged):
+        for topic in topics:
             entities.add((ontology.ENTITY_ISSUE_TOPIC, topic))
 
         for amount in self._extract_amounts(merged):
             entities.add((ontology.ENTITY_AMOUNT, amount))
 
-        return entities
-
-    def extract_relations(self, doc: Dict[str, Any]) -> List[RelationRecord]:
-        text = str(doc.get("text", ""))
-        merged = self._merged_text(doc)
         relations: List[RelationRecord] = []
 
-        requirements = self._extract_requirements(text)
-        clauses = self._extract_clauses(text)
-        topics = self._extract_topics(merged)
-        years = self._extract_years(merged)
-
         for requirement in requirements:
             for clause in clauses:
                 relations.append(
@@ -104,25 +108,12 @@ class AuditReportExtractor(BaseExtractor):
                     )
                 )
 
-        return relations
+        return entities, relations
 
     def _extract_requirements(self, text: str, max_items: int = 4) -> List[str]:
-        candidates: List[str] = []
-        for sentence in self.SENTENCE_SPLIT.split(text or ""):
-            sentence = sentence.strip()
-            if len(sentence) < 10:
-                continue
-            if not any(marker in sentence for marker in self.REQUIREMENT_MARKERS):
-                continue
-            candidates.append(sentence[:160])
-            if len(candidates) >= max_items:
-                break
-        return candidates
-
-    def _extract_topics(self, text: str) -> Set[str]:
-        topics = set()
-        lowered = (text or "").lower()
-        for kw, topic in self.TOPIC_RULES:
-            if kw.lower() in lowered:
-                topics.add(topic)
-        return topics
+        return self._find_marker_sentences(
+            self.REQUIREMENT_SENTENCE_PATTERN,
+            text,
+            min_length=10,
+            max_items=max_items,
+        )
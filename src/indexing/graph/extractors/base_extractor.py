@@ -1,11 +1,27 @@
 import re
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import src.indexing.graph.ontology as ontology
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
 
-@dataclass
+# slots=True is only available on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=None)
+def _keyword_pattern(keyword: str) -> "re.Pattern[str]":
+    # Shared by all extractor classes/instances; keywords come from fixed rule tables
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+
+@dataclass(**_SLOTS)
 class RelationRecord:
     source_type: str
     source_value: str
@@ -18,11 +34,20 @@ class RelationRecord:
     reverse_relation: str = ""
     attrs: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        # Type/relation tags come from a small fixed vocabulary; interning keeps them
+        # pointer-identical across records even when built from non-literal strings.
+        self.source_type = sys.intern(self.source_type)
+        self.relation = sys.intern(self.relation)
+        self.target_type = sys.intern(self.target_type)
+        self.reverse_relation = sys.intern(self.reverse_relation)
+
 
 class BaseExtractor:
     YEAR_PATTERN = re.compile(r"(?:19|20)\d{2}")
     CLAUSE_PATTERN = re.compile(r"第[一二三四五六七八九十百千万零0-9]+条")
     AMOUNT_PATTERN = re.compile(r"\d+(?:\.\d+)?(?:亿元|万元|元)")
+    SENTENCE_DELIMITERS = "。；;!?\n"
 
     RISK_KEYWORDS = [
         "违规",
@@ -37,54 +62,177 @@ class BaseExtractor:
         "资金",
     ]
 
+    TOPIC_RULES: List[Tuple[str, str]] = []
+
+    # Built per class from RISK_KEYWORDS + TOPIC_RULES: every keyword to scan (deduplicated, in
+    # rule order), the cased ones that need case-insensitive regex matching, and an automaton
+    # over the rest when pyahocorasick is installed
+    _SCAN_KEYWORDS: Tuple[str, ...] = ()
+    _CASED_KEYWORDS: Tuple[str, ...] = ()
+    _KEYWORD_AUTOMATON = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._init_keyword_tables()
+
+    @classmethod
+    def _init_keyword_tables(cls) -> None:
+        cls._SCAN_KEYWORDS = tuple(dict.fromkeys([*cls.RISK_KEYWORDS, *(kw for kw, _ in cls.TOPIC_RULES)]))
+        cls._CASED_KEYWORDS = tuple(kw for kw in cls._SCAN_KEYWORDS if kw.lower() != kw.upper())
+        cls._KEYWORD_AUTOMATON = cls._build_keyword_automaton()
+
+    @classmethod
+    def _build_keyword_automaton(cls):
+        if ahocorasick is None:
+            return None
+        # Cased keywords need case-insensitive matching and stay on the regex path
+        keywords = [kw for kw in cls._SCAN_KEYWORDS if kw.lower() == kw.upper()]
+        if not keywords:
+            return None
+        automaton = ahocorasick.Automaton()
+        for kw in keywords:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return automaton
+
+    def extract(
+        self,
+        doc: Dict[str, Any],
+        text: Optional[str] = None,
+        merged: Optional[str] = None,
+    ) -> Tuple[Set[Tuple[str, str]], List[RelationRecord]]:
+        """Extract entities and relations in a single pass over the document.
+
+        ``text`` and ``merged`` may be supplied by the caller to avoid rebuilding them.
+        """
+        return set(), []
+
     def extract_entities(self, doc: Dict[str, Any]) -> Set[Tuple[str, str]]:
-        return set()
+        return self.extract(doc)[0]
 
     def extract_relations(self, doc: Dict[str, Any]) -> List[RelationRecord]:
-        return []
+        return self.extract(doc)[1]
 
     def _extract_years(self, text: str) -> Set[str]:
         return set(self.YEAR_PATTERN.findall(text or ""))
 
     def _extract_clauses(self, text: str, max_chars: int = 6000) -> Set[str]:
-        return set(self.CLAUSE_PATTERN.findall((text or "")[:max_chars]))
+        return set(self.CLAUSE_PATTERN.findall(text or "", 0, max_chars))
 
     def _extract_amounts(self, text: str, max_chars: int = 4000) -> Set[str]:
-        return set(self.AMOUNT_PATTERN.findall((text or "")[:max_chars]))
-
-    def _extract_risk_types(self, text: str) -> Set[str]:
-        lowered = (text or "").lower()
-        result = set()
-        for kw in self.RISK_KEYWORDS:
-            if kw.lower() in lowered:
-                result.add(kw)
-        return result
-
-    def _merged_text(self, doc: Dict[str, Any]) -> str:
-        return "\n".join(
-            [
-                str(doc.get("title", "")),
-                str(doc.get("filename", "")),
-                str(doc.get("text", "")),
-            ]
-        )
-
-    def _basic_entities(self, doc: Dict[str, Any]) -> Set[Tuple[str, str]]:
-        text = str(doc.get("text", ""))
-        merged = self._merged_text(doc)
+        return set(self.AMOUNT_PATTERN.findall(text or "", 0, max_chars))
+
+    @classmethod
+    def _compile_marker_sentence_pattern(cls, markers: Tuple[str, ...]) -> "re.Pattern[str]":
+        """Match whole delimiter-bounded sentences that contain any of ``markers``.
+
+        The lookbehind only lets a match start at a sentence boundary, so one
+        ``finditer`` pass is equivalent to splitting on delimiters and testing each piece.
+        """
+        delims = cls.SENTENCE_DELIMITERS
+        alternation = "|".join(re.escape(marker) for marker in markers)
+        return re.compile(rf"(?<![^{delims}])[^{delims}]*?(?:{alternation})[^{delims}]*")
+
+    @staticmethod
+    def _find_marker_sentences(
+        pattern: "re.Pattern[str]",
+        text: str,
+        min_length: int,
+        max_items: int,
+        max_length: int = 160,
+    ) -> List[str]:
+        items: List[str] = []
+        for match in pattern.finditer(text or ""):
+            sentence = match.group().strip()
+            if len(sentence) < min_length:
+                continue
+            items.append(sentence[:max_length])
+            if len(items) >= max_items:
+                break
+        return items
+
+    def _find_keywords(self, text: str) -> Set[str]:
+        """Return every risk/topic keyword that occurs in ``text``, in one scan when possible."""
+        text = text or ""
+        automaton = self._KEYWORD_AUTOMATON
+        if automaton is None:
+            return {kw for kw in self._SCAN_KEYWORDS if self._contains_keyword(text, kw)}
+        hits = {kw for _, kw in automaton.iter(text)}
+        hits.update(kw for kw in self._CASED_KEYWORDS if self._contains_keyword(text, kw))
+        return hits
+
+    def _find_merged_keywords(self, merged: str, text: str, text_hits: Set[str]) -> Set[str]:
+        """Keyword hits for ``merged``, reusing ``text_hits`` when ``merged`` ends with the body ``text``."""
+        prefix_len = len(merged) - len(text)
+        if prefix_len >= 0 and merged.endswith(text):
+            # Keywords never contain a newline, so no hit can straddle the header/body separator
+            return text_hits | self._find_keywords(merged[:prefix_len])
+        return self._find_keywords(merged)
+
+    def _extract_risk_types(self, text: str, hits: Optional[Set[str]] = None) -> Set[str]:
+        if hits is None:
+            hits = self._find_keywords(text)
+        return {kw for kw in self.RISK_KEYWORDS if kw in hits}
+
+    def _extract_topics(self, text: str, hits: Optional[Set[str]] = None) -> Set[str]:
+        if hits is None:
+            hits = self._find_keywords(text)
+        return {topic for kw, topic in self.TOPIC_RULES if kw in hits}
+
+    @staticmethod
+    def _contains_keyword(text: str, keyword: str) -> bool:
+        # 中文等无大小写的关键词直接子串匹配，避免对整段文本做lower()拷贝
+        if keyword.lower() == keyword.upper():
+            return keyword in text
+        return _keyword_pattern(keyword).search(text) is not None
+
+    def _doc_texts(
+        self,
+        doc: Dict[str, Any],
+        text: Optional[str] = None,
+        merged: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        if text is None:
+            text = str(doc.get("text", ""))
+        if merged is None:
+            merged = self._merged_text(doc, text)
+        return text, merged
+
+    def _merged_text(self, doc: Dict[str, Any], text: Optional[str] = None) -> str:
+        if text is None:
+            text = str(doc.get("text", ""))
+        return f"{doc.get('title', '')}\n{doc.get('filename', '')}\n{text}"
+
+    def _basic_entities(
+        self,
+        doc: Dict[str, Any],
+        years: Optional[Set[str]] = None,
+        clauses: Optional[Set[str]] = None,
+        risks: Optional[Set[str]] = None,
+    ) -> Set[Tuple[str, str]]:
+        """Build the shared entity set; callers may pass findings they already computed."""
+        if years is None or risks is None:
+            merged = self._merged_text(doc)
+            if years is None:
+                years = self._extract_years(merged)
+            if risks is None:
+                risks = self._extract_risk_types(merged)
+        if clauses is None:
+            clauses = self._extract_clauses(str(doc.get("text", "")))
+
         entities: Set[Tuple[str, str]] = set()
 
         doc_type = str(doc.get("doc_type", "")).strip()
         if doc_type:
             entities.add((ontology.ENTITY_DOC_TYPE, doc_type))
 
-        for y in self._extract_years(merged):
+        for y in years:
             entities.add((ontology.ENTITY_YEAR, y))
 
-        for c in self._extract_clauses(text):
+        for c in clauses:
             entities.add((ontology.ENTITY_CLAUSE, c))
 
-        for r in self._extract_risk_types(merged):
+        for r in risks:
             entities.add((ontology.ENTITY_RISK_TYPE, r))
 
         header = str(doc.get("header", "")).strip()
@@ -100,3 +248,6 @@ class BaseExtractor:
             entities.add((ontology.ENTITY_SECTION, level2[:80]))
 
         return entities
+
+
+BaseExtractor._init_keyword_tables()
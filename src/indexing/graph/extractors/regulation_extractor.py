@@ -1,5 +1,4 @@
-import re
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import src.indexing.graph.ontology as ontology
 from src.indexing.graph.extractors.base_extractor import BaseExtractor, RelationRecord
@@ -7,22 +6,29 @@ from src.indexing.graph.extractors.base_extractor import BaseExtractor, Relation
 
 class RegulationExtractor(BaseExtractor):
     REQUIREMENT_MARKERS = ("应当", "应", "需", "必须", "不得", "禁止")
-    SENTENCE_SPLIT = re.compile(r"[。；;!?\n]")
+    REQUIREMENT_SENTENCE_PATTERN = BaseExtractor._compile_marker_sentence_pattern(REQUIREMENT_MARKERS)
 
-    def extract_entities(self, doc: Dict[str, Any]) -> Set[Tuple[str, str]]:
-        entities = self._basic_entities(doc)
-        text = str(doc.get("text", ""))
-
-        for requirement in self._extract_requirements(text):
-            entities.add((ontology.ENTITY_CONTROL_REQUIREMENT, requirement))
-
-        return entities
-
-    def extract_relations(self, doc: Dict[str, Any]) -> List[RelationRecord]:
-        text = str(doc.get("text", ""))
+    def extract(
+        self,
+        doc: Dict[str, Any],
+        text: Optional[str] = None,
+        merged: Optional[str] = None,
+    ) -> Tuple[Set[Tuple[str, str]], List[RelationRecord]]:
+        text, merged = self._doc_texts(doc, text, merged)
         clauses = self._extract_clauses(text)
         requirements = self._extract_requirements(text)
-        risks = self._extract_risk_types(text)
+        # 关系只基于正文中的风险词，实体则包含标题/文件名中的命中
+        text_hits = self._find_keywords(text)
+        risks = self._extract_risk_types(text, text_hits)
+
+        entities = self._basic_entities(
+            doc,
+            years=self._extract_years(merged),
+            clauses=clauses,
+            risks=self._extract_risk_types(merged, self._find_merged_keywords(merged, text, text_hits)),
+        )
+        for requirement in requirements:
+            entities.add((ontology.ENTITY_CONTROL_REQUIREMENT, requirement))
 
         relations: List[RelationRecord] = []
 
@@ -73,17 +79,12 @@ class RegulationExtractor(BaseExtractor):
                     )
                 )
 
-        return relations
+        return entities, relations
 
     def _extract_requirements(self, text: str, max_items: int = 4) -> List[str]:
-        items: List[str] = []
-        for sentence in self.SENTENCE_SPLIT.split(text or ""):
-            sentence = sentence.strip()
-            if len(sentence) < 8:
-                continue
-            if not any(marker in sentence for marker in self.REQUIREMENT_MARKERS):
-                continue
-            items.append(sentence[:160])
-            if len(items) >= max_items:
-                break
-        return items
+        return self._find_marker_sentences(
+            self.REQUIREMENT_SENTENCE_PATTERN,
+            text,
+            min_length=8,
+            max_items=max_items,
+        )
@@ -1,5 +1,8 @@
 import hashlib
-from typing import Any, Dict, Iterable, List, Set, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import src.indexing.graph.ontology as ontology
 from src.indexing.graph.entity_linker import EntityLinker
@@ -12,11 +15,19 @@ from src.indexing.graph.extractors import (
 )
 from src.indexing.graph.graph_store import GraphStore
 
+# (source, target, relation, weight, bidirectional, reverse_relation, attrs), as taken by GraphStore.add_edges
+EdgeRecord = Tuple[str, str, str, float, bool, Optional[str], Dict[str, Any]]
+
 
 class GraphBuilder:
     """Build domain graph from chunked documents using doc-type specific extractors."""
 
-    def __init__(self):
+    # Below this many chunks, starting worker processes costs more than extraction itself
+    PARALLEL_MIN_DOCS = 512
+    PARALLEL_CHUNKSIZE = 64
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
         self.linker = EntityLinker()
         self._default_extractor = BaseExtractor()
         self._audit_issue_extractor = AuditIssueExtractor()
@@ -26,41 +37,55 @@ class GraphBuilder:
     def build(self, documents: Iterable[Dict[str, Any]]) -> GraphStore:
         graph = GraphStore()
 
+        pending: List[Tuple[Dict[str, Any], str]] = []
         for doc in documents:
             if doc.get("status") == "deleted":
                 continue
             if doc.get("searchable") is False:
                 continue
 
-            text = str(doc.get("text", "")).strip()
-            if not text:
+            raw_text = str(doc.get("text", ""))
+            # Same test as "not raw_text.strip()" without copying the chunk text
+            if not raw_text or raw_text.isspace():
                 continue
 
+            if not str(doc.get("doc_id", "")) or not str(doc.get("chunk_id", "")):
+                continue
+
+            pending.append((doc, raw_text))
+
+        # Extraction is CPU-bound and per-chunk independent, so it may run in worker processes;
+        # results come back in input order and are merged into the graph here, as before.
+        for (doc, raw_text), (entities, relations) in zip(pending, self._extract_all(pending)):
+            text = raw_text.strip()
             doc_id = str(doc.get("doc_id", ""))
             chunk_id = str(doc.get("chunk_id", ""))
-            if not doc_id or not chunk_id:
-                continue
 
             doc_node_id = f"{ontology.ENTITY_DOCUMENT}:{doc_id}"
             chunk_node_id = f"{ontology.ENTITY_CHUNK}:{chunk_id}"
 
-            graph.add_node(
+            # Nodes and edges of one chunk are buffered and flushed in order through the bulk APIs;
+            # every node is flushed before the chunk's edges, which only need both endpoints to exist
+            node_records: List[Tuple[str, str, str, Optional[Dict[str, Any]]]] = []
+            edge_records: List[EdgeRecord] = []
+
+            node_records.append((
                 doc_node_id,
                 ontology.ENTITY_DOCUMENT,
                 doc.get("title") or doc.get("filename") or doc_id,
-                attrs={
+                {
                     "doc_id": doc_id,
                     "doc_type": doc.get("doc_type", ""),
                     "filename": doc.get("filename", ""),
                     "knowledge_labels": doc.get("knowledge_labels", {}) or {},
                 },
-            )
+            ))
 
-            graph.add_node(
+            node_records.append((
                 chunk_node_id,
                 ontology.ENTITY_CHUNK,
                 chunk_id,
-                attrs={
+                {
                     "chunk_id": chunk_id,
                     "doc_id": doc_id,
                     "doc_type": doc.get("doc_type", ""),
@@ -73,25 +98,30 @@ class GraphBuilder:
                     "text_preview": text[:120] + ("..." if len(text) > 120 else ""),
                     "knowledge_labels": doc.get("knowledge_labels", {}) or {},
                 },
-            )
+            ))
 
-            graph.add_edge(
+            edge_records.append((
                 doc_node_id,
                 chunk_node_id,
                 ontology.REL_CONTAINS,
-                bidirectional=True,
-                reverse_relation=ontology.REL_PART_OF,
-                attrs={
+                1.0,
+                True,
+                ontology.REL_PART_OF,
+                {
                     "confidence": 1.0,
                     "source_chunk_id": chunk_id,
                     "doc_id": doc_id,
                     "extractor": "graph_builder",
                 },
-            )
-
-            entities = self._extract_entities(doc)
-            relations = self._extract_relations(doc)
-
+            ))
+
+            # Every mention edge of this chunk carries the same attrs, so they share one dict
+            mention_attrs = {
+                "confidence": 0.7,
+                "source_chunk_id": chunk_id,
+                "doc_id": doc_id,
+                "extractor": "entity_mention",
+            }
             entity_key_to_node: Dict[Tuple[str, str], str] = {}
             for entity_type, raw_value in entities:
                 normalized_value = self.linker.normalize(entity_type, raw_value)
@@ -102,23 +132,22 @@ class GraphBuilder:
                 entity_node_id = self._entity_node_id(entity_type, normalized_value)
                 entity_key_to_node[entity_key] = entity_node_id
 
-                graph.add_node(entity_node_id, entity_type, normalized_value)
-                graph.add_edge(
+                node_records.append((entity_node_id, entity_type, normalized_value, None))
+                edge_records.append((
                     chunk_node_id,
                     entity_node_id,
                     ontology.REL_MENTIONS,
-                    bidirectional=True,
-                    reverse_relation=ontology.REL_MENTIONED_BY,
-                    attrs={
-                        "confidence": 0.7,
-                        "source_chunk_id": chunk_id,
-                        "doc_id": doc_id,
-                        "extractor": "entity_mention",
-                    },
-                )
+                    1.0,
+                    True,
+                    ontology.REL_MENTIONED_BY,
+                    mention_attrs,
+                ))
 
             for record in relations:
-                self._add_relation_edge(graph, record, entity_key_to_node, doc_id, chunk_id)
+                self._add_relation_edge(node_records, edge_records, record, entity_key_to_node, doc_id, chunk_id)
+
+            graph.add_nodes(node_records)
+            graph.add_edges(edge_records)
 
         return graph
 
@@ -133,17 +162,27 @@ class GraphBuilder:
             return self._regulation_extractor
         return self._default_extractor
 
-    def _extract_entities(self, doc: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    def _extract(self, doc: Dict[str, Any], text: str) -> Tuple[Set[Tuple[str, str]], List[RelationRecord]]:
         extractor = self._select_extractor(doc)
-        return extractor.extract_entities(doc)
+        return extractor.extract(doc, text=text)
 
-    def _extract_relations(self, doc: Dict[str, Any]) -> List[RelationRecord]:
-        extractor = self._select_extractor(doc)
-        return extractor.extract_relations(doc)
+    def _extract_all(
+        self,
+        pending: List[Tuple[Dict[str, Any], str]],
+    ) -> Iterator[Tuple[Iterable[Tuple[str, str]], List[RelationRecord]]]:
+        max_workers = min(self.max_workers, len(pending) // self.PARALLEL_CHUNKSIZE + 1)
+        if len(pending) < self.PARALLEL_MIN_DOCS or max_workers <= 1:
+            for doc, text in pending:
+                yield self._extract(doc, text)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            yield from executor.map(_extract_in_worker, pending, chunksize=self.PARALLEL_CHUNKSIZE)
 
     def _add_relation_edge(
         self,
-        graph: GraphStore,
+        node_records: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+        edge_records: List[EdgeRecord],
         record: RelationRecord,
         entity_key_to_node: Dict[Tuple[str, str], str],
         doc_id: str,
@@ -160,10 +199,9 @@ class GraphBuilder:
         source_node_id = entity_key_to_node.get(source_key) or self._entity_node_id(record.source_type, source_value)
         target_node_id = entity_key_to_node.get(target_key) or self._entity_node_id(record.target_type, target_value)
 
-        if source_node_id not in graph.nodes:
-            graph.add_node(source_node_id, record.source_type, source_value)
-        if target_node_id not in graph.nodes:
-            graph.add_node(target_node_id, record.target_type, target_value)
+        # add_nodes skips ids that already exist, as the old "not in graph.nodes" guard did
+        node_records.append((source_node_id, record.source_type, source_value, None))
+        node_records.append((target_node_id, record.target_type, target_value, None))
 
         attrs = {
             "confidence": float(record.confidence),
@@ -174,22 +212,38 @@ class GraphBuilder:
         if record.attrs:
             attrs.update(record.attrs)
 
-        graph.add_edge(
+        edge_records.append((
             source_node_id,
             target_node_id,
             record.relation,
-            weight=float(record.weight),
-            bidirectional=record.bidirectional,
-            reverse_relation=record.reverse_relation or None,
-            attrs=attrs,
-        )
+            float(record.weight),
+            record.bidirectional,
+            record.reverse_relation or None,
+            attrs,
+        ))
 
     @staticmethod
     def _select_extractor_name(record: RelationRecord) -> str:
         return record.attrs.get("extractor", "relation_extractor") if record.attrs else "relation_extractor"
 
     @staticmethod
+    @lru_cache(maxsize=131072)
     def _entity_node_id(entity_type: str, entity_value: str) -> str:
+        # The same normalized entity recurs across many chunks; MD5 is kept so node ids stay stable
         raw = f"{entity_type}:{entity_value}"
         digest = hashlib.md5(raw.encode("utf-8")).hexdigest()[:16]
         return f"{entity_type}:{digest}"
+
+
+_worker_builder: Optional[GraphBuilder] = None
+
+
+def _extract_in_worker(item: Tuple[Dict[str, Any], str]) -> Tuple[List[Tuple[str, str]], List[RelationRecord]]:
+    """Module-level entry point for worker processes; each worker keeps its own extractors."""
+    global _worker_builder
+    if _worker_builder is None:
+        _worker_builder = GraphBuilder(max_workers=1)
+    doc, text = item
+    entities, relations = _worker_builder._extract(doc, text)
+    # A set rebuilt by unpickling may iterate in another order; send the worker's order as a list
+    return list(entities), relations
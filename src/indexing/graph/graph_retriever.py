@@ -1,5 +1,8 @@
-from collections import defaultdict, deque
-from typing import Any, Dict, List, Optional
+import heapq
+import threading
+from collections import OrderedDict, defaultdict, deque
+from operator import itemgetter
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 from src.core.schemas import SearchResult
 from src.indexing.graph.ontology import RELATION_WEIGHTS
@@ -9,9 +12,14 @@ from src.indexing.graph.graph_store import GraphStore
 class GraphRetriever:
     """Graph traversal retriever that ranks chunk nodes by proximity to query entities."""
 
+    # Ranked (chunk_node_id, score) lists of recent searches; results are hydrated from documents per call
+    SEARCH_CACHE_SIZE = 1024
+
     def __init__(self, graph_store: GraphStore, documents: Optional[List[Dict[str, Any]]] = None):
         self.graph_store = graph_store
         self.documents_by_chunk_id: Dict[str, Dict[str, Any]] = {}
+        self._search_cache: "OrderedDict[Hashable, List[Tuple[str, float]]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
         if documents:
             self.refresh_documents(documents)
 
@@ -31,22 +39,11 @@ class GraphRetriever:
         hops: int = 2,
         max_seed_nodes: int = 24,
     ) -> List[SearchResult]:
-        seeds = self.graph_store.find_nodes_by_query(query, max_nodes=max_seed_nodes)
-        if not seeds:
-            return []
-
-        allow_chunks = self.graph_store.iter_chunk_nodes(
-            doc_types=doc_types,
-            knowledge_filters=knowledge_filters,
-        )
-        chunk_scores = defaultdict(float)
-
-        for seed in seeds:
-            seed_id = seed["node_id"]
-            seed_score = float(seed["score"])
-            self._expand(seed_id, seed_score, hops, allow_chunks, chunk_scores)
-
-        ranked = sorted(chunk_scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        cache_key = self._search_cache_key(query, top_k, doc_types, knowledge_filters, hops, max_seed_nodes)
+        ranked = self._cached_ranking(cache_key)
+        if ranked is None:
+            ranked = self._rank_chunks(query, top_k, doc_types, knowledge_filters, hops, max_seed_nodes)
+            self._store_ranking(cache_key, ranked)
 
         results: List[SearchResult] = []
         for chunk_node_id, score in ranked:
@@ -72,6 +69,76 @@ class GraphRetriever:
 
         return results
 
+    def _rank_chunks(
+        self,
+        query: str,
+        top_k: int,
+        doc_types: Optional[List[str]],
+        knowledge_filters: Optional[Dict[str, List[str]]],
+        hops: int,
+        max_seed_nodes: int,
+    ) -> List[Tuple[str, float]]:
+        seeds = self.graph_store.find_nodes_by_query(query, max_nodes=max_seed_nodes)
+        if not seeds:
+            return []
+
+        allow_chunks = self.graph_store.iter_chunk_nodes(
+            doc_types=doc_types,
+            knowledge_filters=knowledge_filters,
+        )
+        chunk_scores = defaultdict(float)
+
+        for seed in seeds:
+            seed_id = seed["node_id"]
+            seed_score = float(seed["score"])
+            self._expand(seed_id, seed_score, hops, allow_chunks, chunk_scores)
+
+        # nlargest is documented to match sorted(..., reverse=True)[:n], ties included, in O(N log k)
+        return heapq.nlargest(top_k, chunk_scores.items(), key=itemgetter(1))
+
+    def _search_cache_key(
+        self,
+        query: str,
+        top_k: int,
+        doc_types: Optional[List[str]],
+        knowledge_filters: Optional[Dict[str, List[str]]],
+        hops: int,
+        max_seed_nodes: int,
+    ) -> Optional[Hashable]:
+        # The graph generation is part of the key, so any mutation of the store makes old entries unreachable
+        try:
+            key = (
+                self.graph_store.generation,
+                query,
+                top_k,
+                tuple(doc_types) if doc_types else None,
+                tuple((k, tuple(v or ())) for k, v in knowledge_filters.items()) if knowledge_filters else None,
+                hops,
+                max_seed_nodes,
+            )
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _cached_ranking(self, key: Optional[Hashable]) -> Optional[List[Tuple[str, float]]]:
+        if key is None:
+            return None
+        with self._search_cache_lock:
+            ranked = self._search_cache.get(key)
+            if ranked is not None:
+                self._search_cache.move_to_end(key)
+            return ranked
+
+    def _store_ranking(self, key: Optional[Hashable], ranked: List[Tuple[str, float]]):
+        if key is None:
+            return
+        with self._search_cache_lock:
+            self._search_cache[key] = ranked
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+
     def _expand(
         self,
         seed_id: str,
@@ -82,27 +149,28 @@ class GraphRetriever:
     ):
         q = deque([(seed_id, 0, 1.0)])
         seen_score = {seed_id: 1.0}
+        # Membership tests against the store's indexes instead of fetching each node dict
+        nodes = self.graph_store.nodes
+        chunk_nodes = self.graph_store.chunk_node_ids
+        iter_neighbors = self.graph_store.iter_neighbors
+        relation_weights = RELATION_WEIGHTS
 
         while q:
             current, depth, path_weight = q.popleft()
-            node = self.graph_store.get_node(current)
-            if not node:
+            if current not in nodes:
                 continue
 
-            if node.get("type") == "chunk":
+            if current in chunk_nodes:
                 if not allow_chunks or current in allow_chunks:
                     chunk_scores[current] += seed_score * path_weight / float(depth + 1)
 
             if depth >= hops:
                 continue
 
-            for edge in self.graph_store.neighbors(current):
-                nxt = edge.get("target")
+            for nxt, relation, edge_weight in iter_neighbors(current):
                 if not nxt:
                     continue
-                relation = str(edge.get("relation", ""))
-                relation_weight = RELATION_WEIGHTS.get(relation, 1.0)
-                edge_weight = float(edge.get("weight", 1.0))
+                relation_weight = relation_weights.get(relation, 1.0)
                 next_weight = path_weight * relation_weight * edge_weight
                 next_depth = depth + 1
                 best = seen_score.get(nxt)
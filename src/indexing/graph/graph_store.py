@@ -1,6 +1,149 @@
+import heapq
 import json
 import os
-from typing import Any, Dict, List, Optional, Set
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _intern(value: Any) -> Any:
+    # Node ids, types and relations repeat across thousands of edges; share one string object each
+    return sys.intern(value) if type(value) is str else value
+
+
+def edge_dict(target: str, relation: str, weight: float, attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the saved/public dict form of one outgoing edge."""
+    return {"target": target, "relation": relation, "weight": weight, "attrs": attrs}
+
+
+class _EdgeColumns:
+    """Outgoing edges of one node, stored column-wise instead of one dict per edge."""
+
+    __slots__ = ("targets", "relations", "weights", "attrs")
+
+    def __init__(self):
+        self.targets: List[str] = []
+        self.relations: List[str] = []
+        self.weights = array("d")
+        self.attrs: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def append(self, target: str, relation: str, weight: float, attrs: Dict[str, Any]):
+        self.targets.append(target)
+        self.relations.append(relation)
+        self.weights.append(weight)
+        self.attrs.append(attrs)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            edge_dict(target, relation, weight, attrs)
+            for target, relation, weight, attrs in zip(self.targets, self.relations, self.weights, self.attrs)
+        ]
+
+    @classmethod
+    def from_dicts(
+        cls,
+        edges: List[Dict[str, Any]],
+        shared_attrs: Optional[Dict[Tuple[Any, ...], Dict[str, Any]]] = None,
+    ) -> "_EdgeColumns":
+        columns = cls()
+        for edge in edges:
+            columns.append(
+                _intern(edge.get("target", "")),
+                _intern(edge.get("relation", "")),
+                float(edge.get("weight", 1.0)),
+                _share_attrs(edge.get("attrs", {}) or {}, shared_attrs),
+            )
+        return columns
+
+
+def _share_attrs(
+    attrs: Dict[str, Any],
+    shared_attrs: Optional[Dict[Tuple[Any, ...], Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Reuse one dict for equal flat attrs, as add_edge does for a forward/reverse pair."""
+    if shared_attrs is None or not attrs:
+        return attrs
+    try:
+        return shared_attrs.setdefault(tuple(attrs.items()), attrs)
+    except TypeError:  # nested (unhashable) values: keep the edge's own dict
+        return attrs
+
+
+class _NameIndex:
+    """Lowercased names of searchable nodes packed into one string for C-level substring search."""
+
+    SEPARATOR = "\x00"  # never part of a query token, so a match cannot span two names
+
+    __slots__ = ("haystack", "starts", "node_ids", "by_name", "name_automaton")
+
+    def __init__(self, nodes: Dict[str, Dict[str, Any]]):
+        parts: List[str] = []
+        self.starts: List[int] = []
+        self.node_ids: List[str] = []
+        self.by_name: Dict[str, List[int]] = {}
+        offset = 0
+        for node in nodes.values():
+            if node.get("type") in ("chunk", "document"):
+                continue
+            name = str(node.get("name", "")).lower()
+            if not name:
+                continue
+            self.by_name.setdefault(name, []).append(len(self.node_ids))
+            self.node_ids.append(node["id"])
+            self.starts.append(offset)
+            parts.append(name)
+            offset += len(name) + 1
+        self.haystack = self.SEPARATOR.join(parts)
+        # One automaton over the distinct names finds every name contained in a query in a single scan
+        self.name_automaton = None
+        if ahocorasick is not None and self.by_name:
+            automaton = ahocorasick.Automaton()
+            for name, positions in self.by_name.items():
+                automaton.add_word(name, positions)
+            automaton.make_automaton()
+            self.name_automaton = automaton
+
+    def score(self, query: str, tokens: List[str]) -> Dict[int, float]:
+        """Score node positions: +2 if the whole name occurs in ``query``, +1 per token found in the name."""
+        scores: Dict[int, float] = {}
+
+        # Names contained in the query
+        if self.name_automaton is not None:
+            matched = (positions for _, positions in self.name_automaton.iter(query))
+        else:
+            matched = (positions for name, positions in self.by_name.items() if name in query)
+        for positions in matched:
+            for idx in positions:
+                scores[idx] = 2.0
+
+        haystack = self.haystack
+        starts = self.starts
+        last = len(starts) - 1
+        for token in tokens:
+            pos = haystack.find(token)
+            while pos != -1:
+                idx = bisect_right(starts, pos) - 1
+                scores[idx] = scores.get(idx, 0.0) + 1.0
+                if idx == last:
+                    break
+                # Count each name at most once per token: resume at the next name
+                pos = haystack.find(token, starts[idx + 1])
+        return scores
 
 
 class GraphStore:
@@ -8,22 +151,97 @@ class GraphStore:
 
     def __init__(self):
         self.nodes: Dict[str, Dict[str, Any]] = {}
-        self.edges: Dict[str, List[Dict[str, Any]]] = {}
+        self._adjacency: Dict[str, _EdgeColumns] = {}
+        # Built lazily on the first query; dropped whenever a node is added or the graph reloaded
+        self._name_index: Optional[_NameIndex] = None
+        # Chunk node ids, overall and bucketed by attrs["doc_type"], kept in step with add_node
+        self._chunk_nodes: Set[str] = set()
+        self._chunk_nodes_by_doc_type: Dict[Any, Set[str]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every mutation, so callers can tell whether results they cached are stale."""
+        return self._generation
+
+    @property
+    def edges(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Edge dicts grouped by source node, materialized from the columnar storage for save().
+        Builds a dict per edge in the graph; readers should use iter_edges/iter_out_edges/iter_incoming.
+        """
+        return {source: columns.to_dicts() for source, columns in self._adjacency.items()}
+
+    @property
+    def chunk_node_ids(self) -> Set[str]:
+        """Ids of all chunk nodes (live index; callers must not mutate it)."""
+        return self._chunk_nodes
 
     def clear(self):
+        self._generation += 1
         self.nodes = {}
-        self.edges = {}
+        self._adjacency = {}
+        self._name_index = None
+        self._chunk_nodes = set()
+        self._chunk_nodes_by_doc_type = {}
 
     def add_node(self, node_id: str, node_type: str, name: str, attrs: Optional[Dict[str, Any]] = None):
+        self._generation += 1
         if node_id not in self.nodes:
+            self._name_index = None
+            node_id = _intern(node_id)
+            node_type = _intern(node_type)
             self.nodes[node_id] = {
                 "id": node_id,
                 "type": node_type,
                 "name": name,
                 "attrs": attrs or {},
             }
+            if node_type == "chunk":
+                self._index_chunk_node(node_id, (attrs or {}).get("doc_type"))
         elif attrs:
-            self.nodes[node_id]["attrs"].update(attrs)
+            node = self.nodes[node_id]
+            if node.get("type") == "chunk" and "doc_type" in attrs:
+                self._chunk_nodes_by_doc_type.get(node["attrs"].get("doc_type"), set()).discard(node_id)
+                self._index_chunk_node(node_id, attrs["doc_type"])
+            node["attrs"].update(attrs)
+
+    def add_nodes(self, records: Iterable[Tuple[str, str, str, Optional[Dict[str, Any]]]]):
+        """
+        Add ``(node_id, node_type, name, attrs)`` records in order; same result as add_node per record.
+        """
+        self._generation += 1
+        nodes = self.nodes
+        added = False
+        for node_id, node_type, name, attrs in records:
+            if node_id in nodes:
+                if attrs:
+                    self.add_node(node_id, node_type, name, attrs)
+                continue
+            added = True
+            node_id = _intern(node_id)
+            node_type = _intern(node_type)
+            nodes[node_id] = {
+                "id": node_id,
+                "type": node_type,
+                "name": name,
+                "attrs": attrs or {},
+            }
+            if node_type == "chunk":
+                self._index_chunk_node(node_id, (attrs or {}).get("doc_type"))
+        if added:
+            self._name_index = None
+
+    def _index_chunk_node(self, node_id: str, doc_type: Any):
+        self._chunk_nodes.add(node_id)
+        self._chunk_nodes_by_doc_type.setdefault(doc_type, set()).add(node_id)
+
+    def _rebuild_chunk_index(self):
+        self._chunk_nodes = set()
+        self._chunk_nodes_by_doc_type = {}
+        for node_id, node in self.nodes.items():
+            if node.get("type") == "chunk":
+                self._index_chunk_node(node_id, (node.get("attrs") or {}).get("doc_type"))
 
     def add_edge(
         self,
@@ -35,30 +253,104 @@ class GraphStore:
         reverse_relation: Optional[str] = None,
         attrs: Optional[Dict[str, Any]] = None,
     ):
+        self._generation += 1
         if source not in self.nodes or target not in self.nodes:
             return
 
-        self.edges.setdefault(source, []).append(
-            {
-                "target": target,
-                "relation": relation,
-                "weight": float(weight),
-                "attrs": attrs or {},
-            }
-        )
+        weight = float(weight)
+        attrs = attrs or {}
+        adjacency = self._adjacency
+        source = _intern(source)
+        target = _intern(target)
+        relation = _intern(relation)
+        reverse_relation = _intern(reverse_relation)
+
+        columns = adjacency.get(source)
+        if columns is None:
+            columns = adjacency[source] = _EdgeColumns()
+        columns.append(target, relation, weight, attrs)
 
         if bidirectional:
-            self.edges.setdefault(target, []).append(
-                {
-                    "target": source,
-                    "relation": reverse_relation or relation,
-                    "weight": float(weight),
-                    "attrs": attrs or {},
-                }
-            )
+            columns = adjacency.get(target)
+            if columns is None:
+                columns = adjacency[target] = _EdgeColumns()
+            columns.append(source, reverse_relation or relation, weight, attrs)
+
+    def add_edges(
+        self,
+        records: Iterable[Tuple[str, str, str, float, bool, Optional[str], Optional[Dict[str, Any]]]],
+    ):
+        """
+        Add ``(source, target, relation, weight, bidirectional, reverse_relation, attrs)`` records
+        in order; same result as add_edge per record.
+        """
+        self._generation += 1
+        nodes = self.nodes
+        adjacency = self._adjacency
+        for source, target, relation, weight, bidirectional, reverse_relation, attrs in records:
+            if source not in nodes or target not in nodes:
+                continue
+
+            weight = float(weight)
+            attrs = attrs or {}
+            source = _intern(source)
+            target = _intern(target)
+            relation = _intern(relation)
+
+            columns = adjacency.get(source)
+            if columns is None:
+                columns = adjacency[source] = _EdgeColumns()
+            columns.append(target, relation, weight, attrs)
+
+            if bidirectional:
+                columns = adjacency.get(target)
+                if columns is None:
+                    columns = adjacency[target] = _EdgeColumns()
+                columns.append(source, _intern(reverse_relation) or relation, weight, attrs)
 
     def neighbors(self, node_id: str) -> List[Dict[str, Any]]:
-        return self.edges.get(node_id, [])
+        columns = self._adjacency.get(node_id)
+        return columns.to_dicts() if columns is not None else []
+
+    def iter_neighbors(self, node_id: str) -> Iterator[Tuple[str, str, float]]:
+        """Yield ``(target, relation, weight)`` for each outgoing edge without building edge dicts."""
+        columns = self._adjacency.get(node_id)
+        if columns is None:
+            return iter(())
+        return zip(columns.targets, columns.relations, columns.weights)
+
+    def iter_out_edges(self, node_id: str) -> Iterator[Tuple[str, str, float, Dict[str, Any]]]:
+        """Yield ``(target, relation, weight, attrs)`` for each outgoing edge without building edge dicts."""
+        columns = self._adjacency.get(node_id)
+        if columns is None:
+            return iter(())
+        return zip(columns.targets, columns.relations, columns.weights, columns.attrs)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, str, float, Dict[str, Any]]]:
+        """Yield ``(source, target, relation, weight, attrs)`` for every edge, grouped by source."""
+        for source, columns in self._adjacency.items():
+            for target, relation, weight, attrs in zip(columns.targets, columns.relations, columns.weights, columns.attrs):
+                yield source, target, relation, weight, attrs
+
+    def iter_incoming(self, node_id: str) -> Iterator[Tuple[str, str, float, Dict[str, Any]]]:
+        """Yield ``(source, relation, weight, attrs)`` for each edge pointing at ``node_id``."""
+        for source, columns in self._adjacency.items():
+            targets = columns.targets
+            # list.index scans the target column in C; most sources have no edge to node_id
+            try:
+                idx = targets.index(node_id)
+            except ValueError:
+                continue
+            while True:
+                yield source, columns.relations[idx], columns.weights[idx], columns.attrs[idx]
+                try:
+                    idx = targets.index(node_id, idx + 1)
+                except ValueError:
+                    break
+
+    def iter_relations(self) -> Iterator[str]:
+        for columns in self._adjacency.values():
+            yield from columns.relations
 
     def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
         return self.nodes.get(node_id)
@@ -69,14 +361,47 @@ class GraphStore:
             "nodes": self.nodes,
             "edges": self.edges,
         }
+        if orjson is not None:
+            # Same JSON document as json.dump (UTF-8, non-str keys stringified), encoded in C
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
+            return
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=False)
 
     def load(self, filepath: str):
-        with open(filepath, "r", encoding="utf-8") as f:
-            payload = json.load(f)
-        self.nodes = payload.get("nodes", {})
-        self.edges = payload.get("edges", {})
+        if orjson is not None:
+            with open(filepath, "rb") as f:
+                payload = orjson.loads(f.read())
+        else:
+            with open(filepath, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        self._generation += 1
+        self.nodes = self._intern_loaded_nodes(payload.get("nodes", {}) or {})
+        self._name_index = None
+        self._rebuild_chunk_index()
+        # JSON stores a bidirectional edge's attrs twice; share them again as add_edge did
+        shared_attrs: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        self._adjacency = {
+            _intern(source): _EdgeColumns.from_dicts(edges, shared_attrs)
+            for source, edges in (payload.get("edges", {}) or {}).items()
+        }
+
+    @staticmethod
+    def _intern_loaded_nodes(nodes: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        interned: Dict[str, Dict[str, Any]] = {}
+        for node_id, node in nodes.items():
+            node_id = _intern(node_id)
+            if isinstance(node, dict):
+                if node.get("id") == node_id:
+                    node["id"] = node_id
+                if "type" in node:
+                    node["type"] = _intern(node["type"])
+                attrs = node.get("attrs")
+                if isinstance(attrs, dict) and "doc_type" in attrs:
+                    attrs["doc_type"] = _intern(attrs["doc_type"])
+            interned[node_id] = node
+        return interned
 
     def exists(self, filepath: str) -> bool:
         return os.path.exists(filepath)
@@ -87,30 +412,18 @@ class GraphStore:
             return []
 
         tokens = [t for t in _extract_query_tokens(query) if len(t) >= 2]
-        scored: List[Dict[str, Any]] = []
-
-        for node in self.nodes.values():
-            node_type = node.get("type")
-            if node_type in ("chunk", "document"):
-                continue
-
-            name = str(node.get("name", "")).lower()
-            if not name:
-                continue
 
-            score = 0.0
-            if name in query:
-                score += 2.0
+        name_index = self._name_index
+        if name_index is None:
+            name_index = self._name_index = _NameIndex(self.nodes)
 
-            for token in tokens:
-                if token in name:
-                    score += 1.0
-
-            if score > 0:
-                scored.append({"node_id": node["id"], "score": score})
-
-        scored.sort(key=lambda x: x["score"], reverse=True)
-        return scored[:max_nodes]
+        # Ties keep node insertion order, as with a stable sort over all nodes; plain tuples keep
+        # the top-k selection on native comparisons
+        ranked = heapq.nsmallest(max_nodes, ((-score, idx) for idx, score in name_index.score(query, tokens).items()))
+        return [
+            {"node_id": name_index.node_ids[idx], "score": -neg_score}
+            for neg_score, idx in ranked
+        ]
 
     @staticmethod
     def _matches_knowledge_filters(node_attrs: Dict[str, Any], knowledge_filters: Optional[Dict[str, List[str]]]) -> bool:
@@ -146,21 +459,23 @@ class GraphStore:
         knowledge_filters: Optional[Dict[str, List[str]]] = None,
     ) -> Set[str]:
         allow_doc_types = set(doc_types or [])
-        chunk_nodes: Set[str] = set()
-        for node_id, node in self.nodes.items():
-            if node.get("type") != "chunk":
-                continue
-            if allow_doc_types:
-                node_doc_type = node.get("attrs", {}).get("doc_type")
-                if node_doc_type not in allow_doc_types:
-                    continue
-            if not self._matches_knowledge_filters(node.get("attrs", {}) or {}, knowledge_filters):
-                continue
-            chunk_nodes.add(node_id)
+        if allow_doc_types:
+            chunk_nodes = set().union(
+                *(self._chunk_nodes_by_doc_type.get(doc_type, ()) for doc_type in allow_doc_types)
+            )
+        else:
+            chunk_nodes = set(self._chunk_nodes)
+
+        if knowledge_filters:
+            chunk_nodes = {
+                node_id
+                for node_id in chunk_nodes
+                if self._matches_knowledge_filters(self.nodes[node_id].get("attrs", {}) or {}, knowledge_filters)
+            }
         return chunk_nodes
 
     def get_stats(self) -> Dict[str, Any]:
-        edge_count = sum(len(v) for v in self.edges.values())
+        edge_count = sum(len(columns) for columns in self._adjacency.values())
         by_type: Dict[str, int] = {}
         for node in self.nodes.values():
             t = node.get("type", "unknown")
@@ -173,16 +488,9 @@ class GraphStore:
         }
 
 
+# [^\W_] is exactly str.isalnum(); the CJK range also admits unassigned code points in the block
+_QUERY_TOKEN_PATTERN = re.compile(r"(?:[^\W_]|[\u4e00-\u9fff])+")
+
+
 def _extract_query_tokens(query: str) -> List[str]:
-    buf: List[str] = []
-    cur = []
-    for ch in query:
-        if ch.isalnum() or ("\u4e00" <= ch <= "\u9fff"):
-            cur.append(ch)
-        else:
-            if cur:
-                buf.append("".join(cur))
-                cur = []
-    if cur:
-        buf.append("".join(cur))
-    return buf
+    return _QUERY_TOKEN_PATTERN.findall(query)
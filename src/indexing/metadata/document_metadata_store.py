@@ -7,8 +7,13 @@ import json
 import os
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Optional, Any, ClassVar, FrozenSet, Tuple
+from dataclasses import dataclass, asdict, field, fields
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +38,25 @@ class DocumentRecord:
     version_label: str = ""  # 版本标签（如：2018版）
     storage_file_id: str = ""  # 统一文件存储ID
     knowledge_labels: Dict[str, List[str]] = field(default_factory=dict)  # 通用知识分类标签
+    parsed_cache_key: str = ""  # 文档解析缓存键，删除文档时一并清理缓存
+
+    # 字段名（按定义顺序）及其集合，类定义后填充
+    _FIELD_ORDER: ClassVar[Tuple[str, ...]] = ()
+    _FIELD_NAMES: ClassVar[FrozenSet[str]] = frozenset()
     
     def to_dict(self) -> Dict:
         return asdict(self)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'DocumentRecord':
-        allowed_fields = set(cls.__dataclass_fields__.keys())
-        normalized = {k: v for k, v in (data or {}).items() if k in allowed_fields}
+        data = data or {}
+        allowed_fields = cls._FIELD_NAMES
+        complete = data.keys() == allowed_fields
+        if complete:
+            # 常见情况：磁盘上的记录恰好包含全部字段，直接浅拷贝
+            normalized = dict(data)
+        else:
+            normalized = {k: v for k, v in data.items() if k in allowed_fields}
         raw_labels = normalized.get("knowledge_labels")
         if isinstance(raw_labels, dict):
             cleaned: Dict[str, List[str]] = {}
@@ -49,7 +65,7 @@ class DocumentRecord:
                 if not normalized_key:
                     continue
                 if isinstance(value, list):
-                    items = [str(v).strip() for v in value if str(v).strip()]
+                    items = [item for item in (str(v).strip() for v in value) if item]
                 elif value is None:
                     items = []
                 else:
@@ -59,20 +75,76 @@ class DocumentRecord:
             normalized["knowledge_labels"] = cleaned
         elif raw_labels is not None:
             normalized["knowledge_labels"] = {}
+        if complete:
+            # 字段齐全时无需默认值与必填校验，跳过生成的__init__（关键字参数展开占加载耗时的一半）；
+            # 按字段定义顺序写入，保证序列化时的字段顺序不受文件中键顺序影响
+            record = cls.__new__(cls)
+            record.__dict__.update((name, normalized[name]) for name in cls._FIELD_ORDER)
+            return record
         return cls(**normalized)
 
 
+DocumentRecord._FIELD_ORDER = tuple(f.name for f in fields(DocumentRecord))
+DocumentRecord._FIELD_NAMES = frozenset(DocumentRecord._FIELD_ORDER)
+
+
 class DocumentMetadataStore:
     """文档元数据管理器"""
     
     def __init__(self, storage_path: str = "./data/document_metadata.json"):
         self.storage_path = storage_path
+        self._by_status: Optional[Dict[str, Dict[str, int]]] = None
+        self._by_type: Optional[Dict[str, Dict[str, int]]] = None
+        self._by_filename: Optional[Dict[str, Dict[str, int]]] = None
+        self._next_seq = 0
+        self._stats_cache: Optional[Dict] = None
         self.documents: Dict[str, DocumentRecord] = {}
         self._last_loaded_mtime_ns: Optional[int] = None
         self._last_loaded_size: Optional[int] = None
         self._ensure_dir()
         self._load()
     
+    @property
+    def documents(self) -> Dict[str, DocumentRecord]:
+        return self._documents
+
+    @documents.setter
+    def documents(self, value: Dict[str, DocumentRecord]):
+        # 整体替换（加载/清空）时丢弃索引，下次查询时按新数据重建
+        self._documents = value
+        self._by_status = None
+        self._by_type = None
+        self._by_filename = None
+        self._stats_cache = None
+
+    def _ensure_indexes(self):
+        """
+        按状态、文档类型、文件名建立 doc_id 索引（值为插入序号，用于保持与遍历 documents 相同的同分排序）；
+        status/doc_type/filename 只经由本类修改（文件名通过 rename_document），因此索引在增删改时增量维护即可
+        """
+        if self._by_status is not None:
+            return
+        self._by_status = {}
+        self._by_type = {}
+        self._by_filename = {}
+        for seq, (doc_id, doc) in enumerate(self._documents.items()):
+            self._by_status.setdefault(doc.status, {})[doc_id] = seq
+            self._by_type.setdefault(doc.doc_type, {})[doc_id] = seq
+            self._by_filename.setdefault(doc.filename, {})[doc_id] = seq
+        self._next_seq = len(self._documents)
+
+    def _set_status(self, doc: DocumentRecord, status: str):
+        if self._by_status is not None and doc.status != status:
+            seq = self._by_status[doc.status].pop(doc.doc_id)
+            self._by_status.setdefault(status, {})[doc.doc_id] = seq
+        doc.status = status
+
+    def _set_filename(self, doc: DocumentRecord, filename: str):
+        if self._by_filename is not None and doc.filename != filename:
+            seq = self._by_filename[doc.filename].pop(doc.doc_id)
+            self._by_filename.setdefault(filename, {})[doc.doc_id] = seq
+        doc.filename = filename
+
     def _ensure_dir(self):
         """确保存储目录存在"""
         dir_path = os.path.dirname(self.storage_path)
@@ -89,8 +161,12 @@ class DocumentMetadataStore:
 
         try:
             stat = os.stat(self.storage_path)
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(self.storage_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(self.storage_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             loaded_documents: Dict[str, DocumentRecord] = {}
             for doc_id, record in data.items():
                 loaded_documents[doc_id] = DocumentRecord.from_dict(record)
@@ -137,10 +213,25 @@ class DocumentMetadataStore:
     
     def save(self):
         """保存元数据到文件"""
+        # 调用方会直接修改记录字段（如 chunk_count）后调用 save，此处同样让统计缓存失效
+        self._stats_cache = None
         try:
-            data = {k: v.to_dict() for k, v in self.documents.items()}
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 先写临时文件并刷盘，再原子替换，避免写入中途崩溃留下截断的元数据文件
+            temp_path = f"{self.storage_path}.tmp"
+            if orjson is not None:
+                # orjson直接序列化dataclass（字段顺序同asdict），无需逐条深拷贝；输出与json.dump(indent=2)逐字节一致
+                content = orjson.dumps(self.documents, option=orjson.OPT_INDENT_2)
+                with open(temp_path, 'wb') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                data = {k: v.to_dict() for k, v in self.documents.items()}
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, self.storage_path)
             try:
                 stat = os.stat(self.storage_path)
                 self._last_loaded_mtime_ns = int(getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1_000_000_000)))
@@ -157,25 +248,33 @@ class DocumentMetadataStore:
         :param save: 是否立即落盘
         :return: True表示新增，False表示更新
         """
+        self._stats_cache = None
         if record.doc_id in self.documents:
             # 已存在，更新版本
             existing = self.documents[record.doc_id]
             existing.version += 1
             existing.upload_time = record.upload_time
             existing.chunk_count = record.chunk_count
-            existing.status = "active"
+            self._set_status(existing, "active")
             existing.searchable = bool(record.searchable)
             existing.file_path = record.file_path
-            existing.filename = record.filename
+            self._set_filename(existing, record.filename)
             existing.knowledge_labels = dict(record.knowledge_labels or {})
             if record.storage_file_id:
                 existing.storage_file_id = record.storage_file_id
+            if record.parsed_cache_key:
+                existing.parsed_cache_key = record.parsed_cache_key
             if save:
                 self.save()
             logger.info(f"更新文档记录: {record.filename}, 版本: {existing.version}")
             return False  # 更新
         
         self.documents[record.doc_id] = record
+        if self._by_status is not None:
+            self._by_status.setdefault(record.status, {})[record.doc_id] = self._next_seq
+            self._by_type.setdefault(record.doc_type, {})[record.doc_id] = self._next_seq
+            self._by_filename.setdefault(record.filename, {})[record.doc_id] = self._next_seq
+            self._next_seq += 1
         if save:
             self.save()
         logger.info(f"新增文档记录: {record.filename}")
@@ -187,10 +286,28 @@ class DocumentMetadataStore:
     
     def get_document_by_filename(self, filename: str) -> Optional[DocumentRecord]:
         """通过文件名查找文档"""
-        for doc in self.documents.values():
-            if doc.filename == filename and doc.status == "active":
-                return doc
-        return None
+        self._ensure_indexes()
+        documents = self.documents
+        # 与遍历 documents 一致，多个同名文档时返回插入最早（序号最小）的有效文档
+        active = [
+            (seq, doc_id) for doc_id, seq in self._by_filename.get(filename, {}).items()
+            if documents[doc_id].status == "active"
+        ]
+        return documents[min(active)[1]] if active else None
+
+    def rename_document(self, doc_id: str, filename: str, save: bool = True) -> bool:
+        """
+        修改文档文件名（同步维护文件名索引，调用方不应直接修改 record.filename）
+        :param save: 是否立即落盘
+        :return: True表示文件名发生变化
+        """
+        doc = self.documents.get(doc_id)
+        if doc is None or doc.filename == filename:
+            return False
+        self._set_filename(doc, filename)
+        if save:
+            self.save()
+        return True
     
     def list_documents(
         self, 
@@ -199,16 +316,32 @@ class DocumentMetadataStore:
         keyword: str = None
     ) -> List[DocumentRecord]:
         """列出文档（支持过滤）"""
-        results = []
-        for doc in self.documents.values():
-            if status and doc.status != status:
-                continue
-            if doc_type and doc.doc_type != doc_type:
-                continue
-            if keyword and keyword.lower() not in doc.filename.lower():
-                continue
-            results.append(doc)
-        return sorted(results, key=lambda x: x.upload_time, reverse=True)
+        self._ensure_indexes()
+        if status and doc_type:
+            status_ids = self._by_status.get(status, {})
+            type_ids = self._by_type.get(doc_type, {})
+            if len(type_ids) < len(status_ids):
+                candidates = {doc_id: seq for doc_id, seq in type_ids.items() if doc_id in status_ids}
+            else:
+                candidates = {doc_id: seq for doc_id, seq in status_ids.items() if doc_id in type_ids}
+        elif status:
+            candidates = self._by_status.get(status, {})
+        elif doc_type:
+            candidates = self._by_type.get(doc_type, {})
+        else:
+            candidates = None
+
+        documents = self.documents
+        if candidates is None:
+            entries = [(seq, doc) for seq, doc in enumerate(documents.values())]
+        else:
+            entries = [(seq, documents[doc_id]) for doc_id, seq in candidates.items()]
+        if keyword:
+            keyword_lower = keyword.lower()
+            entries = [(seq, doc) for seq, doc in entries if keyword_lower in doc.filename.lower()]
+        # 同一上传时间按原插入顺序排列，与遍历 documents 后稳定排序的结果一致
+        entries.sort(key=lambda item: item[0])
+        return sorted((doc for _, doc in entries), key=lambda x: x.upload_time, reverse=True)
     
     def delete_document(self, doc_id: str, soft_delete: bool = True) -> bool:
         """
@@ -219,10 +352,14 @@ class DocumentMetadataStore:
             return False
         
         if soft_delete:
-            self.documents[doc_id].status = "deleted"
+            self._set_status(self.documents[doc_id], "deleted")
             logger.info(f"软删除文档: {doc_id}")
         else:
-            del self.documents[doc_id]
+            doc = self.documents.pop(doc_id)
+            if self._by_status is not None:
+                self._by_status[doc.status].pop(doc_id, None)
+                self._by_type[doc.doc_type].pop(doc_id, None)
+                self._by_filename[doc.filename].pop(doc_id, None)
             logger.info(f"硬删除文档: {doc_id}")
         
         self.save()
@@ -231,7 +368,7 @@ class DocumentMetadataStore:
     def restore_document(self, doc_id: str) -> bool:
         """恢复已删除的文档"""
         if doc_id in self.documents and self.documents[doc_id].status == "deleted":
-            self.documents[doc_id].status = "active"
+            self._set_status(self.documents[doc_id], "active")
             self.save()
             logger.info(f"恢复文档: {doc_id}")
             return True
@@ -246,28 +383,34 @@ class DocumentMetadataStore:
         return True
     
     def get_stats(self) -> Dict:
-        """获取统计信息"""
+        """获取统计信息（结果缓存至下一次修改或落盘，返回副本供调用方自由修改）"""
+        if self._stats_cache is None:
+            self._stats_cache = self._compute_stats()
+        stats = dict(self._stats_cache)
+        stats["by_type"] = {doc_type: dict(item) for doc_type, item in stats["by_type"].items()}
+        return stats
+
+    def _compute_stats(self) -> Dict:
         total = len(self.documents)
-        active = sum(1 for d in self.documents.values() if d.status == "active")
-        deleted = sum(1 for d in self.documents.values() if d.status == "deleted")
-        total_chunks = sum(
-            d.chunk_count for d in self.documents.values() 
-            if d.status == "active"
-        )
-        total_size = sum(
-            d.file_size for d in self.documents.values()
-            if d.status == "active"
-        )
-        
-        # 按类型统计
-        type_stats = {}
+        active = 0
+        deleted = 0
+        total_chunks = 0
+        total_size = 0
+        type_stats = {}  # 按类型统计
+
+        # 单次遍历累计所有计数
         for d in self.documents.values():
             if d.status == "active":
-                doc_type = d.doc_type
-                if doc_type not in type_stats:
-                    type_stats[doc_type] = {"count": 0, "chunks": 0}
-                type_stats[doc_type]["count"] += 1
-                type_stats[doc_type]["chunks"] += d.chunk_count
+                active += 1
+                total_chunks += d.chunk_count
+                total_size += d.file_size
+                doc_type_stats = type_stats.get(d.doc_type)
+                if doc_type_stats is None:
+                    doc_type_stats = type_stats[d.doc_type] = {"count": 0, "chunks": 0}
+                doc_type_stats["count"] += 1
+                doc_type_stats["chunks"] += d.chunk_count
+            elif d.status == "deleted":
+                deleted += 1
         
         return {
             "total_documents": total,
@@ -0,0 +1,74 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """按文本内容哈希缓存嵌入向量的本地磁盘缓存（SQLite，向量以float32字节存储）"""
+
+    _QUERY_CHUNK = 500  # SQLite单条语句的参数个数有上限，批量查询时分段
+
+    def __init__(self, db_path: str):
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"嵌入向量缓存已启用: {self.db_path}")
+
+    @staticmethod
+    def build_key(namespace: str, text: str) -> str:
+        return hashlib.blake2b(f"{namespace}|{text}".encode("utf-8"), digest_size=20).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for i in range(0, len(unique_keys), self._QUERY_CHUNK):
+                chunk = unique_keys[i:i + self._QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def set_many(self, items: List[Tuple[str, np.ndarray]]):
+        if not items:
+            return
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def clear(self) -> int:
+        """
+        清空缓存并回收磁盘空间
+        :return: 清除的向量条数
+        """
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM embeddings").rowcount
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return max(0, removed)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,14 @@
 import logging
+import os
 import httpx
-from typing import List
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from abc import ABC, abstractmethod
 from openai import OpenAI
 
+from src.indexing.vector.embedding_cache import EmbeddingCache
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -13,14 +18,21 @@ class EmbeddingProvider(ABC):
     """嵌入提供者抽象基类"""
     
     @abstractmethod
-    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         获取文本的嵌入向量
         :param texts: 文本列表
-        :return: 嵌入向量列表
+        :return: 形状为 (len(texts), dimension) 的 float32 嵌入矩阵
         """
         pass
 
+    def clear_cache(self) -> int:
+        """
+        清空嵌入向量缓存（无缓存的实现无需覆盖）
+        :return: 清除的向量条数
+        """
+        return 0
+
 
 class TextEmbeddingProvider(EmbeddingProvider):
     """
@@ -36,6 +48,9 @@ class TextEmbeddingProvider(EmbeddingProvider):
         ssl_verify: bool = True,
         env: str = "development",
         request_timeout: float = 30.0,
+        max_concurrency: int = 4,
+        cache_dir: Optional[str] = None,
+        batch_size: int = 10,
     ):
         self.api_key = api_key
         self.endpoint = endpoint
@@ -43,107 +58,142 @@ class TextEmbeddingProvider(EmbeddingProvider):
         self.ssl_verify = ssl_verify
         self.env = env  # 存储环境信息
         self.request_timeout = float(request_timeout)
+        self.max_concurrency = max(1, int(max_concurrency))
+        # 单次请求的文本条数上限；text-embedding-v4 接口最多接受10条，支持更大批量的服务可调大
+        self.batch_size = max(1, int(batch_size))
         
-        # 直接使用提供的endpoint作为base_url
-        base_url = endpoint
-        
-        # 创建HTTP客户端，支持SSL验证控制
-        http_client = httpx.Client(verify=ssl_verify, timeout=self.request_timeout)
-        
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url,
-            http_client=http_client
-        )
+        # 按SSL验证状态缓存客户端，切换时复用已建立的长连接，不再重建连接池
+        self._clients: Dict[bool, OpenAI] = {}
+        self.client = self._get_client(ssl_verify)
         self.dimension = 1024  # 实际从API返回的维度
+
+        # 按 endpoint+模型+文本 哈希缓存向量，重复文本不再调用API
+        self.cache: Optional[EmbeddingCache] = None
+        if cache_dir:
+            try:
+                self.cache = EmbeddingCache(os.path.join(cache_dir, "embeddings.sqlite3"))
+            except Exception as e:
+                logger.warning(f"嵌入向量缓存初始化失败，将不使用缓存: {e}")
         logger.info(
-            f"Text Embedding提供者初始化完成，模型名称: {self.model_name}, 环境: {self.env}, Base URL: {self.client.base_url}, 超时: {self.request_timeout}s"
+            f"Text Embedding提供者初始化完成，模型名称: {self.model_name}, 环境: {self.env}, Base URL: {self.client.base_url}, 超时: {self.request_timeout}s, 并发: {self.max_concurrency}, 批次大小: {self.batch_size}"
+        )
+
+    def clear_cache(self) -> int:
+        if self.cache is None:
+            return 0
+        try:
+            return self.cache.clear()
+        except Exception as e:
+            logger.warning(f"清空嵌入向量缓存失败: {e}")
+            return 0
+
+    def _create_http_client(self, ssl_verify: bool) -> httpx.Client:
+        return httpx.Client(
+            verify=ssl_verify,
+            timeout=self.request_timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
         )
     
-    def set_ssl_verify(self, ssl_verify: bool):
-        """设置SSL验证状态"""
-        if self.ssl_verify != ssl_verify:
-            # 保存环境信息
-            env = self.env
-            
-            # 关闭现有的HTTP客户端
-            if hasattr(self.client, '_client') and hasattr(self.client._client, 'close'):
-                self.client._client.close()
-            
-            # 创建新的HTTP客户端
-            http_client = httpx.Client(verify=ssl_verify, timeout=self.request_timeout)
-            
+    def _get_client(self, ssl_verify: bool) -> OpenAI:
+        """
+        获取指定SSL验证状态的OpenAI客户端，首次使用时创建
+        :param ssl_verify: 是否验证SSL证书
+        :return: OpenAI客户端
+        """
+        client = self._clients.get(ssl_verify)
+        if client is None:
+            # 创建HTTP客户端，支持SSL验证控制；连接池大小与并发批次数一致，保持长连接复用
             # 直接使用提供的endpoint作为base_url
-            base_url = self.endpoint
-            
-            # 重新创建OpenAI客户端
-            self.client = OpenAI(
+            client = OpenAI(
                 api_key=self.api_key,
-                base_url=base_url,
-                http_client=http_client
+                base_url=self.endpoint,
+                http_client=self._create_http_client(ssl_verify),
             )
-            
-            # 恢复环境信息
-            self.env = env
-            
+            self._clients[ssl_verify] = client
+        return client
+    
+    def set_ssl_verify(self, ssl_verify: bool):
+        """设置SSL验证状态"""
+        if self.ssl_verify != ssl_verify:
+            self.client = self._get_client(ssl_verify)
             self.ssl_verify = ssl_verify
             logger.info(f"SSL验证已设置为: {ssl_verify}, Base URL: {self.client.base_url}")
     
-    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
         """
-        获取文本的嵌入向量
+        获取文本的嵌入向量（优先读取本地缓存，仅对未命中的文本调用API）
         :param texts: 需要转换的文本列表
-        :return: 对应的嵌入向量列表
+        :return: 形状为 (len(texts), dimension) 的 float32 嵌入矩阵，行顺序与输入一致
         """
-        # 使用实例变量中的环境信息
-        env = self.env
-        
-        # API对批量请求有限制，最多10个项目，所以我们需要分批处理
-        batch_size = 10
-        all_embeddings = []
+        if self.cache is None or not texts:
+            return self._request_embeddings(texts)
+
+        namespace = f"{self.endpoint}|{self.model_name}"
+        keys = [EmbeddingCache.build_key(namespace, text) for text in texts]
+        try:
+            vectors_by_key = self.cache.get_many(keys)
+        except Exception as e:
+            logger.warning(f"读取嵌入向量缓存失败: {e}")
+            vectors_by_key = {}
+
+        # 未命中的文本按key去重后再请求
+        missing: Dict[str, int] = {}
+        for idx, key in enumerate(keys):
+            if key not in vectors_by_key and key not in missing:
+                missing[key] = idx
+
+        if missing:
+            fresh = self._request_embeddings([texts[idx] for idx in missing.values()])
+            fresh_items = list(zip(missing.keys(), fresh))
+            try:
+                self.cache.set_many(fresh_items)
+            except Exception as e:
+                logger.warning(f"写入嵌入向量缓存失败: {e}")
+            vectors_by_key.update(fresh_items)
+
+        logger.info(f"嵌入向量缓存命中: {len(texts) - len(missing)}/{len(texts)}")
+        dimension = len(vectors_by_key[keys[0]])
+        if dimension != self.dimension:
+            self.dimension = dimension
+
+        all_embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+        for idx, key in enumerate(keys):
+            all_embeddings[idx] = vectors_by_key[key]
+        return all_embeddings
+
+    def _request_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        调用API获取文本的嵌入向量
+        :param texts: 需要转换的文本列表
+        :return: 形状为 (len(texts), dimension) 的 float32 嵌入矩阵，行顺序与输入一致
+        """
+        # API对批量请求有条数限制，所以我们需要分批处理；多个批次并发请求以重叠网络往返
+        batch_size = self.batch_size
+        batches = [(i, texts[i:i+batch_size]) for i in range(0, len(texts), batch_size)]
         
         try:
-            for i in range(0, len(texts), batch_size):
-                batch_texts = texts[i:i+batch_size]
-                
-                # OpenAI兼容的API端点始终需要添加embeddings后缀
-                actual_endpoint = f"{self.client.base_url}/embeddings"
-                
-                # 记录完整的调用参数
-                logger.info(f"调用嵌入模型API: {actual_endpoint}, 模型: {self.model_name}, 批次大小: {len(batch_texts)}, 环境: {env}")
-                logger.info(f"嵌入模型API调用参数详情:")
-                logger.info(f"  基础URL: {self.client.base_url}")
-                logger.info(f"  端点: {actual_endpoint}")
-                logger.info(f"  模型名称: {self.model_name}")
-                logger.info(f"  输入文本数量: {len(batch_texts)}")
-                logger.info(f"  输入文本内容: {batch_texts}")
-                
-                # 打印将要发送的请求的URL、Headers和Body内容
-                logger.info(f"嵌入模型API请求详情:")
-                logger.info(f"  URL: {actual_endpoint}")
-                logger.info(f"  Method: POST")
-                # 由于使用OpenAI SDK，我们不能直接访问headers，但可以推断它们
-                logger.info(f"  Headers: {{'Authorization': 'Bearer ***', 'Content-Type': 'application/json'}}")
-                logger.info(f"  Request Body: {{'model': '{self.model_name}', 'input': {batch_texts}}}")
-                
-                # 调用API获取嵌入向量
-                response = self.client.embeddings.create(
-                    model=self.model_name,
-                    input=batch_texts,
-                    timeout=self.request_timeout,
-                )
-                
-                # 记录完整的响应内容
-                logger.info(f"嵌入模型API调用成功，响应状态: 成功, 向量数量: {len(response.data)}")
-                
-                # 提取嵌入向量
-                for j, data in enumerate(response.data):
-                    all_embeddings.append(data.embedding)
-                    logger.info(f"  响应数据项 {j+1}: index={data.index}, embedding_length={len(data.embedding)}")
-            
+            max_workers = min(self.max_concurrency, len(batches))
+            if max_workers > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    batch_results = list(executor.map(self._embed_batch, batches))
+            else:
+                batch_results = [self._embed_batch(batch) for batch in batches]
+
+            if not batch_results:
+                return np.empty((0, self.dimension), dtype=np.float32)
+
             # 更新维度（如果需要）
-            if all_embeddings and len(all_embeddings[0]) != self.dimension:
-                self.dimension = len(all_embeddings[0])
+            dimension = batch_results[0][1].shape[1]
+            if dimension != self.dimension:
+                self.dimension = dimension
+
+            # 按批次起始偏移写回连续的float32矩阵，保证与输入顺序一致
+            all_embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+            for start, vectors in batch_results:
+                all_embeddings[start:start + len(vectors)] = vectors
             
             logger.info(f"嵌入向量获取完成，总计向量数: {len(all_embeddings)}")
             return all_embeddings
@@ -151,3 +201,27 @@ class TextEmbeddingProvider(EmbeddingProvider):
         except Exception as e:
             logger.error(f"获取嵌入向量时发生错误: {e}")
             raise
+
+    def _embed_batch(self, batch):
+        """
+        请求单个批次的嵌入向量
+        :param batch: (批次起始偏移, 批次文本列表)
+        :return: (批次起始偏移, float32嵌入矩阵)
+        """
+        start, batch_texts = batch
+
+        # 每批次只输出一条摘要日志；完整请求体仅在DEBUG级别输出，避免正常运行时格式化整批文本
+        logger.info(f"调用嵌入模型API: {self.client.base_url}embeddings, 模型: {self.model_name}, 批次起始: {start}, 批次大小: {len(batch_texts)}, 环境: {self.env}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("嵌入模型API请求体: model=%s, input=%s", self.model_name, batch_texts)
+
+        # 调用API获取嵌入向量
+        response = self.client.embeddings.create(
+            model=self.model_name,
+            input=batch_texts,
+            timeout=self.request_timeout,
+        )
+
+        # 提取嵌入向量
+        vectors = np.asarray([data.embedding for data in response.data], dtype=np.float32)
+        return start, vectors
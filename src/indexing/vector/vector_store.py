@@ -1,6 +1,7 @@
 import faiss
 import numpy as np
 import logging
+import os
 import pickle
 from typing import List, Dict, Any, Optional
 
@@ -8,33 +9,190 @@ from typing import List, Dict, Any, Optional
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-FILTERED_SEARCH_MULTIPLIER = 50
-FILTERED_SEARCH_MIN_CANDIDATES = 300
-FILTERED_SEARCH_FALLBACK_MULTIPLIER = 200
-FILTERED_SEARCH_FALLBACK_MIN_CANDIDATES = 3000
+# 向量数达到该阈值后由精确的Flat索引切换为HNSW近似索引（小库保持精确检索）
+HNSW_MIN_VECTORS = 100000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+HNSW_EF_PER_RESULT = 4  # efSearch至少取k的该倍数，较大top_k时保持召回
+# 支持的索引类型，见VectorStore.__init__的index_type参数
+INDEX_TYPES = ("auto", "flat", "hnsw", "sq8")
+# 无过滤检索时按不可检索分块数多取候选；超过top_k的该倍数时改为在Faiss内排除这些分块
+MAX_EXCLUDED_OVERFETCH = 10
 
 
 class VectorStore:
     """向量存储类 - 使用Faiss进行高效向量相似性搜索"""
     
-    def __init__(self, dimension: int, metric_type: int = faiss.METRIC_INNER_PRODUCT):
+    def __init__(self, dimension: int, metric_type: int = faiss.METRIC_INNER_PRODUCT, index_type: str = "auto"):
         """
         初始化向量存储
         :param dimension: 向量的维度
         :param metric_type: 相似性度量类型
+        :param index_type: 索引类型，flat=精确检索，hnsw=HNSW近似检索，sq8=int8标量量化（内存约为flat的1/4），
+                           auto=向量数达到HNSW_MIN_VECTORS后切换为hnsw
         """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"不支持的向量索引类型: {index_type}")
         self.dimension = dimension
         self.metric_type = metric_type
-        # 使用Faiss的内积索引（适合归一化向量的余弦相似度）
-        self.index = faiss.IndexFlatIP(dimension)
+        self.index_type = index_type
+        # 默认使用Faiss的内积索引（适合归一化向量的余弦相似度）
+        self.index = self._create_index(index_type)
         self.documents = []  # 存储文档信息
         self.is_normalized = False  # 标记向量是否已归一化
-        logger.info(f"向量存储初始化完成，维度: {dimension}")
+        self._index_mapped = False  # 索引向量是否为mmap映射的只读视图
+        self._mapped_index_path: Optional[str] = None  # mmap映射的索引文件路径
+        # chunk_id/doc_id -> documents下标的查找表，首次查询时构建，documents下标变化时失效
+        self._chunk_id_to_idx: Optional[Dict[Any, int]] = None
+        self._doc_id_to_indices: Optional[Dict[Any, List[int]]] = None
+        self._excluded_total: Optional[int] = None  # 不可检索分块数缓存
+        # 过滤检索用的倒排表：字段 -> 取值 -> 可检索分块的向量ID数组（升序），首次过滤检索时构建
+        self._filter_indexes: Optional[Dict[Any, Dict[Any, np.ndarray]]] = None
+        self._searchable_ids: Optional[np.ndarray] = None  # 全部可检索分块的向量ID
+        self._searchable_selector = None  # 基于_searchable_ids的IDSelector，供无过滤检索复用
+        logger.info(f"向量存储初始化完成，维度: {dimension}, 索引类型: {index_type}")
+
+    def _create_index(self, index_type: str):
+        # 与Flat索引一致，HNSW/SQ8同样按内积度量
+        if index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            return index
+        if index_type == "sq8":
+            index = faiss.IndexScalarQuantizer(
+                self.dimension, faiss.ScalarQuantizer.QT_8bit_uniform, faiss.METRIC_INNER_PRODUCT
+            )
+            # 入库向量均已L2归一化，各分量落在[-1, 1]，直接固定量化区间，无需依赖首批数据训练
+            faiss.copy_array_to_vector(np.array([-1.0, 2.0], dtype='float32'), index.sq.trained)
+            index.is_trained = True
+            return index
+        # flat/auto：auto在向量数达到阈值后由_maybe_switch_to_hnsw迁移
+        return faiss.IndexFlatIP(self.dimension)
+
+    def _maybe_switch_to_hnsw(self):
+        """auto模式下向量数达到阈值时，将Flat索引中的向量迁移到HNSW索引（仅执行一次）"""
+        if self.index_type != "auto" or not isinstance(self.index, faiss.IndexFlat):
+            return
+        if self.index.ntotal < HNSW_MIN_VECTORS:
+            return
+
+        logger.info(f"向量数达到 {self.index.ntotal}，切换为HNSW索引")
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        index = self._create_index("hnsw")
+        index.add(vectors)
+        self.index = index
+
+    def _search_index(self, query_array: np.ndarray, k: int, allowed_ids: Optional[np.ndarray] = None, selector=None):
+        """
+        执行Faiss检索
+        :param allowed_ids: 仅在这些向量ID中检索（IDSelector在Faiss内部跳过其余向量），None表示不限制
+        :param selector: 与allowed_ids对应的已构建IDSelector，未传入时按allowed_ids构建
+        """
+        if selector is None and allowed_ids is not None:
+            selector = faiss.IDSelectorBatch(allowed_ids)
+        if isinstance(self.index, faiss.IndexHNSW):
+            # efSearch须不小于k才能返回足够的候选；按次传参，避免并发检索互相修改索引状态。
+            # 带过滤时图遍历中只有约 len(allowed_ids)/ntotal 的节点可入选，按该比例放大efSearch
+            ef_search = max(HNSW_EF_SEARCH, k * HNSW_EF_PER_RESULT)
+            if allowed_ids is not None:
+                ef_search = min(self.index.ntotal, ef_search * self.index.ntotal // max(1, len(allowed_ids)))
+            params = faiss.SearchParametersHNSW(efSearch=ef_search)
+        elif selector is not None:
+            params = faiss.SearchParameters()
+        else:
+            return self.index.search(query_array, k)
+        if selector is not None:
+            params.sel = selector
+        return self.index.search(query_array, k, params=params)
+
+    def _ensure_filter_indexes(self):
+        """
+        一次扫描documents，构建可检索分块ID及各过滤字段的倒排表，缓存至documents变化
+        """
+        if self._filter_indexes is not None:
+            return
+        searchable: List[int] = []
+        buckets: Dict[Any, Dict[Any, List[int]]] = {'doc_type': {}, 'title': {}, 'knowledge_labels': {True: []}}
+        for idx, doc in enumerate(self.documents):
+            if not self._is_search_candidate(doc, None, None, None):
+                continue
+            searchable.append(idx)
+            buckets['doc_type'].setdefault(doc.get('doc_type'), []).append(idx)
+            buckets['title'].setdefault(doc.get('title'), []).append(idx)
+            raw_labels = doc.get('knowledge_labels', {}) or {}
+            if not isinstance(raw_labels, dict):
+                continue
+            buckets['knowledge_labels'][True].append(idx)
+            for key, current in raw_labels.items():
+                # 取值的规整方式与_matches_knowledge_filters一致
+                if isinstance(current, list):
+                    values = {str(item or '').strip() for item in current}
+                elif current is None:
+                    continue
+                else:
+                    values = {str(current).strip()}
+                values.discard('')
+                label_bucket = buckets.setdefault(('knowledge_labels', key), {})
+                for value in values:
+                    label_bucket.setdefault(value, []).append(idx)
+
+        self._searchable_ids = np.array(searchable, dtype=np.int64)
+        self._filter_indexes = {
+            field: {value: np.array(ids, dtype=np.int64) for value, ids in values.items()}
+            for field, values in buckets.items()
+        }
+
+    def _lookup_ids(self, field: Any, values) -> np.ndarray:
+        """返回字段取任一给定值的可检索分块ID（升序去重）"""
+        bucket = self._filter_indexes.get(field, {})
+        arrays = [bucket[value] for value in dict.fromkeys(values) if value in bucket]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.unique(np.concatenate(arrays))
+
+    def _filtered_ids(
+        self,
+        doc_types: Optional[List[str]],
+        titles: Optional[List[str]],
+        knowledge_filters: Optional[Dict[str, List[str]]],
+    ) -> np.ndarray:
+        """返回满足状态与过滤条件的向量ID（即documents下标），由缓存的倒排表求交集得到"""
+        self._ensure_filter_indexes()
+        ids = self._searchable_ids
+        conditions = []
+        if doc_types:
+            conditions.append(('doc_type', doc_types))
+        if titles:
+            conditions.append(('title', titles))
+        if knowledge_filters:
+            # 与_matches_knowledge_filters一致：给出过滤条件时，标签格式异常的分块不参与检索
+            conditions.append(('knowledge_labels', [True]))
+        for raw_key, raw_expected in (knowledge_filters or {}).items():
+            key = str(raw_key or '').strip()
+            expected = [str(item or '').strip() for item in (raw_expected or []) if str(item or '').strip()]
+            if key and expected:
+                conditions.append((('knowledge_labels', key), expected))
+
+        for field, values in conditions:
+            if not len(ids):
+                break
+            ids = np.intersect1d(ids, self._lookup_ids(field, values), assume_unique=True)
+        return ids
+
+    def _searchable_ids_selector(self):
+        """返回全部可检索分块的ID数组及对应的IDSelector，缓存至documents变化"""
+        self._ensure_filter_indexes()
+        if self._searchable_selector is None and len(self._searchable_ids):
+            self._searchable_selector = faiss.IDSelectorBatch(self._searchable_ids)
+        return self._searchable_ids, self._searchable_selector
     
-    def add_embeddings(self, embeddings: List[List[float]], documents: List[Dict[str, Any]]):
+    def add_embeddings(self, embeddings: np.ndarray, documents: List[Dict[str, Any]]):
         """
         添加嵌入向量到向量库
-        :param embeddings: 嵌入向量列表
+        :param embeddings: 嵌入矩阵 (n, dimension)，float32时不会产生拷贝
         :param documents: 对应的文档信息列表
         """
         # 验证嵌入向量数量与文档数量是否一致
@@ -43,8 +201,8 @@ class VectorStore:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
-        # 将嵌入向量转换为numpy数组
-        embeddings_array = np.array(embeddings).astype('float32')
+        # 转换为连续的float32数组（已是float32 ndarray时直接复用）
+        embeddings_array = np.ascontiguousarray(embeddings, dtype='float32')
         
         # 如果使用内积作为距离度量，需要对向量进行L2归一化
         if self.metric_type == faiss.METRIC_INNER_PRODUCT:
@@ -52,11 +210,36 @@ class VectorStore:
             self.is_normalized = True
         
         # 添加到Faiss索引
+        self._ensure_writable_index()
         self.index.add(embeddings_array)
+        self._maybe_switch_to_hnsw()
         
         # 保存文档信息
+        start = len(self.documents)
         self.documents.extend(documents)
+        self._index_documents(start)
+        self._invalidate_search_filters()
     
+    @classmethod
+    def _is_search_candidate(
+        cls,
+        doc: Dict[str, Any],
+        doc_types: Optional[List[str]],
+        titles: Optional[List[str]],
+        knowledge_filters: Optional[Dict[str, List[str]]],
+    ) -> bool:
+        if doc.get('status') == 'deleted':
+            return False
+        if doc.get('searchable') is False:
+            return False
+        if not doc.get('text'):
+            return False
+        if doc_types and doc.get('doc_type') not in doc_types:
+            return False
+        if titles and doc.get('title') not in titles:
+            return False
+        return cls._matches_knowledge_filters(doc, knowledge_filters)
+
     @staticmethod
     def _matches_knowledge_filters(doc: Dict[str, Any], knowledge_filters: Optional[Dict[str, List[str]]]) -> bool:
         if not knowledge_filters:
@@ -106,19 +289,6 @@ class VectorStore:
     ) -> bool:
         return bool(doc_types or titles or cls._has_effective_knowledge_filters(knowledge_filters))
 
-    @staticmethod
-    def _candidate_limits(top_k: int, total: int, has_post_filters: bool) -> List[int]:
-        if total <= 0:
-            return []
-
-        safe_top_k = max(1, int(top_k or 1))
-        if not has_post_filters:
-            return [min(max(safe_top_k * 10, safe_top_k), total)]
-
-        initial = min(max(safe_top_k * FILTERED_SEARCH_MULTIPLIER, FILTERED_SEARCH_MIN_CANDIDATES), total)
-        fallback = min(max(safe_top_k * FILTERED_SEARCH_FALLBACK_MULTIPLIER, FILTERED_SEARCH_FALLBACK_MIN_CANDIDATES), total)
-        return list(dict.fromkeys([initial, fallback]))
-
     def _filter_search_results(
         self,
         scores,
@@ -135,20 +305,7 @@ class VectorStore:
                 continue
 
             doc = self.documents[idx]
-
-            if doc.get('status') == 'deleted':
-                continue
-            if doc.get('searchable') is False:
-                continue
-            if not doc.get('text'):
-                continue
-
-            if doc_types and doc.get('doc_type') not in doc_types:
-                continue
-
-            if titles and doc.get('title') not in titles:
-                continue
-            if not self._matches_knowledge_filters(doc, knowledge_filters):
+            if not self._is_search_candidate(doc, doc_types, titles, knowledge_filters):
                 continue
 
             results.append({
@@ -186,55 +343,51 @@ class VectorStore:
             return []
 
         # 将查询向量转换为numpy数组
-        query_array = np.array([query_embedding]).astype('float32')
+        query_array = np.array([query_embedding], dtype=np.float32)
         
         # 如果使用内积度量，需要对查询向量也进行归一化
         if self.metric_type == faiss.METRIC_INNER_PRODUCT:
             faiss.normalize_L2(query_array)
 
-        has_post_filters = self._has_post_filters(doc_types, titles, knowledge_filters)
-        candidate_limits = self._candidate_limits(safe_top_k, self.index.ntotal, has_post_filters)
-        results: List[Dict[str, Any]] = []
-        used_limit = 0
-
-        for idx, candidate_limit in enumerate(candidate_limits):
-            used_limit = candidate_limit
-            scores, indices = self.index.search(query_array, candidate_limit)
-            results = self._filter_search_results(
-                scores=scores,
-                indices=indices,
-                top_k=safe_top_k,
-                doc_types=doc_types,
-                titles=titles,
-                knowledge_filters=knowledge_filters,
-            )
-
-            if len(results) >= safe_top_k or candidate_limit >= self.index.ntotal:
-                break
-
-            logger.info(
-                "过滤后向量检索结果不足，扩大候选池重试: matched=%s top_k=%s candidate_count=%s next_candidate_count=%s doc_types=%s titles=%s knowledge_filters=%s",
-                len(results),
-                safe_top_k,
-                candidate_limit,
-                candidate_limits[idx + 1] if idx + 1 < len(candidate_limits) else candidate_limit,
-                doc_types,
-                titles,
-                knowledge_filters,
-            )
-
-        if has_post_filters:
+        if self._has_post_filters(doc_types, titles, knowledge_filters):
+            # 过滤条件下推到Faiss：只在满足条件的向量中检索，不再扩大候选池后逐条过滤
+            allowed_ids = self._filtered_ids(doc_types, titles, knowledge_filters)
+            results: List[Dict[str, Any]] = []
+            if len(allowed_ids):
+                scores, indices = self._search_index(query_array, min(safe_top_k, len(allowed_ids)), allowed_ids)
+                results = self._filter_search_results(
+                    scores=scores,
+                    indices=indices,
+                    top_k=safe_top_k,
+                    doc_types=doc_types,
+                    titles=titles,
+                    knowledge_filters=knowledge_filters,
+                )
             logger.info(
                 "向量检索过滤统计: matched=%s top_k=%s candidate_count=%s index_total=%s doc_types=%s titles=%s knowledge_filters=%s",
                 len(results),
                 safe_top_k,
-                used_limit,
+                len(allowed_ids),
                 self.index.ntotal,
                 doc_types,
                 titles,
                 knowledge_filters,
             )
-
+            return results
+
+        # 无过滤条件时按不可检索分块数多取候选（精确索引下保证凑满top_k）；
+        # 不可检索分块过多时改为在Faiss内排除，避免候选数随之膨胀
+        excluded = self._excluded_count()
+        if excluded > safe_top_k * MAX_EXCLUDED_OVERFETCH:
+            allowed_ids, selector = self._searchable_ids_selector()
+            if not len(allowed_ids):
+                return []
+            scores, indices = self._search_index(
+                query_array, min(safe_top_k, len(allowed_ids)), allowed_ids, selector
+            )
+        else:
+            scores, indices = self._search_index(query_array, min(safe_top_k + excluded, self.index.ntotal))
+        results = self._filter_search_results(scores=scores, indices=indices, top_k=safe_top_k)
         return results[:safe_top_k]
     
     def save(self, filepath: str):
@@ -242,64 +395,155 @@ class VectorStore:
         保存向量库到文件
         :param filepath: 保存路径（不包含扩展名）
         """
-        # 保存Faiss索引
-        faiss.write_index(self.index, f"{filepath}.index")
+        # 先写临时文件再原子替换，避免写入中途失败留下损坏的索引/文档文件
+        # 保存Faiss索引：仍处于mmap映射状态说明索引自加载后未被修改，写回原文件时跳过，
+        # 避免替换本进程正在映射的文件（Windows下会因文件占用而失败）
+        index_path = f"{filepath}.index"
+        if not (self._index_mapped and self._is_mapped_index_path(index_path)):
+            faiss.write_index(self.index, f"{index_path}.tmp")
+            os.replace(f"{index_path}.tmp", index_path)
         
         # 保存文档信息
-        with open(f"{filepath}.docs", 'wb') as f:
-            pickle.dump(self.documents, f)
+        with open(f"{filepath}.docs.tmp", 'wb') as f:
+            pickle.dump(self.documents, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{filepath}.docs.tmp", f"{filepath}.docs")
     
     def load(self, filepath: str):
         """
         从文件加载向量库
         :param filepath: 加载路径（不包含扩展名）
         """
-        # 加载Faiss索引
-        self.index = faiss.read_index(f"{filepath}.index")
+        # 加载Faiss索引：优先以mmap方式映射向量数据，加载不再整体拷贝进内存，由操作系统按需分页
+        self.index, self._index_mapped = self._read_index(f"{filepath}.index")
+        self._mapped_index_path = os.path.abspath(f"{filepath}.index") if self._index_mapped else None
         
         # 加载文档信息
         with open(f"{filepath}.docs", 'rb') as f:
             self.documents = pickle.load(f)
+        self.invalidate_lookup()
         # 兼容历史数据：内积模式下默认视为已归一化
         if self.metric_type == faiss.METRIC_INNER_PRODUCT:
             self.is_normalized = True
     
+    @staticmethod
+    def _read_index(index_path: str):
+        """
+        读取Faiss索引文件
+        :param index_path: 索引文件路径
+        :return: (索引, 是否为mmap映射)
+        """
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+        if mmap_flag is not None:
+            try:
+                return faiss.read_index(index_path, mmap_flag), True
+            except Exception as e:
+                logger.warning(f"mmap方式加载索引失败，改为完整读取: {e}")
+        return faiss.read_index(index_path), False
+
+    def _is_mapped_index_path(self, index_path: str) -> bool:
+        return (
+            self._mapped_index_path is not None
+            and os.path.normcase(os.path.abspath(index_path)) == os.path.normcase(self._mapped_index_path)
+        )
+
+    def _ensure_writable_index(self):
+        """
+        mmap映射的向量为只读视图，直接add/remove_ids会触发Faiss断言导致进程退出；
+        首次修改前将索引复制为自有内存
+        """
+        if self._index_mapped:
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self._index_mapped = False
+
+    def invalidate_lookup(self):
+        """
+        使chunk_id/doc_id查找表、不可检索分块计数及过滤倒排表失效，下次查询时重建
+        外部直接修改documents中的chunk_id/doc_id/text等字段后需调用
+        """
+        self._chunk_id_to_idx = None
+        self._doc_id_to_indices = None
+        self._invalidate_search_filters()
+
+    def _invalidate_search_filters(self):
+        """使不可检索分块计数及过滤倒排表失效（分块增删或状态变化后调用）"""
+        self._excluded_total = None
+        self._filter_indexes = None
+        self._searchable_ids = None
+        self._searchable_selector = None
+
+    def _excluded_count(self) -> int:
+        """
+        统计不参与检索（已删除/不可检索/空文本）的分块数，缓存至documents变化
+        """
+        if self._excluded_total is None:
+            self._excluded_total = sum(
+                1 for doc in self.documents if not self._is_search_candidate(doc, None, None, None)
+            )
+        return self._excluded_total
+
+    def _index_documents(self, start: int):
+        """
+        将documents[start:]登记到查找表；查找表尚未构建时跳过
+        :param start: 起始下标
+        """
+        if self._chunk_id_to_idx is None:
+            return
+        chunk_id_to_idx = self._chunk_id_to_idx
+        doc_id_to_indices = self._doc_id_to_indices
+        for idx in range(start, len(self.documents)):
+            doc = self.documents[idx]
+            # chunk_id重复时保留第一个，与顺序扫描的返回结果一致
+            chunk_id_to_idx.setdefault(doc.get('chunk_id'), idx)
+            doc_id_to_indices.setdefault(doc.get('doc_id'), []).append(idx)
+
+    def _ensure_lookup(self):
+        if self._chunk_id_to_idx is None:
+            self._chunk_id_to_idx = {}
+            self._doc_id_to_indices = {}
+            self._index_documents(0)
+
     def get_document_chunks(self, doc_id: str) -> List[Dict]:
         """
         获取指定文档的所有分块
         :param doc_id: 文档ID
         :return: 分块信息列表
         """
+        self._ensure_lookup()
         chunks = []
         doc_chunk_index = 0
-        for global_idx, doc in enumerate(self.documents):
-            if doc.get('doc_id') == doc_id:
-                chunk_index = doc.get('chunk_index')
-                if chunk_index is None:
-                    chunk_index = doc_chunk_index
-                try:
-                    chunk_index = int(chunk_index)
-                except (TypeError, ValueError):
-                    chunk_index = doc_chunk_index
-
-                chunk_info = {
-                    'chunk_index': chunk_index,
-                    'chunk_id': doc.get('chunk_id', f'{doc_id}_chunk_{doc_chunk_index}'),
-                    'text': doc.get('text', ''),
-                    'text_preview': doc.get('text', '')[:200] + '...' if len(doc.get('text', '')) > 200 else doc.get('text', ''),
-                    'char_count': len(doc.get('text', '')),
-                    'global_index': global_idx,
-                    'metadata': {
-                        'filename': doc.get('filename', ''),
-                        'doc_type': doc.get('doc_type', ''),
-                        'page_nos': doc.get('page_nos', []),
-                        'header': doc.get('header', ''),
-                        'section_path': doc.get('section_path', []),
-                        'semantic_boundary': doc.get('semantic_boundary', ''),
-                    }
+        for global_idx in self._doc_id_to_indices.get(doc_id, ()):
+            doc = self.documents[global_idx]
+            # HNSW索引的标记删除分块不再属于该文档
+            if doc.get('status') == 'deleted':
+                continue
+            chunk_index = doc.get('chunk_index')
+            if chunk_index is None:
+                chunk_index = doc_chunk_index
+            try:
+                chunk_index = int(chunk_index)
+            except (TypeError, ValueError):
+                chunk_index = doc_chunk_index
+
+            text = doc.get('text', '')
+            char_count = len(text)
+            chunk_info = {
+                'chunk_index': chunk_index,
+                'chunk_id': doc.get('chunk_id', f'{doc_id}_chunk_{doc_chunk_index}'),
+                'text': text,
+                'text_preview': text[:200] + '...' if char_count > 200 else text,
+                'char_count': char_count,
+                'global_index': global_idx,
+                'metadata': {
+                    'filename': doc.get('filename', ''),
+                    'doc_type': doc.get('doc_type', ''),
+                    'page_nos': doc.get('page_nos', []),
+                    'header': doc.get('header', ''),
+                    'section_path': doc.get('section_path', []),
+                    'semantic_boundary': doc.get('semantic_boundary', ''),
                 }
-                chunks.append(chunk_info)
-                doc_chunk_index += 1
+            }
+            chunks.append(chunk_info)
+            doc_chunk_index += 1
         return chunks
     
     def get_chunk_by_id(self, chunk_id: str) -> Optional[Dict]:
@@ -308,10 +552,9 @@ class VectorStore:
         :param chunk_id: 分块ID
         :return: 分块信息
         """
-        for doc in self.documents:
-            if doc.get('chunk_id') == chunk_id:
-                return doc
-        return None
+        self._ensure_lookup()
+        idx = self._chunk_id_to_idx.get(chunk_id)
+        return self.documents[idx] if idx is not None else None
     
     def remove_document_chunks(self, doc_id: str) -> int:
         """
@@ -321,10 +564,8 @@ class VectorStore:
         :return: 删除的chunk数量
         """
         # 找到需要删除的索引
-        indices_to_remove = []
-        for idx, doc in enumerate(self.documents):
-            if doc.get('doc_id') == doc_id:
-                indices_to_remove.append(idx)
+        self._ensure_lookup()
+        indices_to_remove = list(self._doc_id_to_indices.get(doc_id, ()))
         
         if not indices_to_remove:
             return 0
@@ -335,26 +576,39 @@ class VectorStore:
     
     def _rebuild_index(self, exclude_indices: List[int]):
         """
-        重建Faiss索引（排除指定索引）
-        注意：这会丢失原始向量，需要从原始文档重新生成
-        这里仅做标记删除，实际重建需要重新处理文档
+        从Faiss索引中移除指定下标的向量
+        Flat/SQ8索引真正删除向量并同步压缩documents；HNSW索引不支持删除，仍采用标记删除
         """
+        exclude = set(exclude_indices)
         # 保留的文档
-        keep_indices = [i for i in range(len(self.documents)) if i not in exclude_indices]
+        keep_indices = [i for i in range(len(self.documents)) if i not in exclude]
         
         if not keep_indices:
             # 全部删除，重置
-            self.index = faiss.IndexFlatIP(self.dimension)
+            self.index = self._create_index(self.index_type)
+            self._index_mapped = False
             self.documents = []
+            self.invalidate_lookup()
             logger.info("向量库已清空")
             return
+
+        if not isinstance(self.index, faiss.IndexHNSW):
+            # 顺带清理历史遗留的标记删除分块；remove_ids后其余向量按原顺序前移，与按相同下标压缩后的documents一一对应
+            exclude.update(i for i, doc in enumerate(self.documents) if doc.get('status') == 'deleted')
+            self._ensure_writable_index()
+            self.index.remove_ids(faiss.IDSelectorBatch(np.fromiter(sorted(exclude), dtype=np.int64)))
+            self.documents = [doc for i, doc in enumerate(self.documents) if i not in exclude]
+            self.invalidate_lookup()
+            logger.info(f"已从向量索引删除 {len(exclude)} 个chunks，剩余 {self.index.ntotal} 个")
+            return
         
-        # 由于Faiss不支持删除，这里采用标记删除策略
+        # HNSW不支持删除，这里采用标记删除策略
         # 将被删除的文档文本置空，保留索引结构
         for idx in exclude_indices:
             if idx < len(self.documents):
                 self.documents[idx]['text'] = ''
                 self.documents[idx]['status'] = 'deleted'
+        self._invalidate_search_filters()
         
         logger.info(f"已标记删除 {len(exclude_indices)} 个chunks")
     
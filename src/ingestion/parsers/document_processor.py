@@ -1,10 +1,36 @@
+import codecs
+import hashlib
+import json
+import mmap
 import os
 import logging
+import multiprocessing
 import re
-from typing import Dict, Any, List, Optional, Set
+import shutil
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Tuple
 from docx import Document
+from docx.oxml.ns import qn
+from lxml import etree
 import pdfplumber
-import chardet
+from pdfminer.pdftypes import resolve1
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:  # pragma: no cover - optional dependency
+    detect_charset = None
+
+try:
+    from cchardet import UniversalDetector
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        from chardet.universaldetector import UniversalDetector
+    except ImportError:
+        UniversalDetector = None
 
 try:
     import fitz
@@ -41,8 +67,49 @@ class DocumentProcessor:
     PDF_GARBLED_CID_THRESHOLD = 5
     PDF_GARBLED_INVALID_RATIO = 0.35
     PDF_GARBLED_EXTENDED_LATIN_RATIO = 0.25
+    _ENCODING_SAMPLE_BYTES = 65536
+    _ENCODING_CHUNK_BYTES = 16384
+    # 解析结果磁盘缓存目录（按文件内容哈希），设为None可关闭；解析逻辑变化导致输出不同时递增版本号使旧缓存失效
+    PARSED_CACHE_DIR: Optional[str] = "./data/parsed_cache"
+    PARSED_CACHE_VERSION = 1
+    # 解析缓存的容量与过期时间上限：写入新缓存后清理过期项，超出容量时按最近使用时间淘汰
+    PARSED_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+    PARSED_CACHE_TTL_SECONDS = 30 * 24 * 3600
+    _HASH_READ_BYTES = 1 << 20
+    # PyMuPDF文本提取按页段分给多个进程：每个进程至少分到的页数，以及进程数上限
+    PDF_PARALLEL_MIN_PAGES_PER_WORKER = 64
+    PDF_PARALLEL_MAX_WORKERS = 4
+    # 直接解析DOCX正文XML所用的解析器与标签名；解析器设置与python-docx一致（不解析外部实体）
+    _DOCX_XML_PARSER = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+    _W_BODY = qn('w:body')
+    _W_P = qn('w:p')
+    _W_R = qn('w:r')
+    _W_HYPERLINK = qn('w:hyperlink')
+    _W_T = qn('w:t')
+    _W_BR = qn('w:br')
+    _W_TYPE = qn('w:type')
+    # run内各内容元素对应的文本（w:t 取自身文本，w:br 视类型而定）
+    _DOCX_RUN_CONTENT_TEXT = {
+        qn('w:t'): None,
+        qn('w:br'): None,
+        qn('w:cr'): "\n",
+        qn('w:noBreakHyphen'): "-",
+        qn('w:ptab'): "\t",
+        qn('w:tab'): "\t",
+    }
     _ocr_engine = None
     _ocr_engine_initialized = False
+    # 按文件类型分派的解析函数，参数为 (文件路径, 文档类型, 入库规则, 表格行收集列表)；新增格式只需在此登记
+    _LOADERS: Dict[str, Callable[[str, str, Optional[str], Optional[List[List[str]]]], str]] = {
+        'pdf': lambda file_path, doc_type, ingest_profile, row_collector: DocumentProcessor._load_pdf(
+            file_path,
+            is_audit_issue=(doc_type == 'audit_issue'),
+            ingest_profile=ingest_profile,
+            row_collector=row_collector,
+        ),
+        'docx': lambda file_path, doc_type, ingest_profile, row_collector: DocumentProcessor._load_docx(file_path),
+        'txt': lambda file_path, doc_type, ingest_profile, row_collector: DocumentProcessor._load_txt(file_path),
+    }
 
     @staticmethod
     def detect_file_type(file_path: str) -> str:
@@ -79,48 +146,315 @@ class DocumentProcessor:
         doc_type: str = 'default',
         source_name: str = "",
         ingest_profile: Optional[str] = None,
+        force_refresh: bool = False,
+        row_collector: Optional[List[List[str]]] = None,
+        file_type: Optional[str] = None,
+        cache_key_collector: Optional[List[str]] = None,
     ) -> str:
         """
-        根据文件类型加载文档内容
+        根据文件类型加载文档内容（解析结果按文件内容缓存到磁盘，相同文件再次加载时不再重复解析）
         :param file_path: 文件路径
         :param doc_type: 文档类型，审计问题类型会特殊处理表格
+        :param force_refresh: 忽略已有缓存，重新解析并覆盖缓存
+        :param row_collector: 审计问题表格行收集列表（每行为单元格列表），分块时直接使用，无需从文本中回切
+        :param file_type: 调用方已检测出的文件类型（如按原始文件名检测），传入后不再按路径重复检测
+        :param cache_key_collector: 解析缓存键收集列表，记录到文档元数据后删除文档时可一并清理缓存
         :return: 文档文本内容
         """
-        file_type = DocumentProcessor.detect_file_type(file_path)
+        file_type = file_type or DocumentProcessor.detect_file_type(file_path)
         logger.info(f"检测到文件类型: {file_type}，文件路径: {file_path}")
-        effective_profile = ingest_profile or DocumentProcessor.detect_ingest_profile(source_name or file_path, source_name)
-        
-        if file_type == 'pdf':
-            return DocumentProcessor._load_pdf(
-                file_path,
-                is_audit_issue=(doc_type == 'audit_issue'),
-                ingest_profile=effective_profile,
-            )
-        elif file_type == 'docx':
-            return DocumentProcessor._load_docx(file_path)
-        elif file_type == 'txt':
-            return DocumentProcessor._load_txt(file_path)
-        else:
+        if file_type not in DocumentProcessor._LOADERS:
             raise ValueError(f"不支持的文件类型: {file_type}")
+        effective_profile = ingest_profile or DocumentProcessor.detect_ingest_profile(source_name or file_path, source_name)
+
+        cache_path = DocumentProcessor._parsed_cache_path(file_path, file_type, doc_type, effective_profile)
+        if cache_path and cache_key_collector is not None:
+            cache_key_collector.append(DocumentProcessor._parsed_cache_key(cache_path))
+        if cache_path and not force_refresh:
+            try:
+                with open(cache_path, 'r', encoding='utf-8', newline='') as f:
+                    content = f.read()
+                logger.info(f"命中文档解析缓存: {file_path}")
+                DocumentProcessor._touch_parsed_cache(cache_path)
+                if row_collector is not None:
+                    row_collector.extend(DocumentProcessor._read_parsed_rows_cache(cache_path))
+                return content
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"读取文档解析缓存失败: {e}")
+
+        rows: List[List[str]] = []
+        content = DocumentProcessor._parse_document(file_path, file_type, doc_type, effective_profile, rows)
+        # 未提取到有效文本时不缓存（如扫描件），便于补装OCR依赖后重新解析
+        if cache_path and DocumentProcessor.has_meaningful_text(content):
+            # 先写表格行再写文本：命中文本缓存时表格行缓存必然已就绪
+            if rows:
+                DocumentProcessor._write_parsed_cache(
+                    DocumentProcessor._parsed_rows_cache_path(cache_path),
+                    json.dumps(rows, ensure_ascii=False),
+                )
+            DocumentProcessor._write_parsed_cache(cache_path, content)
+            DocumentProcessor.prune_parsed_cache()
+        if row_collector is not None:
+            row_collector.extend(rows)
+        return content
+
+    @staticmethod
+    def _parsed_cache_path(
+        file_path: str,
+        file_type: str,
+        doc_type: str,
+        ingest_profile: Optional[str],
+    ) -> Optional[str]:
+        """
+        计算解析结果缓存文件路径：对完整文件内容及影响解析结果的参数做哈希
+        :return: 缓存文件路径，未启用缓存或无法读取文件时返回None
+        """
+        cache_dir = DocumentProcessor.PARSED_CACHE_DIR
+        if not cache_dir:
+            return None
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(
+            f"{DocumentProcessor.PARSED_CACHE_VERSION}|{file_type}|{doc_type == 'audit_issue'}|{ingest_profile or ''}|".encode('utf-8')
+        )
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(DocumentProcessor._HASH_READ_BYTES), b''):
+                    hasher.update(block)
+        except OSError as e:
+            logger.warning(f"计算文档解析缓存键失败: {e}")
+            return None
+        return os.path.join(cache_dir, f"{hasher.hexdigest()}.txt")
+
+    @staticmethod
+    def _parsed_rows_cache_path(cache_path: str) -> str:
+        return f"{os.path.splitext(cache_path)[0]}.rows.json"
+
+    @staticmethod
+    def _parsed_cache_key(cache_path: str) -> str:
+        return os.path.splitext(os.path.basename(cache_path))[0]
+
+    @staticmethod
+    def _touch_parsed_cache(cache_path: str) -> None:
+        # 命中时刷新修改时间，容量淘汰按最近使用排序
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def remove_parsed_cache(cache_key: str) -> int:
+        """
+        删除指定缓存键的解析缓存（文本及表格行）
+        :param cache_key: load_document 通过 cache_key_collector 返回的缓存键
+        :return: 删除的文件数
+        """
+        cache_dir = DocumentProcessor.PARSED_CACHE_DIR
+        cache_key = os.path.basename(str(cache_key or "").strip())
+        if not cache_dir or not cache_key:
+            return 0
+        cache_path = os.path.join(cache_dir, f"{cache_key}.txt")
+        removed = 0
+        for path in (cache_path, DocumentProcessor._parsed_rows_cache_path(cache_path)):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"删除文档解析缓存失败: path={path} err={e}")
+        return removed
+
+    @staticmethod
+    def clear_parsed_cache() -> int:
+        """
+        清空解析缓存目录
+        :return: 清除的缓存文档数
+        """
+        cache_dir = DocumentProcessor.PARSED_CACHE_DIR
+        if not cache_dir or not os.path.isdir(cache_dir):
+            return 0
+        removed = sum(1 for name in os.listdir(cache_dir) if name.endswith(".txt"))
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return removed
+
+    @staticmethod
+    def prune_parsed_cache() -> None:
+        """
+        清理过期的解析缓存，总大小超出上限时按最近使用时间淘汰最旧的缓存；
+        同一缓存键的文本与表格行一起删除
+        """
+        cache_dir = DocumentProcessor.PARSED_CACHE_DIR
+        if not cache_dir or not os.path.isdir(cache_dir):
+            return
+        now = time.time()
+        entries: Dict[str, List[Any]] = {}  # 缓存键 -> [最近使用时间, 总大小, 文件路径列表]
+        try:
+            with os.scandir(cache_dir) as it:
+                for item in it:
+                    if not item.is_file() or item.name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    entry = entries.setdefault(item.name.split(".", 1)[0], [0.0, 0, []])
+                    entry[0] = max(entry[0], stat.st_mtime)
+                    entry[1] += stat.st_size
+                    entry[2].append(item.path)
+        except OSError as e:
+            logger.warning(f"扫描文档解析缓存失败: {e}")
+            return
+
+        total_size = sum(entry[1] for entry in entries.values())
+        for last_used, size, paths in sorted(entries.values(), key=lambda entry: entry[0]):
+            if total_size <= DocumentProcessor.PARSED_CACHE_MAX_BYTES and now - last_used <= DocumentProcessor.PARSED_CACHE_TTL_SECONDS:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            total_size -= size
+
+    @staticmethod
+    def _read_parsed_rows_cache(cache_path: str) -> List[List[str]]:
+        """
+        读取解析缓存对应的审计问题表格行
+        :param cache_path: 文本缓存文件路径
+        :return: 表格行列表，无表格行缓存时返回空列表（分块时回退到文本切分）
+        """
+        try:
+            with open(DocumentProcessor._parsed_rows_cache_path(cache_path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.warning(f"读取表格行解析缓存失败: {e}")
+            return []
+
+    @staticmethod
+    def _write_parsed_cache(cache_path: str, content: str) -> None:
+        # 先写临时文件再原子替换；多个解析进程可能同时写同一缓存，临时文件名带上进程号
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"写入文档解析缓存失败: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _parse_document(
+        file_path: str,
+        file_type: str,
+        doc_type: str,
+        ingest_profile: Optional[str],
+        row_collector: Optional[List[List[str]]] = None,
+    ) -> str:
+        loader = DocumentProcessor._LOADERS[file_type]
+        return loader(file_path, doc_type, ingest_profile, row_collector)
     
     @staticmethod
-    def _load_pdf(file_path: str, is_audit_issue: bool = False, ingest_profile: Optional[str] = None) -> str:
+    def _load_pdf(
+        file_path: str,
+        is_audit_issue: bool = False,
+        ingest_profile: Optional[str] = None,
+        row_collector: Optional[List[List[str]]] = None,
+    ) -> str:
         """
         加载PDF文档
+        普通模式优先使用PyMuPDF（MuPDF C实现，远快于pdfminer）提取文本；
+        审计问题模式依赖pdfplumber的表格提取。文本质量较差时切换另一种解析器，最后回退OCR。
         :param file_path: PDF文件路径
         :param is_audit_issue: 是否为审计问题类型（执行表格提取）
+        :param row_collector: 审计问题表格行收集列表，仅在最终采用表格提取结果时写入
         :return: 文档文本内容
         """
         logger.info(f"开始加载PDF文档: {file_path} (审计问题模式: {is_audit_issue})")
-        text_parts = []
+        use_fitz = fitz is not None and not is_audit_issue
+        table_rows: List[List[str]] = []
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                # 普通模式下先收集每页文本，统一做“重复页眉页脚/页码”清洗
-                normal_mode_pages: List[List[str]] = []
+            if use_fitz:
+                full_text = DocumentProcessor._load_pdf_with_fitz_text(file_path, ingest_profile=ingest_profile)
+            else:
+                full_text = DocumentProcessor._load_pdf_with_pdfplumber(
+                    file_path,
+                    is_audit_issue=is_audit_issue,
+                    ingest_profile=ingest_profile,
+                    row_collector=table_rows,
+                )
+            quality = DocumentProcessor._assess_pdf_text_quality(full_text)
+
+            if quality["fallback_to_secondary"]:
+                if use_fitz:
+                    secondary_text = DocumentProcessor._load_pdf_with_pdfplumber(file_path, ingest_profile=ingest_profile)
+                else:
+                    secondary_text = DocumentProcessor._load_pdf_with_fitz_text(file_path, ingest_profile=ingest_profile)
+                secondary_quality = DocumentProcessor._assess_pdf_text_quality(secondary_text)
+                if secondary_quality["is_usable"]:
+                    logger.info(
+                        "%s文本质量较差，已切换%s文本提取: %s | reasons=%s",
+                        "PyMuPDF" if use_fitz else "pdfplumber",
+                        "pdfplumber" if use_fitz else "PyMuPDF",
+                        file_path,
+                        ",".join(quality["reasons"]),
+                    )
+                    full_text = secondary_text
+                    quality = secondary_quality
+                    table_rows = []
+
+            if quality["fallback_to_ocr"]:
+                ocr_text = DocumentProcessor._load_pdf_with_ocr(file_path, ingest_profile=ingest_profile)
+                ocr_quality = DocumentProcessor._assess_pdf_text_quality(ocr_text)
+                if ocr_quality["is_usable"]:
+                    logger.info(
+                        "PDF文本质量较差，已使用OCR回退: %s | reasons=%s",
+                        file_path,
+                        ",".join(quality["reasons"]),
+                    )
+                    full_text = ocr_text
+                    table_rows = []
+            if row_collector is not None:
+                row_collector.extend(table_rows)
+            logger.info(f"PDF文档加载完成，总内容长度: {len(full_text)}")
+            return full_text
+            
+        except Exception as e:
+            logger.error(f"加载PDF文档失败: {e}")
+            raise
 
-                for page_num, page in enumerate(pdf.pages):
+    @staticmethod
+    def _load_pdf_with_pdfplumber(
+        file_path: str,
+        is_audit_issue: bool = False,
+        ingest_profile: Optional[str] = None,
+        row_collector: Optional[List[List[str]]] = None,
+    ) -> str:
+        text_parts = []
+        # 审计问题模式下与文本同步收集的结构化行；未提取到任何表格行时不输出，分块时走文本切分
+        table_rows: List[List[str]] = []
+        has_table_row = False
+        with pdfplumber.open(file_path) as pdf:
+            # 普通模式下先收集每页文本，统一做“重复页眉页脚/页码”清洗
+            normal_mode_pages: List[List[str]] = []
+
+            for page_num, page in enumerate(pdf.pages):
+                try:
                     page_tag = f"[[PAGE:{page_num + 1}]]"
+                    if not DocumentProcessor._pdfplumber_page_may_have_text(page):
+                        # 无字体且无表单XObject的页面（如纯扫描图片页）不可能有文本层，跳过解析
+                        if not is_audit_issue:
+                            normal_mode_pages.append([])
+                        logger.debug(f"PDF第 {page_num + 1} 页无文本层，跳过解析")
+                        continue
                     if is_audit_issue:
                         # 审计问题模式：尝试提取表格
                         tables = page.extract_tables()
@@ -129,26 +463,26 @@ class DocumentProcessor:
                                 # 处理表格行，保持语义配对并继承上下文
                                 current_idx = ""
                                 current_dept = ""
-                                                        
+                                                    
                                 for row in table:
                                     if not row or all(not cell for cell in row):
                                         continue
-                                                            
+                                                        
                                     # 过滤掉表头行
                                     row_content_str = "".join([str(c) for c in row if c])
                                     if any(k in row_content_str for k in ['序号', '问题摘要', '整改情况']):
                                         continue
-                                                            
+                                                        
                                     # 提取并清理单元格
                                     cells = [str(cell).replace('\n', ' ').strip() if cell else "" for cell in row]
-                                                            
+                                                        
                                     if len(cells) >= 4:
                                         idx, dept, issue, rectify = cells[0], cells[1], cells[2], cells[3]
-                                                                
+                                                            
                                         # 更新并继承上下文（序号和部门）
                                         if idx: current_idx = idx
                                         if dept: current_dept = dept
-                                                                
+                                                            
                                         # 只有当问题摘要或整改情况不为空时才生成记录
                                         if issue or rectify:
                                             # 将每一行作为一个独立的 [ROW_START] 标记
@@ -157,11 +491,16 @@ class DocumentProcessor:
                                             if len(cells) > 4:
                                                 row_text += " | " + " | ".join(cells[4:])
                                             text_parts.append(row_text)
+                                            has_table_row = True
+                                            table_rows.append(
+                                                    [f"{page_tag} {current_idx}".strip(), current_dept, issue, rectify, *cells[4:]]
+                                                )
                         else:
                             # 如果没提取到表格，降级使用文本提取
                             page_text = page.extract_text()
                             if page_text:
                                 text_parts.append(f"{page_tag}\n{page_text}")
+                                table_rows.append([f"{page_tag}\n{page_text}".strip()])
                     else:
                         # 普通模式：直接提取文本
                         page_text = page.extract_text()
@@ -171,50 +510,56 @@ class DocumentProcessor:
                         else:
                             normal_mode_pages.append([])
                     logger.debug(f"处理PDF第 {page_num + 1} 页")
+                finally:
+                    # pdfplumber会在页面对象上缓存解析出的字符/版面对象，处理完即释放，
+                    # 内存不再随页数线性增长（此后不会再访问该页，无重复解析开销）
+                    DocumentProcessor._release_pdfplumber_page(page)
+
+            if not is_audit_issue:
+                if ingest_profile == DocumentProcessor.ENTERPRISE_ACCOUNTING_STANDARDS_PROFILE:
+                    normal_mode_pages = DocumentProcessor._strip_leading_toc_pages_for_profile(normal_mode_pages)
+                repeated_header_footer = DocumentProcessor._detect_repeated_header_footer_lines(normal_mode_pages)
+                for page_num, lines in enumerate(normal_mode_pages):
+                    page_tag = f"[[PAGE:{page_num + 1}]]"
+                    cleaned_lines = DocumentProcessor._clean_pdf_page_lines(lines, repeated_header_footer)
+                    if cleaned_lines:
+                        text_parts.append(f"{page_tag}\n" + "\n".join(cleaned_lines))
+                    else:
+                        text_parts.append(page_tag)
 
-                if not is_audit_issue:
-                    if ingest_profile == DocumentProcessor.ENTERPRISE_ACCOUNTING_STANDARDS_PROFILE:
-                        normal_mode_pages = DocumentProcessor._strip_leading_toc_pages_for_profile(normal_mode_pages)
-                    repeated_header_footer = DocumentProcessor._detect_repeated_header_footer_lines(normal_mode_pages)
-                    for page_num, lines in enumerate(normal_mode_pages):
-                        page_tag = f"[[PAGE:{page_num + 1}]]"
-                        cleaned_lines = DocumentProcessor._clean_pdf_page_lines(lines, repeated_header_footer)
-                        if cleaned_lines:
-                            text_parts.append(f"{page_tag}\n" + "\n".join(cleaned_lines))
-                        else:
-                            text_parts.append(page_tag)
-            
-            full_text = "\n".join(text_parts)
-            quality = DocumentProcessor._assess_pdf_text_quality(full_text)
+        if row_collector is not None and has_table_row:
+            row_collector.extend(table_rows)
+        return "\n".join(text_parts)
 
-            if quality["fallback_to_fitz"]:
-                fitz_text = DocumentProcessor._load_pdf_with_fitz_text(file_path, ingest_profile=ingest_profile)
-                fitz_quality = DocumentProcessor._assess_pdf_text_quality(fitz_text)
-                if fitz_quality["is_usable"]:
-                    logger.info(
-                        "pdfplumber文本质量较差，已切换PyMuPDF文本提取: %s | reasons=%s",
-                        file_path,
-                        ",".join(quality["reasons"]),
-                    )
-                    full_text = fitz_text
-                    quality = fitz_quality
+    @staticmethod
+    def _release_pdfplumber_page(page) -> None:
+        """
+        释放pdfplumber页面缓存的解析结果（close()需pdfplumber>=0.10，旧版本退回flush_cache()）
+        :param page: pdfplumber页面对象
+        """
+        close = getattr(page, "close", None) or page.flush_cache
+        close()
 
-            if quality["fallback_to_ocr"]:
-                ocr_text = DocumentProcessor._load_pdf_with_ocr(file_path, ingest_profile=ingest_profile)
-                ocr_quality = DocumentProcessor._assess_pdf_text_quality(ocr_text)
-                if ocr_quality["is_usable"]:
-                    logger.info(
-                        "PDF文本质量较差，已使用OCR回退: %s | reasons=%s",
-                        file_path,
-                        ",".join(quality["reasons"]),
-                    )
-                    full_text = ocr_text
-            logger.info(f"PDF文档加载完成，总内容长度: {len(full_text)}")
-            return full_text
-            
-        except Exception as e:
-            logger.error(f"加载PDF文档失败: {e}")
-            raise
+    @staticmethod
+    def _pdfplumber_page_may_have_text(page) -> bool:
+        """
+        保守判断页面是否可能包含文本：资源中有字体或表单XObject即视为可能有文本
+        :param page: pdfplumber页面对象
+        :return: 只有确定没有文本层时才返回False
+        """
+        try:
+            resources = resolve1(page.page_obj.resources) or {}
+            if resolve1(resources.get("Font")):
+                return True
+            xobjects = resolve1(resources.get("XObject")) or {}
+            for xobj_ref in xobjects.values():
+                xobj = resolve1(xobj_ref)
+                subtype = xobj.get("Subtype") if hasattr(xobj, "get") else None
+                if getattr(subtype, "name", subtype) != "Image":
+                    return True
+            return False
+        except Exception:  # noqa: BLE001
+            return True
 
     @classmethod
     def _get_ocr_engine(cls):
@@ -281,17 +626,18 @@ class DocumentProcessor:
         if fitz is None:
             return ""
 
-        normal_mode_pages: List[List[str]] = []
         try:
             with fitz.open(file_path) as pdf:
-                for page_num in range(pdf.page_count):
-                    page = pdf.load_page(page_num)
-                    page_text = page.get_text("text")
-                    if page_text:
-                        lines = DocumentProcessor._normalize_pdf_lines(page_text.splitlines())
-                        normal_mode_pages.append(lines)
-                    else:
-                        normal_mode_pages.append([])
+                page_count = pdf.page_count
+            workers = DocumentProcessor._pdf_page_worker_count(page_count)
+            if workers > 1:
+                # 各页相互独立：按连续页段分给子进程，每个进程单独打开文档（PyMuPDF文档对象不可跨线程/进程共享）
+                bounds = [page_count * i // workers for i in range(workers + 1)]
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    segments = executor.map(_extract_fitz_page_lines, repeat(file_path), bounds[:-1], bounds[1:])
+                    normal_mode_pages = [lines for segment in segments for lines in segment]
+            else:
+                normal_mode_pages = _extract_fitz_page_lines(file_path, 0, page_count)
 
             if ingest_profile == DocumentProcessor.ENTERPRISE_ACCOUNTING_STANDARDS_PROFILE:
                 normal_mode_pages = DocumentProcessor._strip_leading_toc_pages_for_profile(normal_mode_pages)
@@ -310,6 +656,22 @@ class DocumentProcessor:
             logger.warning("PyMuPDF文本提取失败: %s | %s", file_path, exc)
             return ""
 
+    @staticmethod
+    def _pdf_page_worker_count(page_count: int) -> int:
+        """
+        计算PDF按页并行提取的进程数
+        已在子进程中（如多文件上传的解析进程池）时不再嵌套进程池，避免进程数超过CPU核数
+        :param page_count: PDF页数
+        :return: 进程数，1表示在当前进程串行提取
+        """
+        if multiprocessing.parent_process() is not None:
+            return 1
+        return max(1, min(
+            DocumentProcessor.PDF_PARALLEL_MAX_WORKERS,
+            os.cpu_count() or 1,
+            page_count // DocumentProcessor.PDF_PARALLEL_MIN_PAGES_PER_WORKER,
+        ))
+
     @staticmethod
     def has_meaningful_text(content: str) -> bool:
         cleaned = re.sub(r"\[\[PAGE:\d+\]\]", " ", str(content or ""))
@@ -325,7 +687,7 @@ class DocumentProcessor:
         if not non_ws:
             return {
                 "is_usable": False,
-                "fallback_to_fitz": True,
+                "fallback_to_secondary": True,
                 "fallback_to_ocr": True,
                 "reasons": ["empty_text"],
             }
@@ -368,7 +730,7 @@ class DocumentProcessor:
         low_quality = bool(reasons)
         return {
             "is_usable": not low_quality,
-            "fallback_to_fitz": low_quality,
+            "fallback_to_secondary": low_quality,
             "fallback_to_ocr": low_quality,
             "reasons": reasons,
             "cid_count": cid_count,
@@ -597,9 +959,15 @@ class DocumentProcessor:
         logger.info(f"开始加载DOCX文档: {file_path}")
         
         try:
-            doc = Document(file_path)
-            paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
-            full_text = "\n".join(paragraphs)
+            try:
+                paragraph_texts = DocumentProcessor._iter_docx_paragraph_texts(file_path)
+            except Exception as e:
+                # 非标准包结构等情况回退python-docx解析
+                logger.info(f"直接读取DOCX正文XML失败，回退python-docx解析: {e}")
+                # 直接遍历正文下的 w:p 元素取文本，不为每个段落构造 Paragraph 包装对象，每段文本也只计算一次
+                body = Document(file_path).element.body
+                paragraph_texts = [p.text for p in body.iterchildren(qn('w:p'))]
+            full_text = "\n".join(text for text in paragraph_texts if text.strip())
             
             logger.info(f"DOCX文档加载完成，总文本长度: {len(full_text)}")
             return full_text
@@ -608,26 +976,69 @@ class DocumentProcessor:
             logger.error(f"加载DOCX文档失败: {e}")
             raise
     
+    @staticmethod
+    def _iter_docx_paragraph_texts(file_path: str) -> List[str]:
+        """
+        直接从压缩包读取 word/document.xml 提取正文段落文本，跳过python-docx的整包加载
+        （样式、编号等部件）和逐元素的自定义类构造；文本规则与 python-docx 的 Paragraph.text 一致
+        :param file_path: DOCX文件路径
+        :return: 正文下各 w:p 段落的文本列表
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            xml = archive.read('word/document.xml')
+        root = etree.fromstring(xml, DocumentProcessor._DOCX_XML_PARSER)
+        body = root.find(DocumentProcessor._W_BODY)
+        if body is None:
+            raise ValueError("DOCX正文缺少 w:body 元素")
+
+        run_tag = DocumentProcessor._W_R
+        hyperlink_tag = DocumentProcessor._W_HYPERLINK
+        text_tag = DocumentProcessor._W_T
+        br_tag = DocumentProcessor._W_BR
+        br_type = DocumentProcessor._W_TYPE
+        run_content = DocumentProcessor._DOCX_RUN_CONTENT_TEXT
+        paragraph_texts: List[str] = []
+        for paragraph in body.iterchildren(DocumentProcessor._W_P):
+            parts: List[str] = []
+            for child in paragraph.iterchildren(run_tag, hyperlink_tag):
+                runs = child.iterchildren(run_tag) if child.tag == hyperlink_tag else (child,)
+                for run in runs:
+                    for element in run.iterchildren(*run_content):
+                        tag = element.tag
+                        if tag == text_tag:
+                            parts.append(element.text or "")
+                        elif tag == br_tag:
+                            # 仅换行符类型的 w:br 产生换行，分页/分栏符不产生文本
+                            if element.get(br_type, "textWrapping") == "textWrapping":
+                                parts.append("\n")
+                        else:
+                            parts.append(run_content[tag])
+            paragraph_texts.append("".join(parts))
+        return paragraph_texts
+
     @staticmethod
     def _load_txt(file_path: str) -> str:
         """
-        加载TXT文档
+        加载TXT文档（内存映射文件，编码探测与解码都直接读取映射页，不额外复制整文件字节）
         :param file_path: TXT文件路径
         :return: 文档文本内容
         """
         logger.info(f"开始加载TXT文档: {file_path}")
         
-        # 检测文件编码
-        with open(file_path, 'rb') as f:
-            raw_data = f.read()
-            encoding_result = chardet.detect(raw_data)
-            encoding = encoding_result['encoding']
-        
-        logger.info(f"检测到文件编码: {encoding}")
-        
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    logger.info("TXT文档为空")
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # 检测文件编码（仅采样文件开头，避免整文件参与探测）
+                    encoding = DocumentProcessor._detect_txt_encoding(mm)
+                    logger.info(f"检测到文件编码: {encoding}")
+                    content = codecs.decode(mm, encoding, 'replace')
+
+            # 与文本模式读取保持一致：统一换行符
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             logger.info(f"TXT文档加载完成，总文本长度: {len(content)}")
             return content
@@ -636,82 +1047,214 @@ class DocumentProcessor:
             logger.error(f"加载TXT文档失败: {e}")
             raise
 
+    @staticmethod
+    def _detect_txt_encoding(data) -> str:
+        """
+        探测TXT文件编码：优先识别BOM，其次分块喂给增量探测器，置信后立即停止
+        :param data: 文件内容的字节缓冲（如mmap），只读取开头的采样部分
+        :return: 编码名称，无法识别时返回utf-8
+        """
+        sample_limit = DocumentProcessor._ENCODING_SAMPLE_BYTES
+        chunk_size = DocumentProcessor._ENCODING_CHUNK_BYTES
+        view = memoryview(data)
+        sample = view[:sample_limit]
+
+        if sample[:3] == codecs.BOM_UTF8:
+            return 'utf-8-sig'
+        # UTF-32 LE的BOM以UTF-16 LE的BOM开头，须先判断
+        if sample[:4] in (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE):
+            return 'utf-32'
+        if sample[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            return 'utf-16'
+
+        # 绝大多数文本为UTF-8：采样能按UTF-8严格解码时直接返回，无需运行探测器
+        # （final=False 容忍采样末尾被截断的多字节字符）
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+
+        encoding = None
+        if UniversalDetector is not None:
+            detector = UniversalDetector()
+            for start in range(0, len(sample), chunk_size):
+                detector.feed(sample[start:start + chunk_size].tobytes())
+                if detector.done:
+                    break
+            detector.close()
+            encoding = (detector.result or {}).get('encoding')
+        elif detect_charset is not None:
+            best = detect_charset(sample.tobytes()).best()
+            encoding = best.encoding if best else None
+
+        return encoding or 'utf-8'
+
+
+def _extract_fitz_page_lines(file_path: str, start: int, stop: int) -> List[List[str]]:
+    """
+    使用PyMuPDF提取指定页段每页规范化后的文本行（模块级函数，便于在子进程中执行）
+    :param file_path: PDF文件路径
+    :param start: 起始页（含）
+    :param stop: 结束页（不含）
+    :return: 每页的文本行列表
+    """
+    pages_lines: List[List[str]] = []
+    with fitz.open(file_path) as pdf:
+        for page_num in range(start, stop):
+            page = pdf.load_page(page_num)
+            # 页面未引用任何字体（含表单XObject内字体）时不可能有文本层，跳过解析
+            if not page.get_fonts():
+                pages_lines.append([])
+                continue
+            page_text = page.get_text("text")
+            if page_text:
+                pages_lines.append(DocumentProcessor._normalize_pdf_lines(page_text.splitlines()))
+            else:
+                pages_lines.append([])
+    return pages_lines
+
+
+def _load_uploaded_document(
+    idx: int,
+    file_path: str,
+    filename: str,
+    doc_type: str,
+    title: Optional[str],
+    extra_metadata: Optional[Dict[str, Any]],
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+    """
+    加载单个上传文档（模块级函数，便于在子进程中执行）
+    :return: (文档对象, 错误信息)，二者只有一个非空
+    """
+    logger.info(f"正在处理文档 {idx + 1}: {file_path}")
+    try:
+        resolved_title = title or filename
+        ingest_profile = DocumentProcessor.detect_ingest_profile(filename, resolved_title)
+        file_type = DocumentProcessor.detect_file_type(filename)  # 使用文件名检测类型更准确
+
+        # 加载文档内容；审计问题表格行以结构化形式随文档传递，分块时不再从文本中回切
+        rows: Optional[List[List[str]]] = [] if doc_type == 'audit_issue' else None
+        cache_keys: List[str] = []
+        content = DocumentProcessor.load_document(
+            file_path,
+            doc_type=doc_type,
+            source_name=filename,
+            ingest_profile=ingest_profile,
+            row_collector=rows,
+            file_type=file_type,
+            cache_key_collector=cache_keys,
+        )
+        if not DocumentProcessor.has_meaningful_text(content):
+            if file_type == 'pdf':
+                raise ValueError("未从PDF中提取到可用文本，可能是扫描版/图片版PDF，请先OCR后再上传")
+            raise ValueError("文档未提取到可用文本内容")
+
+        # 创建文档对象
+        doc_obj = {
+            'doc_id': f'doc_{idx}',
+            'filename': filename,
+            'file_path': file_path,
+            'file_type': file_type,
+            'doc_type': doc_type,
+            'title': resolved_title,
+            'text': content,
+            'char_count': len(content)
+        }
+        if ingest_profile:
+            doc_obj['ingest_profile'] = ingest_profile
+        if rows:
+            doc_obj['rows'] = rows
+        if cache_keys:
+            doc_obj['parsed_cache_key'] = cache_keys[0]
+
+        if extra_metadata:
+            doc_obj.update({k: v for k, v in extra_metadata.items() if v is not None})
+
+        logger.info(f"文档 {filename} 处理完成，字符数: {len(content)}, 类型: {doc_type}")
+        return doc_obj, None
+
+    except Exception as e:
+        logger.error(f"处理文档 {file_path} 时发生错误: {e}")
+        return None, {
+            "filename": filename,
+            "error": str(e),
+        }
 
-def process_uploaded_documents(
+
+def iter_uploaded_documents(
     file_paths: List[str],
     doc_type: str = 'internal_regulation',
     title: str = None,
     original_filenames: List[str] = None,
     error_collector: List[Dict[str, str]] = None,
     extra_metadata: Optional[Dict[str, Any]] = None,
-) -> List[Dict[str, Any]]:
+) -> Iterator[Dict[str, Any]]:
     """
-    处理用户上传的多个文档
+    逐个产出用户上传的文档（多个文件时使用进程池并行解析），调用方无需同时持有全部文档文本
     :param file_paths: 文件路径列表
     :param doc_type: 文档类型 (internal_regulation, external_regulation, internal_report, external_report)
     :param title: 文档标题
     :param original_filenames: 原始文件名列表（可选）
-    :return: 文档列表，每个元素包含文档内容和元数据
+    :param error_collector: 解析失败信息收集列表（迭代完成后才完整）
+    :return: 文档迭代器，按输入顺序产出包含文档内容和元数据的字典
     """
     logger.info(f"开始处理 {len(file_paths)} 个上传的文档，类型: {doc_type}")
-    
-    documents = []
-    
-    for idx, file_path in enumerate(file_paths):
-        logger.info(f"正在处理文档 {idx + 1}/{len(file_paths)}: {file_path}")
-        filename = os.path.basename(file_path)
-        
-        try:
-            # 获取文件名：优先使用传入的原始文件名，否则从路径提取
-            if original_filenames and idx < len(original_filenames):
-                filename = original_filenames[idx]
-            else:
-                filename = os.path.basename(file_path)
 
-            resolved_title = title or filename
-            ingest_profile = DocumentProcessor.detect_ingest_profile(filename, resolved_title)
-            
-            # 加载文档内容
-            content = DocumentProcessor.load_document(
-                file_path,
-                doc_type=doc_type,
-                source_name=filename,
-                ingest_profile=ingest_profile,
-            )
-            if not DocumentProcessor.has_meaningful_text(content):
-                file_type = DocumentProcessor.detect_file_type(filename)
-                if file_type == 'pdf':
-                    raise ValueError("未从PDF中提取到可用文本，可能是扫描版/图片版PDF，请先OCR后再上传")
-                raise ValueError("文档未提取到可用文本内容")
-            
-            # 创建文档对象
-            doc_obj = {
-                'doc_id': f'doc_{idx}',
-                'filename': filename,
-                'file_path': file_path,
-                'file_type': DocumentProcessor.detect_file_type(filename), # 使用文件名检测类型更准确
-                'doc_type': doc_type,
-                'title': resolved_title,
-                'text': content,
-                'char_count': len(content)
-            }
-            if ingest_profile:
-                doc_obj['ingest_profile'] = ingest_profile
+    # 获取文件名：优先使用传入的原始文件名，否则从路径提取
+    filenames = [
+        original_filenames[idx] if original_filenames and idx < len(original_filenames) else os.path.basename(file_path)
+        for idx, file_path in enumerate(file_paths)
+    ]
+    args = (
+        range(len(file_paths)),
+        file_paths,
+        filenames,
+        repeat(doc_type),
+        repeat(title),
+        repeat(extra_metadata),
+    )
+
+    success_count = 0
+    max_workers = min(len(file_paths), os.cpu_count() or 1)
+    with ExitStack() as stack:
+        if max_workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+            results = executor.map(_load_uploaded_document, *args)
+        else:
+            results = map(_load_uploaded_document, *args)
 
-            if extra_metadata:
-                doc_obj.update({k: v for k, v in extra_metadata.items() if v is not None})
-            
-            documents.append(doc_obj)
-            logger.info(f"文档 {filename} 处理完成，字符数: {len(content)}, 类型: {doc_type}")
-            
-        except Exception as e:
-            logger.error(f"处理文档 {file_path} 时发生错误: {e}")
-            if error_collector is not None:
-                error_collector.append({
-                    "filename": filename,
-                    "error": str(e),
-                })
-            continue  # 继续处理其他文档
-    
-    logger.info(f"所有文档处理完成，成功处理 {len(documents)} 个文档")
-    return documents
+        for doc_obj, error in results:
+            if doc_obj is not None:
+                success_count += 1
+                yield doc_obj
+            elif error_collector is not None:
+                error_collector.append(error)
+
+    logger.info(f"所有文档处理完成，成功处理 {success_count} 个文档")
+
+
+def process_uploaded_documents(
+    file_paths: List[str],
+    doc_type: str = 'internal_regulation',
+    title: str = None,
+    original_filenames: List[str] = None,
+    error_collector: List[Dict[str, str]] = None,
+    extra_metadata: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    处理用户上传的多个文档，一次性返回列表（兼容旧接口，流式处理请使用 iter_uploaded_documents）
+    :param file_paths: 文件路径列表
+    :param doc_type: 文档类型 (internal_regulation, external_regulation, internal_report, external_report)
+    :param title: 文档标题
+    :param original_filenames: 原始文件名列表（可选）
+    :return: 文档列表，每个元素包含文档内容和元数据
+    """
+    return list(iter_uploaded_documents(
+        file_paths,
+        doc_type=doc_type,
+        title=title,
+        original_filenames=original_filenames,
+        error_collector=error_collector,
+        extra_metadata=extra_metadata,
+    ))
@@ -19,21 +19,33 @@ class AuditIssueChunker(DocumentChunker):
         
         # 用于识别新行的模式：多个空格或换行 + 序号 + 空格 + 部门名关键字
         self.row_split_pattern = re.compile(r'\s{2,}(\d+)\s+([\u4e00-\u9fa5]{2,}(?:部|委|局|中心|大学|学院|院|委|办))')
+        # 降级模式下以“序号 + 空白”开头的行视为新行
+        self.row_start_pattern = re.compile(r'^\d+\s+')
         
         # 审计问题特征词
         self.issue_keywords = ['整改情况', '问题摘要', '审计查出', '部门单位']
+        self._issue_keyword_re = re.compile('|'.join(re.escape(k) for k in self.issue_keywords))
 
-    def _create_chunk(self, document: Dict[str, Any], text: str, boundary: str) -> Dict[str, Any]:
-        """辅助方法：创建分块对象"""
+    @staticmethod
+    def _chunk_base(document: Dict[str, Any]) -> Dict[str, Any]:
+        """辅助方法：提取各分块共用的文档级字段（每个文档只取值一次）"""
         return {
             'doc_id': document.get('doc_id', ''),
             'filename': document.get('filename', 'unknown'),
             'file_type': document.get('file_type', 'pdf'),
             'doc_type': 'audit_issue',
             'title': document.get('title', ''),
-            'text': text.strip(),
+        }
+
+    @staticmethod
+    def _create_chunk(base: Dict[str, Any], text: str, boundary: str) -> Dict[str, Any]:
+        """辅助方法：在文档级公共字段基础上创建分块对象"""
+        text = text.strip()
+        return {
+            **base,
+            'text': text,
             'semantic_boundary': boundary,
-            'char_count': len(text.strip())
+            'char_count': len(text)
         }
 
     def chunk_audit_issues(self, document: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -43,26 +55,25 @@ class AuditIssueChunker(DocumentChunker):
         text = document['text']
         filename = document.get('filename', 'unknown')
         logger.info(f"开始按审计问题结构化行分块文档: {filename}")
+        base = self._chunk_base(document)
         
-        # 识别结构化行
-        if " [ROW_START] " in text:
+        # 识别结构化行：优先使用 DocumentProcessor 随文档传递的单元格列表，其次从文本中的行标记回切
+        rows = document.get('rows')
+        if rows:
             # 模式A：基于 DocumentProcessor 提取的表格行
-            rows = [r.strip() for r in text.split(" [ROW_START] ") if r.strip()]
+            chunks = [
+                self._create_chunk(base, self._format_row(cells), "audit_issue_row")
+                for cells in rows
+            ]
+        elif " [ROW_START] " in text:
+            # 模式A（兼容）：文本中只有行标记时（如按存档全文重新分块）回切出单元格
             chunks = []
-            for row_content in rows:
-                # 尝试解析列信息（针对审计整改表结构：序号 | 部门 | 问题摘要 | 整改情况）
-                cells = [c.strip() for c in row_content.split('|')]
-                
-                # 增强语义：如果列数符合预期，添加显式标签
-                if len(cells) >= 4:
-                    formatted_text = f"部门单位: {cells[1]}\n问题序号: {cells[0]}\n问题摘要: {cells[2]}\n整改情况: {cells[3]}"
-                    # 如果还有多余列（有些表可能有多余列），也带上
-                    if len(cells) > 4:
-                        formatted_text += f"\n补充信息: {' | '.join(cells[4:])}"
-                else:
-                    formatted_text = row_content
-                
-                chunks.append(self._create_chunk(document, formatted_text, "audit_issue_row"))
+            for row_content in text.split(" [ROW_START] "):
+                row_content = row_content.strip()
+                if row_content:
+                    cells = [c.strip() for c in row_content.split('|')]
+                    formatted_text = self._format_row(cells) if len(cells) >= 4 else row_content
+                    chunks.append(self._create_chunk(base, formatted_text, "audit_issue_row"))
         else:
             # 模式B：降级方案（基于正则表达式的原始文本切分）
             parts = self.row_split_pattern.split(text)
@@ -70,28 +81,44 @@ class AuditIssueChunker(DocumentChunker):
             # ... (保留原有的 row_split_pattern 处理逻辑)
             if len(parts) > 1:
                 if parts[0].strip():
-                    chunks.append(self._create_chunk(document, parts[0].strip(), "header"))
+                    chunks.append(self._create_chunk(base, parts[0].strip(), "header"))
                 for i in range(1, len(parts), 3):
                     idx = parts[i]
                     dept = parts[i+1]
                     content = parts[i+2] if i+2 < len(parts) else ""
                     row_text = f"序号: {idx}\n部门: {dept}\n内容: {content.strip()}"
-                    chunks.append(self._create_chunk(document, row_text, "audit_issue_row"))
+                    chunks.append(self._create_chunk(base, row_text, "audit_issue_row"))
             else:
                 # 最基础的行识别
                 lines = text.split('\n')
-                current_row = ""
+                # 按行收集后一次性拼接，避免续行较多时字符串反复累加
+                current_parts: List[str] = []
                 for line in lines:
-                    if re.match(r'^\d+\s+', line.strip()):
-                        if current_row: chunks.append(self._create_chunk(document, current_row, "audit_issue_row"))
-                        current_row = line + "\n"
+                    if self.row_start_pattern.match(line.strip()):
+                        if current_parts: chunks.append(self._create_chunk(base, "\n".join(current_parts), "audit_issue_row"))
+                        current_parts = [line]
                     else:
-                        current_row += line + "\n"
-                if current_row: chunks.append(self._create_chunk(document, current_row, "audit_issue_row"))
+                        current_parts.append(line)
+                if current_parts: chunks.append(self._create_chunk(base, "\n".join(current_parts), "audit_issue_row"))
                 
         logger.info(f"审计问题分块完成，共生成 {len(chunks)} 个文本块")
         return chunks
 
+    @staticmethod
+    def _format_row(cells: List[str]) -> str:
+        """
+        将表格行单元格格式化为带标签的分块文本（针对审计整改表结构：序号 | 部门 | 问题摘要 | 整改情况）
+        :param cells: 单元格列表，列数不足4时视为非表格内容原样输出
+        :return: 分块文本
+        """
+        if len(cells) < 4:
+            return " | ".join(cells)
+        formatted_text = f"部门单位: {cells[1]}\n问题序号: {cells[0]}\n问题摘要: {cells[2]}\n整改情况: {cells[3]}"
+        # 如果还有多余列（有些表可能有多余列），也带上
+        if len(cells) > 4:
+            formatted_text += f"\n补充信息: {' | '.join(cells[4:])}"
+        return formatted_text
+
     def chunk_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         重写父类方法
@@ -117,8 +144,8 @@ class AuditIssueChunker(DocumentChunker):
         if '整改情况' in filename and '审计' in filename:
             return True
             
-        # 2. 检查内容
-        keyword_count = sum(1 for k in self.issue_keywords if k in text_sample)
+        # 2. 检查内容（一次扫描取出现过的不同关键词；各关键词首尾互不重叠，与逐个子串判断等价）
+        keyword_count = len(set(self._issue_keyword_re.findall(text_sample)))
         if keyword_count >= 2:
             return True
             
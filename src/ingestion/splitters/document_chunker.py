@@ -166,7 +166,7 @@ class DocumentChunker:
         
         for doc_idx, document in enumerate(documents):
             text = document.get('text', '')
-            metadata = {k: v for k, v in document.items() if k != 'text'}
+            metadata = {k: v for k, v in document.items() if k not in ('text', 'rows', 'parsed_cache_key')}
             
             # 分割单个文档
             chunks = self.chunk_text(text)
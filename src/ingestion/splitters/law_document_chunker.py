@@ -1,12 +1,30 @@
 import re
 import logging
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from src.ingestion.splitters.document_chunker import DocumentChunker
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 分块过程中按行/按块反复使用的正则，模块加载时预编译
+WHITESPACE_PATTERN = re.compile(r'\s+')
+COMMENT_PATTERN = re.compile(r'#.*$', re.MULTILINE)
+CHAPTER_HEADING_PATTERN = re.compile(r'^第[一二三四五六七八九十百千万零〇两\d]+章')
+ARTICLE_TOKEN_PATTERN = re.compile(r'^(第[一二三四五六七八九十百千万零〇两\d]+条)')
+ARTICLE_NUMBER_PATTERN = re.compile(r'^第([一二三四五六七八九十百千万零〇两\d]+)条')
+ACCOUNTING_STANDARD_TITLE_PATTERN = re.compile(r'^企业会计准则第[一二三四五六七八九十百千万零〇两\d]+号')
+PROFILE_HEADING_NOISE_PATTERN = re.compile(r'[\s《》<>]')
+TOC_PAGE_LEADER_PATTERN = re.compile(r'[.．…·•]{2,}\d{1,4}$')
+REFERENCE_PUNCT_LEAD_PATTERN = re.compile(r'^[、，,；;：:]\s*第[一二三四五六七八九十百千万零〇两\d]+条')
+REFERENCE_CONJUNCTION_LEAD_PATTERN = re.compile(r'^(和|及|与|或者|或)\s*第[一二三四五六七八九十百千万零〇两\d]+条')
+REFERENCE_PHRASE_LEAD_PATTERN = re.compile(r'^(规定的|规定|所称|所列|之一|之二|之三|情形|办理|执行|适用|处理|追究)')
+ASCII_DIGITS = tuple('0123456789')
+# 判断块内是否有实质内容时计入的标点（字母数字之外）
+MEANINGFUL_PUNCTUATION = frozenset('，。！？；：、""\'\'（）【】[]《》〈〉「」『』…—')
+# 除标题外有效字符少于该值的章/节/条视为无实质内容
+MIN_MEANINGFUL_CHARS = 5
+
 
 class LawDocumentChunker(DocumentChunker):
     """
@@ -51,6 +69,53 @@ class LawDocumentChunker(DocumentChunker):
         # 组合所有模式
         self.all_patterns = self.preamble_patterns + self.chapter_patterns + self.sub_article_patterns
         self._page_tag_pattern = re.compile(r"\[\[PAGE:\d+\]\]")
+        # 逐行归一化使用的正则（每行都会执行，预编译）
+        self._heading_prefix_pattern = re.compile(r'^(第[^\s，。；：、,.:;]{1,30})')
+        self._repeated_cjk_pattern = re.compile(r'([\u4e00-\u9fff])\1+')
+        self._cjk_pair_pattern = re.compile(r'([\u4e00-\u9fff])(?=\1)')
+        self._cjk_char_pattern = re.compile(r'[\u4e00-\u9fff]')
+
+        # 同类模式合并为一个正则：逐行匹配只需一次正则调用；分支按列表顺序尝试，结果与逐个re.match一致
+        self._chapter_re = self._union_patterns(self.chapter_patterns)
+
+        # 标题识别：子条款、序言、章节模式按原检查顺序合并为一个带命名分组的正则，每行只匹配一次，
+        # 由命中的分组（lastgroup）确定类型；章节模式中本身就是条款模式的分支直接判定为条款
+        header_branches = []
+        self._header_kinds: Dict[str, str] = {}
+        for kind, patterns in (
+            ('sub_article', self.sub_article_patterns),
+            ('preamble', self.preamble_patterns),
+            ('chapter', self.chapter_patterns),
+        ):
+            for i, pattern in enumerate(patterns):
+                name = f'{kind}_{i}'
+                if kind == 'chapter' and pattern in self.article_patterns:
+                    self._header_kinds[name] = 'article'
+                else:
+                    self._header_kinds[name] = kind
+                header_branches.append(f'(?P<{name}>{pattern[1:] if pattern.startswith("^") else pattern})')
+        self._header_re = re.compile('|'.join(header_branches))
+        # 上述标题模式可能的首字符（另有任意十进制数字，对应\d，单独用isdecimal判断）；
+        # 正文行绝大多数不以这些字符开头，可跳过正则匹配。修改标题模式时须同步维护
+        self._header_first_chars = frozenset('第（(序前一二三四五六七八九十百千万零〇两')
+
+        # 法规文档识别关键词，合并为一个正则，一次扫描即可判断是否命中任一关键词
+        self.law_keywords = [
+            '法', '条例', '规定', '办法', '章程', '规则', '细则', '制度', '政策',
+            'regulation', 'rule', 'policy', 'statute', 'ordinance', 'bylaw',
+            '法律', '法规', '行政法规', '部门规章', '国家标准', '行业标准'
+        ]
+        self._law_keyword_re = re.compile('|'.join(re.escape(k) for k in self.law_keywords))
+
+    @staticmethod
+    def _union_patterns(patterns: List[str]) -> re.Pattern:
+        """
+        将多个以^开头的模式合并为一个预编译正则（用于re.match，去掉各分支的^）
+        单个模式时原样编译，保留其分组编号
+        """
+        if len(patterns) == 1:
+            return re.compile(patterns[0])
+        return re.compile('|'.join(f'(?:{p[1:] if p.startswith("^") else p})' for p in patterns))
 
     
     def chunk_law_document(self, document: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -63,10 +128,19 @@ class LawDocumentChunker(DocumentChunker):
         filename = document.get('filename', 'unknown')
             
         logger.info(f"开始按法规结构分块文档: {filename}")
+        # 各分块共用的文档级字段只取值一次，创建分块时在此基础上展开
+        chunk_base = {
+            'doc_id': document.get('doc_id', ''),
+            'filename': filename,
+            'file_type': document.get('file_type', ''),
+            'doc_type': document.get('doc_type', 'internal_regulation'),  # 添加文档类型
+            'title': document.get('title', ''),  # 添加标题
+        }
         ingest_profile = str(document.get('ingest_profile', '') or '').strip()
             
         # 按行分割文本，并对PDF抽取常见的重复字伪影做归一化
-        lines = [self._normalize_extracted_line(line) for line in text.split('\n')]
+        # 逐行惰性产出，不先生成整篇的行列表；原始行归一化后即可释放
+        lines = (self._normalize_extracted_line(line) for line in self._iter_lines(text))
             
         # 识别章节结构
         sections = self._identify_sections(lines, ingest_profile=ingest_profile)
@@ -84,7 +158,7 @@ class LawDocumentChunker(DocumentChunker):
             if section_type == 'sub_article':
                 continue
 
-            # 计算本块的章节路径（避免“路径标题 + 当前标题”重复）
+            # 计算本块的章节路径（避免“路径标题 + 当前标题”重复）；每个章节各自持有一份列表，分块直接引用无需再复制
             chunk_section_path = current_section_path.copy()
             if section_type == 'chapter' and section_header:
                 chunk_section_path = [section_header]
@@ -141,28 +215,28 @@ class LawDocumentChunker(DocumentChunker):
                 content_without_header = self._strip_page_tags(content_without_header).strip()
                                 
                 # 移除可能的注释（如 # 这个只有标题没有内容）
-                content_without_comments = re.sub(r'#.*$', '', content_without_header, flags=re.MULTILINE).strip()
+                content_without_comments = COMMENT_PATTERN.sub('', content_without_header).strip()
                                 
                 # 检查除标题外的内容是否为空或只有很少的有效字符
-                # 计算有意义的字符（中文、英文字母、数字、标点符号）
-                meaningful_chars = sum(1 for c in content_without_comments if c.isalnum() or c in '，。！？；：、""\'\'（）【】[]《》〈〉「」『』…—')
+                # 计算有意义的字符（中文、英文字母、数字、标点符号）；只需与阈值比较，计满即停
+                meaningful_chars = self._count_meaningful_chars(content_without_comments, MIN_MEANINGFUL_CHARS)
                                     
                 # 特殊处理：如果是章节类型（chapter/section）且没有实质性内容，则跳过
-                if section_type in ['chapter', 'section'] and meaningful_chars < 5:
+                if section_type in ['chapter', 'section'] and meaningful_chars < MIN_MEANINGFUL_CHARS:
                     logger.debug(f"跳过仅有标题或内容过少的章节: {section_header}")
                     skip_current_chunk = True
                                     
                 # 对于article类型，如果标题后没有实质内容（如"第七条"后面没有任何内容），也跳过
                 if section_type == 'article':
                     # 检查是否是简单序号标题（如"第X条"）且内容主要是注释
-                    is_simple_numbered_article = re.match(r'^第[一二三四五六七八九十百千万零〇两\d]+条', section_header.strip())
+                    is_simple_numbered_article = ARTICLE_TOKEN_PATTERN.match(section_header.strip())
                     
-                    if is_simple_numbered_article and meaningful_chars < 5:
+                    if is_simple_numbered_article and meaningful_chars < MIN_MEANINGFUL_CHARS:
                         logger.debug(f"跳过无实质内容的简单条款: {section_header}")
                         skip_current_chunk = True
 
                     # 检查内容是否主要是注释
-                    is_mainly_comment = '#' in section_header and meaningful_chars < 5
+                    is_mainly_comment = '#' in section_header and meaningful_chars < MIN_MEANINGFUL_CHARS
                     
                     # 如果是简单的序号条款且主要内容是注释，则跳过
                     if is_simple_numbered_article and is_mainly_comment:
@@ -171,14 +245,10 @@ class LawDocumentChunker(DocumentChunker):
 
             if not skip_current_chunk:
                 chunk = {
-                    'doc_id': document.get('doc_id', ''),
-                    'filename': filename,
-                    'file_type': document.get('file_type', ''),
-                    'doc_type': document.get('doc_type', 'internal_regulation'),  # 添加文档类型
-                    'title': document.get('title', ''),  # 添加标题
+                    **chunk_base,
                     'text': full_content,
                     'semantic_boundary': section_type,
-                    'section_path': chunk_section_path.copy(),
+                    'section_path': chunk_section_path,
                     'header': section_header,
                     'char_count': len(full_content)
                 }
@@ -195,24 +265,42 @@ class LawDocumentChunker(DocumentChunker):
         logger.info(f"法规文档分块完成，共生成 {len(chunks)} 个文本块")
         return chunks
 
+    @staticmethod
+    def _count_meaningful_chars(text: str, limit: Optional[int] = None) -> int:
+        """
+        统计有意义的字符数（字母数字及常用标点），达到上限即停止
+        :param text: 待统计文本
+        :param limit: 统计上限，None表示完整统计
+        :return: min(有意义字符数, limit)
+        """
+        if limit is None:
+            return sum(1 for char in text if char.isalnum() or char in MEANINGFUL_PUNCTUATION)
+        count = 0
+        for char in text:
+            if char.isalnum() or char in MEANINGFUL_PUNCTUATION:
+                count += 1
+                if count >= limit:
+                    break
+        return count
+
     def _extract_chapter_context(self, section_path: List[str]) -> List[str]:
         """
         提取章节上下文中的“章”层级，避免“节”被错误叠加为上一个节的子级。
         """
         for header in section_path:
             normalized = str(header or "").strip()
-            if re.match(r'^第[一二三四五六七八九十百千万零〇两\d]+章', normalized):
+            if CHAPTER_HEADING_PATTERN.match(normalized):
                 return [normalized]
         return []
     
     @staticmethod
     def _looks_like_profile_toc_entry(line: str) -> bool:
-        compact = re.sub(r'\s+', '', str(line or '').strip())
+        compact = WHITESPACE_PATTERN.sub('', str(line or '').strip())
         if not compact:
             return False
-        if re.search(r'[.．…·•]{2,}\d{1,4}$', compact):
+        if TOC_PAGE_LEADER_PATTERN.search(compact):
             return True
-        if compact.endswith(tuple(str(i) for i in range(10))) and re.match(r'^企业会计准则第[一二三四五六七八九十百千万零〇两\d]+号', compact):
+        if compact.endswith(ASCII_DIGITS) and ACCOUNTING_STANDARD_TITLE_PATTERN.match(compact):
             return True
         return False
 
@@ -225,20 +313,39 @@ class LawDocumentChunker(DocumentChunker):
         if not stripped_line or LawDocumentChunker._looks_like_profile_toc_entry(stripped_line):
             return None, ''
 
-        compact = re.sub(r'[\s《》<>]', '', stripped_line)
-        if re.match(r'^企业会计准则第[一二三四五六七八九十百千万零〇两\d]+号', compact):
+        compact = PROFILE_HEADING_NOISE_PATTERN.sub('', stripped_line)
+        if ACCOUNTING_STANDARD_TITLE_PATTERN.match(compact):
             return 'chapter', stripped_line
         if compact.startswith('企业会计准则应用指南'):
             return 'chapter', stripped_line
         return None, ''
 
-    def _identify_sections(self, lines: List[str], ingest_profile: str = '') -> List[Dict[str, Any]]:
+    @staticmethod
+    def _iter_lines(text: str) -> Iterator[str]:
+        """
+        按换行符逐行产出文本（与 text.split('\\n') 结果一致，但不一次性生成整篇的行列表）
+        :param text: 文档文本
+        :return: 行迭代器
+        """
+        start = 0
+        find = text.find
+        while True:
+            end = find('\n', start)
+            if end < 0:
+                yield text[start:]
+                return
+            yield text[start:end]
+            start = end + 1
+
+    def _identify_sections(self, lines: Iterable[str], ingest_profile: str = '') -> List[Dict[str, Any]]:
         """
         识别文档中的章节结构
-        :param lines: 文档行列表
+        :param lines: 文档行（可为只遍历一次的迭代器）
         :return: 章节列表
         """
         sections = []
+        # 各章节的内容行，最后统一拼接，避免逐行字符串累加带来的平方级复制
+        section_lines: List[List[str]] = []
         
         for line in lines:
             # 检查是否是章节标题
@@ -249,36 +356,40 @@ class LawDocumentChunker(DocumentChunker):
                     # 如果是子条款，将其添加到上一个章节内容中（而不是作为新章节）
                     if sections and sections[-1]['type'] in ['article']:
                         # 将子条款添加到上一个条款
-                        sections[-1]['content'] += header + '\n'
+                        section_lines[-1].append(header)
                     else:
                         # 如果前面没有合适的父条款，则作为普通内容添加到当前章节
                         if sections:
-                            sections[-1]['content'] += line + '\n'
+                            section_lines[-1].append(line)
                         else:
                             # 如果还没有章节，创建一个普通内容章节
                             sections.append({
                                 'type': 'content',
                                 'header': '',
-                                'content': line + '\n'
                             })
+                            section_lines.append([line])
                 else:
                     # 创建新的章节，无论是章节还是条款
                     sections.append({
                         'type': section_type,
                         'header': header.strip(),
-                        'content': line + '\n'
                     })
+                    section_lines.append([line])
             else:
                 # 添加内容到最新章节
                 if sections:
-                    sections[-1]['content'] += line + '\n'
+                    section_lines[-1].append(line)
                 else:
                     # 如果还没有章节，创建一个普通内容章节
                     sections.append({
                         'type': 'content',
                         'header': '',
-                        'content': line + '\n'
                     })
+                    section_lines.append([line])
+
+        for section, content_lines in zip(sections, section_lines):
+            content_lines.append('')
+            section['content'] = '\n'.join(content_lines)
         
         return sections
     
@@ -298,37 +409,35 @@ class LawDocumentChunker(DocumentChunker):
         if profile_section_type:
             return profile_section_type, profile_header
         
-        # 检查子条款模式（优先检查，因为它们应该跟随父条款）
-        for pattern in self.sub_article_patterns:
-            match = re.match(pattern, stripped_line)
-            if match:
-                header = match.group(0)
-                return 'sub_article', header
-
-        # 检查序言/前言（作为章节层级处理，确保独立成块）
-        for pattern in self.preamble_patterns:
-            match = re.match(pattern, stripped_line)
-            if match:
-                normalized = re.sub(r'\s+', '', match.group(1))
-                return 'chapter', normalized
-        
-        # 检查章节模式
-        for pattern in self.chapter_patterns:
-            match = re.match(pattern, stripped_line)
-            if match:
-                header = match.group(0)
-                if self._looks_like_article_reference_heading(stripped_line):
-                    return None, ''
-                if any(re.match(p, header) for p in self.article_patterns):
-                    return 'article', self._extract_article_heading_token(stripped_line)
-                elif '章' in header:
-                    return 'chapter', header
-                elif '节' in header:
-                    return 'section', header
-                else:
-                    return 'article', header
-        
-        return None, ''
+        first_char = stripped_line[0]
+        if first_char not in self._header_first_chars and not first_char.isdecimal():
+            return None, ''
+
+        match = self._header_re.match(stripped_line)
+        if not match:
+            return None, ''
+        kind = self._header_kinds[match.lastgroup]
+        header = match.group(0)
+
+        # 子条款（优先检查，因为它们应该跟随父条款）
+        if kind == 'sub_article':
+            return 'sub_article', header
+
+        # 序言/前言（作为章节层级处理，确保独立成块）
+        if kind == 'preamble':
+            return 'chapter', WHITESPACE_PATTERN.sub('', header)
+
+        # 章节模式
+        if self._looks_like_article_reference_heading(stripped_line):
+            return None, ''
+        if kind == 'article':
+            return 'article', self._extract_article_heading_token(stripped_line)
+        elif '章' in header:
+            return 'chapter', header
+        elif '节' in header:
+            return 'section', header
+        else:
+            return 'article', header
     
     def _split_large_content(self, content: str, section_path: List[str], document: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -351,14 +460,26 @@ class LawDocumentChunker(DocumentChunker):
         
         # 查找标题部分（章节标题和条款标题）
         for i, para in enumerate(paragraphs):
-            if any(re.match(pattern, para.strip()) for pattern in self.chapter_patterns):
+            if self._chapter_re.match(para):
                 title_part += para + '\n\n'
                 content_start_idx = i + 1
             else:
                 break
         
-        current_chunk = title_part
-        current_size = len(current_chunk)
+        # 子块都属于同一章节，共用调用方为该章节单独生成的路径列表（分块的section_path只读）
+        section_header = section_path[-1] if section_path else ''
+        chunk_base = {
+            'doc_id': '',
+            'filename': document.get('filename', 'law_document'),
+            'file_type': document.get('file_type', 'txt'),
+            'doc_type': document.get('doc_type', 'internal_regulation'),  # 添加文档类型
+            'title': document.get('title', ''),  # 添加标题
+        }
+
+        # 当前块按片段收集，输出时再拼接，避免逐段字符串累加
+        current_parts = [title_part]
+        current_size = len(title_part)
+        has_body = False
         
         # 处理剩余内容
         for i in range(content_start_idx, len(paragraphs)):
@@ -366,41 +487,36 @@ class LawDocumentChunker(DocumentChunker):
             paragraph_with_separator = paragraph + '\n\n'
             paragraph_size = len(paragraph_with_separator)
             
-            if current_size + paragraph_size > self.chunk_size and current_chunk.strip() != title_part.strip():
+            if current_size + paragraph_size > self.chunk_size and has_body:
                 # 保存当前块
+                current_chunk = ''.join(current_parts)
                 chunk = {
-                    'doc_id': '',
-                    'filename': document.get('filename', 'law_document'),
-                    'file_type': document.get('file_type', 'txt'),
-                    'doc_type': document.get('doc_type', 'internal_regulation'),  # 添加文档类型
-                    'title': document.get('title', ''),  # 添加标题
+                    **chunk_base,
                     'text': current_chunk.strip(),
                     'semantic_boundary': 'sub_article',
-                    'section_path': section_path.copy(),
-                    'header': section_path[-1] if section_path else '',
+                    'section_path': section_path,
+                    'header': section_header,
                     'char_count': len(current_chunk)
                 }
                 chunks.append(chunk)
                 
                 # 开始新块，包含章节标题
-                current_chunk = title_part + paragraph_with_separator
+                current_parts = [title_part, paragraph_with_separator]
                 current_size = len(title_part) + paragraph_size
             else:
-                current_chunk += paragraph_with_separator
+                current_parts.append(paragraph_with_separator)
                 current_size += paragraph_size
+            has_body = True
         
         # 添加最后一块
-        if current_chunk.strip() and len(current_chunk.strip()) > len(title_part.strip()):
+        if has_body:
+            current_chunk = ''.join(current_parts)
             chunk = {
-                'doc_id': '',
-                'filename': document.get('filename', 'law_document'),
-                'file_type': document.get('file_type', 'txt'),
-                'doc_type': document.get('doc_type', 'internal_regulation'),  # 添加文档类型
-                'title': document.get('title', ''),  # 添加标题
+                **chunk_base,
                 'text': current_chunk.strip(),
                 'semantic_boundary': 'sub_article',
-                'section_path': section_path.copy(),
-                'header': section_path[-1] if section_path else '',
+                'section_path': section_path,
+                'header': section_header,
                 'char_count': len(current_chunk)
             }
             chunks.append(chunk)
@@ -412,12 +528,13 @@ class LawDocumentChunker(DocumentChunker):
         重写父类方法，对法规文档使用专门的分块逻辑
         """
         all_chunks = []
+        # 如果显式指定了使用法规分块器，或者自动检测是法规文档，则使用专门逻辑
+        # 注意：如果是从 SmartChunker 调用的，我们会通过 _is_law_document 判断
+        # 但如果是 RAGProcessor 直接持有的 LawDocumentChunker，则强制使用（每次调用只判断一次，不再逐文档检测）
+        force_law_chunking = type(self) is LawDocumentChunker
         
         for doc in documents:
-            # 如果显式指定了使用法规分块器，或者自动检测是法规文档，则使用专门逻辑
-            # 注意：如果是从 SmartChunker 调用的，我们会通过 _is_law_document 判断
-            # 但如果是 RAGProcessor 直接持有的 LawDocumentChunker，则强制使用
-            if self.__class__ == LawDocumentChunker or self._is_law_document(doc):
+            if force_law_chunking or self._is_law_document(doc):
                 logger.info(f"使用法规分块逻辑处理: {doc.get('filename', 'unknown')}")
                 chunks = self.chunk_law_document(doc)
             else:
@@ -435,33 +552,20 @@ class LawDocumentChunker(DocumentChunker):
         :param document: 文档对象
         :return: 是否为法规文档
         """
-        text = document.get('text', '').lower()
+        # 只用到前2000个字符，仅对这部分转小写（逐字符映射，结果与整篇转小写后截取一致）
+        text = document.get('text', '')[:2000].lower()
         filename = document.get('filename', '').lower()
         
-        # 检查关键词
-        law_keywords = [
-            '法', '条例', '规定', '办法', '章程', '规则', '细则', '制度', '政策',
-            'regulation', 'rule', 'policy', 'statute', 'ordinance', 'bylaw',
-            '法律', '法规', '行政法规', '部门规章', '国家标准', '行业标准'
-        ]
-        
-        # 检查是否包含法规关键词
-        for keyword in law_keywords:
-            if keyword in text[:500] or keyword in filename:  # 检查前500个字符和文件名
-                return True
+        # 检查是否包含法规关键词（前500个字符和文件名）
+        if self._law_keyword_re.search(text[:500]) or self._law_keyword_re.search(filename):
+            return True
         
-        # 检查是否包含法规结构模式
-        for pattern in self.chapter_patterns:
-            if re.search(pattern, text[:2000]):  # 检查前2000个字符
-                return True
+        # 检查是否包含法规结构模式（前2000个字符；各模式以^锚定文本开头，合并后用match）
+        if self._chapter_re.match(text[:2000]):
+            return True
         
         return False
 
-    @staticmethod
-    def _is_cjk_char(char: str) -> bool:
-        """判断是否为常见中文字符"""
-        return '\u4e00' <= char <= '\u9fff'
-
     def _normalize_extracted_line(self, line: str) -> str:
         """
         归一化PDF抽取常见伪影：
@@ -473,35 +577,35 @@ class LawDocumentChunker(DocumentChunker):
             return ''
 
         # 对“第...条/章/节”前缀做定向归一化，避免误伤正文中的合法叠字
-        heading_prefix_match = re.match(r'^(第[^\s，。；：、,.:;]{1,30})', stripped)
+        heading_prefix_match = self._heading_prefix_pattern.match(stripped)
         if heading_prefix_match:
             heading_prefix = heading_prefix_match.group(1)
-            normalized_heading_prefix = re.sub(r'([\u4e00-\u9fff])\1+', r'\1', heading_prefix)
+            normalized_heading_prefix = self._repeated_cjk_pattern.sub(r'\1', heading_prefix)
             if normalized_heading_prefix != heading_prefix:
                 stripped = normalized_heading_prefix + stripped[len(heading_prefix):]
 
-        cjk_count = sum(1 for ch in stripped if self._is_cjk_char(ch))
-        duplicate_pairs = sum(
-            1
-            for i in range(len(stripped) - 1)
-            if stripped[i] == stripped[i + 1] and self._is_cjk_char(stripped[i])
-        )
+        # 相邻重复中文字符对数（前瞻不消耗第二个字符，连续叠字按对重叠计数）；
+        # 多数行没有叠字，不足2处时无需再统计中文字符数
+        duplicate_pairs = len(self._cjk_pair_pattern.findall(stripped))
+        if duplicate_pairs < 2:
+            return stripped
+        cjk_count = len(self._cjk_char_pattern.findall(stripped))
 
         # 阈值设计：至少2处重复且重复占比>=10%，再做压缩，避免误伤正常词
-        if cjk_count > 0 and duplicate_pairs >= 2 and (duplicate_pairs / cjk_count) >= 0.10:
-            stripped = re.sub(r'([\u4e00-\u9fff])\1+', r'\1', stripped)
+        if cjk_count > 0 and (duplicate_pairs / cjk_count) >= 0.10:
+            stripped = self._repeated_cjk_pattern.sub(r'\1', stripped)
 
         return stripped
 
     def _strip_page_tags(self, text: str) -> str:
         cleaned = self._page_tag_pattern.sub("", str(text or ""))
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = WHITESPACE_PATTERN.sub(" ", cleaned).strip()
         return cleaned
 
     @staticmethod
     def _extract_article_heading_token(line: str) -> str:
         stripped = str(line or "").strip()
-        match = re.match(r'^(第[一二三四五六七八九十百千万零〇两\d]+条)', stripped)
+        match = ARTICLE_TOKEN_PATTERN.match(stripped)
         if match:
             return match.group(1)
         return stripped
@@ -512,7 +616,7 @@ class LawDocumentChunker(DocumentChunker):
         if not stripped:
             return False
 
-        match = re.match(r'^(第[一二三四五六七八九十百千万零〇两\d]+条)', stripped)
+        match = ARTICLE_TOKEN_PATTERN.match(stripped)
         if not match:
             return False
 
@@ -520,9 +624,9 @@ class LawDocumentChunker(DocumentChunker):
         if not rest:
             return False
 
-        if re.match(r'^[、，,；;：:]\s*第[一二三四五六七八九十百千万零〇两\d]+条', rest):
+        if REFERENCE_PUNCT_LEAD_PATTERN.match(rest):
             return True
-        if re.match(r'^(和|及|与|或者|或)\s*第[一二三四五六七八九十百千万零〇两\d]+条', rest):
+        if REFERENCE_CONJUNCTION_LEAD_PATTERN.match(rest):
             return True
 
         return False
@@ -536,7 +640,7 @@ class LawDocumentChunker(DocumentChunker):
             cleaned = cleaned.replace(header, '', 1).strip()
         for path_header in section_path:
             cleaned = cleaned.replace(path_header, '', 1).strip()
-        cleaned = re.sub(r'#.*$', '', cleaned, flags=re.MULTILINE).strip()
+        cleaned = COMMENT_PATTERN.sub('', cleaned).strip()
         return cleaned
 
     @staticmethod
@@ -545,11 +649,11 @@ class LawDocumentChunker(DocumentChunker):
         if not stripped:
             return False
 
-        if re.match(r'^[、，,；;：:]\s*第[一二三四五六七八九十百千万零〇两\d]+条', stripped):
+        if REFERENCE_PUNCT_LEAD_PATTERN.match(stripped):
             return True
-        if re.match(r'^(和|及|与|或者|或)\s*第[一二三四五六七八九十百千万零〇两\d]+条', stripped):
+        if REFERENCE_CONJUNCTION_LEAD_PATTERN.match(stripped):
             return True
-        if re.match(r'^(规定的|规定|所称|所列|之一|之二|之三|情形|办理|执行|适用|处理|追究)', stripped):
+        if REFERENCE_PHRASE_LEAD_PATTERN.match(stripped):
             return True
 
         return False
@@ -559,7 +663,7 @@ class LawDocumentChunker(DocumentChunker):
         token = str(header or "").strip()
         if not token:
             return -1
-        match = re.match(r'^第([一二三四五六七八九十百千万零〇两\d]+)条', token)
+        match = ARTICLE_NUMBER_PATTERN.match(token)
         if not match:
             return -1
         raw = str(match.group(1) or "").strip()
@@ -614,47 +718,49 @@ class LawDocumentChunker(DocumentChunker):
             return -1
         return total + section + number
 
-    def _body_meaningful_chars(self, chunk: Dict[str, Any]) -> int:
-        cleaned = self._extract_chunk_body_text(chunk)
-        return sum(1 for c in cleaned if c.isalnum() or c in '，。！？；：、""\'\'（）【】[]《》〈〉「」『』…—')
-
     def _filter_suspicious_article_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if len(chunks) < 3:
             return chunks
 
+        # 每个条款块的条号只解析一次（非条款块为None），前后相邻条款直接查表
+        article_numbers = [
+            self._extract_article_number_from_header(chunk.get('header', ''))
+            if chunk.get('semantic_boundary') == 'article' else None
+            for chunk in chunks
+        ]
+
         filtered: List[Dict[str, Any]] = []
         for idx, chunk in enumerate(chunks):
-            if chunk.get('semantic_boundary') != 'article':
-                filtered.append(chunk)
-                continue
-
-            current_number = self._extract_article_number_from_header(chunk.get('header', ''))
-            if current_number < 0:
+            current_number = article_numbers[idx]
+            if current_number is None or current_number < 0:
                 filtered.append(chunk)
                 continue
 
             prev_number = -1
             next_number = -1
             for prev_idx in range(idx - 1, -1, -1):
-                if chunks[prev_idx].get('semantic_boundary') == 'article':
-                    prev_number = self._extract_article_number_from_header(chunks[prev_idx].get('header', ''))
+                if article_numbers[prev_idx] is not None:
+                    prev_number = article_numbers[prev_idx]
                     break
             for next_idx in range(idx + 1, len(chunks)):
-                if chunks[next_idx].get('semantic_boundary') == 'article':
-                    next_number = self._extract_article_number_from_header(chunks[next_idx].get('header', ''))
+                if article_numbers[next_idx] is not None:
+                    next_number = article_numbers[next_idx]
                     break
 
-            body_chars = self._body_meaningful_chars(chunk)
-            body_text = self._extract_chunk_body_text(chunk)
-            looks_like_reference_body = self._looks_like_reference_style_body(body_text)
-            is_regression_noise = (
+            # 条号回退且前后条款连续时才需要检查正文；绝大多数条款在此即可保留，不必提取正文统计字符
+            if not (
                 prev_number > 0
                 and next_number > 0
                 and current_number < prev_number
                 and next_number == prev_number + 1
-                and (body_chars < 12 or looks_like_reference_body)
-            )
-            if is_regression_noise:
+            ):
+                filtered.append(chunk)
+                continue
+
+            body_text = self._extract_chunk_body_text(chunk)
+            body_chars = self._count_meaningful_chars(body_text)
+            looks_like_reference_body = self._looks_like_reference_style_body(body_text)
+            if body_chars < 12 or looks_like_reference_body:
                 logger.warning(
                     "跳过疑似PDF抽取伪影条款: current=%s prev=%s next=%s header=%s body_chars=%s reference_like=%s",
                     current_number,
@@ -87,13 +87,12 @@ class SmartChunker:
         )
         return has_technical_name and technical_structure_count >= 2
 
-    def _resolve_route(
-        self,
-        doc: Dict[str, Any],
-        is_technical_standard: bool,
-        is_speech_material: bool,
-        is_case_material: bool,
-    ) -> Dict[str, str]:
+    def _resolve_route(self, doc: Dict[str, Any]) -> Dict[str, str]:
+        """
+        按优先级确定分块器；各类文档特征检测需扫描正文，只在轮到对应规则时才执行
+        :param doc: 文档对象
+        :return: {'chunker_type': 分块器类型, 'reason': 路由原因}
+        """
         doc_type = str(doc.get('doc_type', '') or '')
         ingest_profile = str(doc.get('ingest_profile', '') or '').strip()
         label_values = self._label_values(doc)
@@ -102,18 +101,18 @@ class SmartChunker:
             return {'chunker_type': 'audit_issue', 'reason': 'doc_type_or_audit_issue_feature'}
         if 'case_library' in label_values:
             return {'chunker_type': 'case_material', 'reason': 'knowledge_label_case_library'}
-        if is_case_material:
+        if self.case_chunker._is_case_material(doc):
             return {'chunker_type': 'case_material', 'reason': 'case_material_feature'}
         if 'important_speeches' in label_values:
             return {'chunker_type': 'speech_material', 'reason': 'knowledge_label_important_speeches'}
-        if is_speech_material:
+        if self.speech_chunker._is_speech_material(doc):
             return {'chunker_type': 'speech_material', 'reason': 'speech_material_feature'}
 
         if ingest_profile == ENTERPRISE_ACCOUNTING_PROFILE:
             return {'chunker_type': 'regulation', 'reason': 'enterprise_accounting_profile'}
 
         is_regulation_doc_type = doc_type in ['internal_regulation', 'external_regulation']
-        if is_technical_standard:
+        if self.technical_chunker._is_technical_standard(doc):
             return {'chunker_type': 'technical_standard', 'reason': 'technical_standard_feature'}
         if is_regulation_doc_type and self._has_technical_route_hint(doc):
             return {'chunker_type': 'technical_standard', 'reason': 'technical_filename_or_structure_hint'}
@@ -153,15 +152,7 @@ class SmartChunker:
         for doc in documents:
             filename = doc.get('filename', '')
 
-            is_technical_standard = self.technical_chunker._is_technical_standard(doc)
-            is_speech_material = self.speech_chunker._is_speech_material(doc)
-            is_case_material = self.case_chunker._is_case_material(doc)
-            route = self._resolve_route(
-                doc,
-                is_technical_standard=is_technical_standard,
-                is_speech_material=is_speech_material,
-                is_case_material=is_case_material,
-            )
+            route = self._resolve_route(doc)
             resolved_chunker_type = route['chunker_type']
             route_reason = route['reason']
 
@@ -7,12 +7,13 @@ import shutil
 from difflib import SequenceMatcher
 from collections import defaultdict, deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import src.indexing.graph.ontology as ontology
 from src.indexing.graph.graph_builder import GraphBuilder
 from src.indexing.graph.graph_retriever import GraphRetriever
-from src.indexing.graph.graph_store import GraphStore
+from src.indexing.graph.graph_store import GraphStore, edge_dict
 from src.indexing.graph.labels import (
     doc_type_label,
     entity_type_key,
@@ -73,6 +74,7 @@ class RAGProcessor:
         intent_router_fixed_top_k: Optional[int] = None,
         intent_router_fixed_doc_types: Optional[List[str]] = None,
         intent_router_default_retrieval_plan: Optional[Dict[str, Any]] = None,
+        vector_index_type: str = "auto",
     ):
         self.embedding_provider = embedding_provider
         self.scope = str(scope or "default")
@@ -83,6 +85,7 @@ class RAGProcessor:
 
         self._init_chunker(chunker_type, chunk_size, overlap)
         self.vector_store: Optional[VectorStore] = None
+        self.vector_index_type = vector_index_type
         self.dimension: Optional[int] = None
 
         self.router = IntentRouter(
@@ -757,6 +760,9 @@ class RAGProcessor:
                 doc["searchable"] = True
                 changed = True
 
+        if changed:
+            # 上面就地修改了chunk_id/doc_id，向量库的查找表需要重建
+            self.vector_store.invalidate_lookup()
         return changed
 
     def _get_stored_document_chunks(self, doc_id: str) -> List[Dict[str, Any]]:
@@ -985,7 +991,7 @@ class RAGProcessor:
             ],
         }
 
-    def process_documents(self, documents: List[Dict[str, Any]], save_after_processing: bool = True) -> Dict:
+    def process_documents(self, documents: Iterable[Dict[str, Any]], save_after_processing: bool = True) -> Dict:
         processed_count = 0
         skipped_count = 0
         updated_count = 0
@@ -1024,6 +1030,8 @@ class RAGProcessor:
 
             self._save_full_text(doc_id, content)
             self._save_preview_chunks(doc_id, chunks)
+            # 全文已落盘且已分块，后续只需元数据，不再持有原文及表格行以便流式输入时及时释放
+            doc_meta = {key: value for key, value in doc.items() if key not in ("text", "rows")}
 
             if existing and existing.status == "active":
                 was_searchable = bool(getattr(existing, "searchable", True))
@@ -1037,7 +1045,7 @@ class RAGProcessor:
 
                 pending_existing_updates.append({
                     "existing": existing,
-                    "doc": doc,
+                    "doc": doc_meta,
                     "doc_id": doc_id,
                     "chunks": chunks,
                     "group_id": group_id,
@@ -1050,9 +1058,9 @@ class RAGProcessor:
                 continue
 
             entry = {
-                "doc": doc,
+                "doc": doc_meta,
                 "doc_id": doc_id,
-                "content": content,
+                "file_size": len(content.encode("utf-8")),
                 "content_hash": content_hash,
                 "chunks": chunks,
                 "group_id": group_id,
@@ -1081,8 +1089,8 @@ class RAGProcessor:
                 if os.path.exists(f"{self.vector_store_path}.index"):
                     self.load_vector_store(self.vector_store_path)
                 else:
-                    self.dimension = len(embeddings[0]) if embeddings else 1024
-                    self.vector_store = VectorStore(dimension=self.dimension)
+                    self.dimension = int(embeddings.shape[1]) if len(embeddings) else 1024
+                    self.vector_store = VectorStore(dimension=self.dimension, index_type=self.vector_index_type)
 
             self.vector_store.add_embeddings(embeddings, all_chunks)
         
@@ -1112,8 +1120,7 @@ class RAGProcessor:
                     metadata_changed = True
 
             next_filename = str(doc.get("filename", "unknown") or "unknown")
-            if existing.filename != next_filename:
-                existing.filename = next_filename
+            if self.metadata_store.rename_document(doc_id, next_filename, save=False):
                 metadata_changed = True
 
             next_chunk_count = len(entry["chunks"])
@@ -1128,6 +1135,10 @@ class RAGProcessor:
             if storage_file_id and existing.storage_file_id != storage_file_id:
                 existing.storage_file_id = storage_file_id
                 metadata_changed = True
+            parsed_cache_key = str(doc.get("parsed_cache_key", "") or "")
+            if parsed_cache_key and existing.parsed_cache_key != parsed_cache_key:
+                existing.parsed_cache_key = parsed_cache_key
+                metadata_changed = True
             if existing.knowledge_labels != entry["knowledge_labels"]:
                 existing.knowledge_labels = dict(entry["knowledge_labels"])
                 metadata_changed = True
@@ -1164,7 +1175,7 @@ class RAGProcessor:
                 filename=doc.get("filename", "unknown"),
                 content_hash=entry["content_hash"],
                 file_path=original_file_path or ("" if storage_file_id else doc.get("file_path", "")),
-                file_size=len(entry["content"].encode("utf-8")),
+                file_size=entry["file_size"],
                 doc_type=doc.get("doc_type", "unknown"),
                 upload_time=datetime.now().isoformat(),
                 chunk_count=len(entry["chunks"]),
@@ -1174,6 +1185,7 @@ class RAGProcessor:
                 version_label=str(entry.get("version_label", "") or ""),
                 storage_file_id=storage_file_id,
                 knowledge_labels=dict(entry.get("knowledge_labels", {}) or {}),
+                parsed_cache_key=str(doc.get("parsed_cache_key", "") or ""),
             )
 
             is_new = self.metadata_store.add_document(record, save=False)
@@ -1513,15 +1525,14 @@ class RAGProcessor:
             logger.warning("加载图索引用于引用证据失败: %s", e)
             return False
 
-    def _build_incoming_edge_index(self) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
-        incoming_index: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
-        for source, neighbors in self.graph_store.edges.items():
-            source_id = str(source)
-            for edge in neighbors:
-                target = str(edge.get("target", ""))
-                if not target:
-                    continue
-                incoming_index[target].append((source_id, edge))
+    def _build_incoming_edge_index(self) -> Dict[str, List[Tuple[str, str, float, Dict[str, Any]]]]:
+        """target -> [(source, relation, weight, attrs)]；边字典只在路径实际用到该边时构建"""
+        incoming_index: Dict[str, List[Tuple[str, str, float, Dict[str, Any]]]] = defaultdict(list)
+        for source, target, relation, weight, attrs in self.graph_store.iter_edges():
+            target = str(target)
+            if not target:
+                continue
+            incoming_index[target].append((str(source), relation, weight, attrs))
         return incoming_index
 
     def _decorate_node_by_id(self, node_id: str) -> Dict[str, Any]:
@@ -1598,7 +1609,7 @@ class RAGProcessor:
         source_id: str,
         target_id: str,
         max_hops: int,
-        incoming_index: Dict[str, List[Tuple[str, Dict[str, Any]]]],
+        incoming_index: Dict[str, List[Tuple[str, str, float, Dict[str, Any]]]],
         include_evidence_nodes: bool = True,
     ) -> Optional[Dict[str, Any]]:
         if source_id not in self.graph_store.nodes or target_id not in self.graph_store.nodes:
@@ -1624,8 +1635,8 @@ class RAGProcessor:
             if current_depth >= max_hops:
                 continue
 
-            for edge in self.graph_store.neighbors(current):
-                nxt = str(edge.get("target", ""))
+            for target, relation, weight, attrs in self.graph_store.iter_out_edges(current):
+                nxt = str(target)
                 if not nxt or nxt not in self.graph_store.nodes:
                     continue
                 if nxt in depth:
@@ -1637,7 +1648,7 @@ class RAGProcessor:
                         continue
 
                 depth[nxt] = current_depth + 1
-                parent[nxt] = (current, edge, "forward")
+                parent[nxt] = (current, edge_dict(target, relation, weight, attrs), "forward")
                 if nxt == target_id:
                     q.clear()
                     break
@@ -1646,7 +1657,7 @@ class RAGProcessor:
             if target_id in parent:
                 break
 
-            for prev_id, edge in incoming_index.get(current, []):
+            for prev_id, relation, weight, attrs in incoming_index.get(current, []):
                 if not prev_id or prev_id not in self.graph_store.nodes:
                     continue
                 if prev_id in depth:
@@ -1658,7 +1669,7 @@ class RAGProcessor:
                         continue
 
                 depth[prev_id] = current_depth + 1
-                parent[prev_id] = (current, edge, "reverse")
+                parent[prev_id] = (current, edge_dict(current, relation, weight, attrs), "reverse")
                 if prev_id == target_id:
                     q.clear()
                     break
@@ -1760,7 +1771,7 @@ class RAGProcessor:
         self,
         chunk_id: str,
         seed_matches: List[Dict[str, Any]],
-        incoming_index: Dict[str, List[Tuple[str, Dict[str, Any]]]],
+        incoming_index: Dict[str, List[Tuple[str, str, float, Dict[str, Any]]]],
         max_hops: int = 4,
     ) -> Optional[Dict[str, Any]]:
         if not chunk_id or not seed_matches:
@@ -1898,7 +1909,7 @@ class RAGProcessor:
 
     def load_vector_store(self, filepath: str = None):
         path = filepath or self.vector_store_path
-        self.vector_store = VectorStore(dimension=self.dimension or 1024)
+        self.vector_store = VectorStore(dimension=self.dimension or 1024, index_type=self.vector_index_type)
         self.vector_store.load(path)
         self.dimension = self.vector_store.index.d
 
@@ -2070,11 +2081,10 @@ class RAGProcessor:
         ]
 
         relation_counts: Dict[str, int] = defaultdict(int)
-        for neighbors in self.graph_store.edges.values():
-            for edge in neighbors:
-                rel = str(edge.get("relation", ""))
-                if rel:
-                    relation_counts[rel] += 1
+        for relation in self.graph_store.iter_relations():
+            rel = str(relation or "")
+            if rel:
+                relation_counts[rel] += 1
 
         relation_distribution = [
             {
@@ -2106,10 +2116,10 @@ class RAGProcessor:
         for node_id, node in self.graph_store.nodes.items():
             if str(node.get("type", "")) != "issue":
                 continue
-            for edge in self.graph_store.neighbors(node_id):
-                if str(edge.get("relation", "")) != "belongs_to_department":
+            for target, relation, _ in self.graph_store.iter_neighbors(node_id):
+                if str(relation or "") != "belongs_to_department":
                     continue
-                target_id = str(edge.get("target", ""))
+                target_id = str(target or "")
                 target_node = self.graph_store.get_node(target_id) or {}
                 if str(target_node.get("type", "")) != "department":
                     continue
@@ -2145,19 +2155,14 @@ class RAGProcessor:
             return {}
 
         outgoing_edges = []
-        for edge in self.graph_store.neighbors(node_id):
-            outgoing_edges.append(self._build_edge_payload(node_id, edge))
+        for target, relation, weight, attrs in self.graph_store.iter_out_edges(node_id):
+            outgoing_edges.append(self._build_edge_payload(node_id, edge_dict(target, relation, weight, attrs)))
             if len(outgoing_edges) >= safe_limit:
                 break
 
         incoming_edges = []
-        for source, neighbors in self.graph_store.edges.items():
-            for edge in neighbors:
-                if str(edge.get("target", "")) != node_id:
-                    continue
-                incoming_edges.append(self._build_edge_payload(source, edge))
-                if len(incoming_edges) >= safe_limit:
-                    break
+        for source, relation, weight, attrs in self.graph_store.iter_incoming(node_id):
+            incoming_edges.append(self._build_edge_payload(source, edge_dict(node_id, relation, weight, attrs)))
             if len(incoming_edges) >= safe_limit:
                 break
 
@@ -2312,59 +2317,57 @@ class RAGProcessor:
         relation_options_set = set()
         edge_agg: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
 
-        for source, neighbors in self.graph_store.edges.items():
-            for edge in neighbors:
-                edge_payload = self._build_edge_payload(source, edge)
-                if not include_evidence_nodes:
-                    if self._is_evidence_node_type(str(edge_payload.get("source_type", ""))):
-                        continue
-                    if self._is_evidence_node_type(str(edge_payload.get("target_type", ""))):
-                        continue
+        for source, target, rel, weight, edge_attrs in self.graph_store.iter_edges():
+            edge_payload = self._build_edge_payload(source, edge_dict(target, rel, weight, edge_attrs))
+            if not include_evidence_nodes:
+                if self._is_evidence_node_type(str(edge_payload.get("source_type", ""))):
+                    continue
+                if self._is_evidence_node_type(str(edge_payload.get("target_type", ""))):
+                    continue
 
-                rel = edge.get("relation", "")
-                relation_value = str(edge_payload.get("relation", "")).strip()
-                if relation_value:
-                    relation_options_set.add(relation_value)
+            relation_value = str(edge_payload.get("relation", "")).strip()
+            if relation_value:
+                relation_options_set.add(relation_value)
 
-                if relation_filter and rel != relation_filter:
-                    continue
+            if relation_filter and rel != relation_filter:
+                continue
 
-                if keyword_filter:
-                    edge_text = (
-                        f"{edge_payload.get('source_name', '')} "
-                        f"{edge_payload.get('source_type', '')} "
-                        f"{edge_payload.get('relation', '')} "
-                        f"{edge_payload.get('target_name', '')} "
-                        f"{edge_payload.get('target_type', '')}"
-                    ).lower()
-                    if keyword_filter not in edge_text:
-                        continue
+            if keyword_filter:
+                edge_text = (
+                    f"{edge_payload.get('source_name', '')} "
+                    f"{edge_payload.get('source_type', '')} "
+                    f"{edge_payload.get('relation', '')} "
+                    f"{edge_payload.get('target_name', '')} "
+                    f"{edge_payload.get('target_type', '')}"
+                ).lower()
+                if keyword_filter not in edge_text:
+                    continue
 
-                signature = (
-                    str(edge_payload.get("source", "")),
-                    str(edge_payload.get("target", "")),
-                    relation_value,
-                )
-                attrs = dict(edge_payload.get("attrs", {}) or {})
-                confidence = float(attrs.get("confidence", 0.0) or 0.0)
+            signature = (
+                str(edge_payload.get("source", "")),
+                str(edge_payload.get("target", "")),
+                relation_value,
+            )
+            attrs = dict(edge_payload.get("attrs", {}) or {})
+            confidence = float(attrs.get("confidence", 0.0) or 0.0)
 
-                if signature not in edge_agg:
-                    new_payload = {**edge_payload}
-                    new_attrs = {**attrs, "evidence_count": 1}
-                    if confidence > 0:
-                        new_attrs["confidence_max"] = confidence
-                    new_payload["attrs"] = new_attrs
-                    edge_agg[signature] = new_payload
-                else:
-                    existing = edge_agg[signature]
-                    existing_attrs = dict(existing.get("attrs", {}) or {})
-                    existing_attrs["evidence_count"] = int(existing_attrs.get("evidence_count", 1)) + 1
-                    prev_conf = float(existing_attrs.get("confidence_max", 0.0) or 0.0)
-                    if confidence > prev_conf:
-                        existing_attrs["confidence_max"] = confidence
-                    existing["attrs"] = existing_attrs
-                    if float(edge_payload.get("weight", 0.0) or 0.0) > float(existing.get("weight", 0.0) or 0.0):
-                        existing["weight"] = edge_payload.get("weight", existing.get("weight", 1.0))
+            if signature not in edge_agg:
+                new_payload = {**edge_payload}
+                new_attrs = {**attrs, "evidence_count": 1}
+                if confidence > 0:
+                    new_attrs["confidence_max"] = confidence
+                new_payload["attrs"] = new_attrs
+                edge_agg[signature] = new_payload
+            else:
+                existing = edge_agg[signature]
+                existing_attrs = dict(existing.get("attrs", {}) or {})
+                existing_attrs["evidence_count"] = int(existing_attrs.get("evidence_count", 1)) + 1
+                prev_conf = float(existing_attrs.get("confidence_max", 0.0) or 0.0)
+                if confidence > prev_conf:
+                    existing_attrs["confidence_max"] = confidence
+                existing["attrs"] = existing_attrs
+                if float(edge_payload.get("weight", 0.0) or 0.0) > float(existing.get("weight", 0.0) or 0.0):
+                    existing["weight"] = edge_payload.get("weight", existing.get("weight", 1.0))
 
         relation_options = sorted(relation_options_set)
         edges = list(edge_agg.values())
@@ -2431,8 +2434,7 @@ class RAGProcessor:
             if depth >= safe_hops:
                 continue
 
-            for edge in self.graph_store.neighbors(node_id):
-                target = edge.get("target")
+            for target, _, _ in self.graph_store.iter_neighbors(node_id):
                 if not target or target not in self.graph_store.nodes:
                     continue
                 target_node = self.graph_store.get_node(target) or {}
@@ -2455,9 +2457,7 @@ class RAGProcessor:
 
         edge_agg: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
         for source in visited:
-            for edge in self.graph_store.neighbors(source):
-                target = edge.get("target")
-                relation = edge.get("relation", "")
+            for target, relation, weight, edge_attrs in self.graph_store.iter_out_edges(source):
                 if target not in visited:
                     continue
                 source_node = self.graph_store.get_node(source) or {}
@@ -2468,7 +2468,7 @@ class RAGProcessor:
                     if self._is_evidence_node_type(str(target_node.get("type", ""))):
                         continue
                 signature = (source, target, relation)
-                payload = self._build_edge_payload(source, edge)
+                payload = self._build_edge_payload(source, edge_dict(target, relation, weight, edge_attrs))
                 attrs = dict(payload.get("attrs", {}) or {})
                 confidence = float(attrs.get("confidence", 0.0) or 0.0)
 
@@ -2569,7 +2569,7 @@ class RAGProcessor:
 
     def clear_vector_store(self):
         if self.vector_store:
-            self.vector_store = VectorStore(dimension=self.dimension or 1024)
+            self.vector_store = VectorStore(dimension=self.dimension or 1024, index_type=self.vector_index_type)
             self.retriever = VectorRetriever(self.vector_store, self.embedding_provider)
 
         self.graph_store.clear()
@@ -2588,9 +2588,9 @@ class RAGProcessor:
         error_collector: Optional[List[Dict[str, str]]] = None,
         extra_metadata: Optional[Dict[str, Any]] = None,
     ) -> Dict:
-        from src.ingestion.parsers.document_processor import process_uploaded_documents
+        from src.ingestion.parsers.document_processor import iter_uploaded_documents
 
-        processed_documents = process_uploaded_documents(
+        processed_documents = iter_uploaded_documents(
             file_paths,
             doc_type=doc_type,
             title=title,
@@ -2598,9 +2598,13 @@ class RAGProcessor:
             error_collector=error_collector,
             extra_metadata=extra_metadata,
         )
-        if not processed_documents:
+        first_document = next(processed_documents, None)
+        if first_document is None:
             return {"processed": 0, "skipped": 0, "updated": 0, "total_chunks": 0}
-        return self.process_documents(processed_documents, save_after_processing=save_after_processing)
+        return self.process_documents(
+            chain((first_document,), processed_documents),
+            save_after_processing=save_after_processing,
+        )
 
     def _refresh_metadata_store(self) -> None:
         try:
@@ -3556,9 +3560,12 @@ class RAGProcessor:
         if not self.metadata_store.delete_document(doc_id, soft_delete=False):
             return {"success": False, "error": "文档不存在"}
 
+        from src.ingestion.parsers.document_processor import DocumentProcessor
+
         removed_chunks = 0
         removed_full_text = self._delete_full_text(doc_id)
         removed_preview_chunks = self._delete_preview_chunks(doc_id)
+        removed_parsed_cache = DocumentProcessor.remove_parsed_cache(record.parsed_cache_key) > 0
         removed_original_file = False
         original_path = str(record.file_path or "").strip() if record else ""
         if original_path and not os.path.isabs(original_path):
@@ -3583,6 +3590,7 @@ class RAGProcessor:
             "removed_full_text": removed_full_text,
             "removed_preview_chunks": removed_preview_chunks,
             "removed_original_file": removed_original_file,
+            "removed_parsed_cache": removed_parsed_cache,
         }
 
     def get_document_stats(self) -> Dict:
@@ -3622,6 +3630,11 @@ class RAGProcessor:
             removed_original_files = sum(1 for name in os.listdir(original_dir) if os.path.isfile(os.path.join(original_dir, name)))
             shutil.rmtree(original_dir, ignore_errors=True)
 
+        from src.ingestion.parsers.document_processor import DocumentProcessor
+
+        removed_parsed_cache_files = DocumentProcessor.clear_parsed_cache()
+        removed_embedding_cache_entries = self.embedding_provider.clear_cache()
+
         return {
             "success": True,
             "removed_documents": doc_stats.get("removed_total", 0),
@@ -3631,13 +3644,16 @@ class RAGProcessor:
             "removed_full_text_files": removed_full_text_files,
             "removed_preview_files": removed_preview_files,
             "removed_original_files": removed_original_files,
+            "removed_parsed_cache_files": removed_parsed_cache_files,
+            "removed_embedding_cache_entries": removed_embedding_cache_entries,
         }
 
 
 def process_user_uploaded_documents(file_paths: List[str], rag_processor: RAGProcessor):
-    from src.ingestion.parsers.document_processor import process_uploaded_documents
+    from src.ingestion.parsers.document_processor import iter_uploaded_documents
 
-    processed_documents = process_uploaded_documents(file_paths)
-    if not processed_documents:
+    processed_documents = iter_uploaded_documents(file_paths)
+    first_document = next(processed_documents, None)
+    if first_document is None:
         return 0
-    return rag_processor.process_documents(processed_documents)
+    return rag_processor.process_documents(chain((first_document,), processed_documents))